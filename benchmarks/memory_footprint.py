@@ -0,0 +1,84 @@
+"""
+Memory benchmark of the per-instance footprint of the calendar date classes.
+
+For each class, create many instances of consecutive dates, access a few properties (to fill the lazily cached
+fields), and report:
+
+1) shallow size: sys.getsizeof of one instance, plus its __dict__ if any.
+2) owned size: shallow size plus the values referenced only by that instance (e.g., its ordinal).
+3) RSS growth: increase of the process' resident set size per instance (Linux only).
+
+Usage: python benchmarks/memory_footprint.py [count]
+"""
+
+from datetime import date, timedelta
+import gc
+import resource
+import sys
+
+from calendars.calendars import RegularDate, FiscalDate, RetailDate, IsoDate, LunarDate
+
+
+def slot_values(instance):
+    """ Values of the slots and __dict__ entries of the instance.
+    """
+    values = []
+    if hasattr(instance, '__dict__'):
+        values.extend(instance.__dict__.values())
+    for cls in type(instance).__mro__:
+        for slot in getattr(cls, '__slots__', ()):
+            value = getattr(instance, slot, None)
+            if value is not None:
+                values.append(value)
+    return values
+
+
+def current_rss_bytes():
+    """ Current resident set size of the process, Linux only.
+    """
+    with open('/proc/self/statm') as statm:
+        return int(statm.read().split()[1]) * resource.getpagesize()
+
+
+def measure(calendar_class, count, properties):
+    start = date(2000, 1, 1)
+    today = date.today()
+    gc.collect()
+    rss_before = current_rss_bytes()
+    instances = []
+    for days in xrange(count):
+        instance = calendar_class(start + timedelta(days % 3650), today)
+        for name in properties:
+            getattr(instance, name)
+        instances.append(instance)
+    rss_growth = float(current_rss_bytes() - rss_before) / count
+
+    # Values referenced by several instances (e.g., year layouts) are shared, not owned.
+    references = {}
+    for instance in instances[:1000]:
+        for value in slot_values(instance):
+            references[id(value)] = references.get(id(value), 0) + 1
+
+    instance = instances[0]
+    shallow = sys.getsizeof(instance)
+    if hasattr(instance, '__dict__'):
+        shallow += sys.getsizeof(instance.__dict__)
+    owned = shallow + sum(sys.getsizeof(value) for value in slot_values(instance) if references[id(value)] == 1)
+    del instances
+    return shallow, owned, rss_growth
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    print "%-12s %10s %10s %12s" % ("class", "shallow", "owned", "rss/inst")
+    for calendar_class, properties, class_count in [(RegularDate, ['quarter'], count),
+                                                    (FiscalDate, ['quarter'], count),
+                                                    (RetailDate, ['quarter'], count),
+                                                    (IsoDate, ['quarter'], count),
+                                                    (LunarDate, ['quarter'], min(count, 20000))]:
+        shallow, owned, rss_growth = measure(calendar_class, class_count, properties)
+        print "%-12s %10d %10d %12.1f" % (calendar_class.__name__, shallow, owned, rss_growth)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Micro-benchmark of the periodic-term series of solar_longitude and nth_new_moon.
+
+For each PyCalCal backend, report the time per call of:
+
+1) solar_longitude and compute_nth_new_moon, i.e., nth_new_moon without its memoization.
+2) their series evaluated by sigma, with a lambda per term and the term lists zipped on every call, as before.
+3) their series evaluated by the sine_series and argument_sine_series kernels on the precomputed terms.
+
+Usage: python benchmarks/series_kernels.py [number]
+"""
+
+import sys
+import timeit
+
+import pycalcal.pycalcal as pycal
+
+
+def sigma_solar_series(c):
+    coefficients, addends, multipliers = zip(*pycal.SOLAR_LONGITUDE_TERMS)
+    return pycal.sigma([list(coefficients), list(addends), list(multipliers)],
+                       lambda x, y, z: x * pycal.sin_degrees(y + (z * c)))
+
+
+def sigma_new_moon_series(cap_E, solar_anomaly, lunar_anomaly, moon_argument):
+    lists = [list(column) for column in zip(*pycal.NEW_MOON_CORRECTION_TERMS)]
+    return pycal.sigma(lists,
+                       lambda v, w, x, y, z: (v * pow(cap_E, w) *
+                                              pycal.sin_degrees((x * solar_anomaly) +
+                                                                (y * lunar_anomaly) +
+                                                                (z * moon_argument))))
+
+
+def per_call(func, number):
+    return min(timeit.repeat(func, number=number, repeat=3)) / number
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    tee = pycal.fixed_from_gregorian([2016, 4, 8]) + 0.5
+    print "%-8s %-38s %12s" % ("backend", "function", "us/call")
+    for backend in pycal.BACKENDS:
+        previous = pycal.use_backend(backend)
+        try:
+            c = pycal.julian_centuries(tee)
+            cap_E = pycal.poly(c, pycal.NEW_MOON_E_COEFFS)
+            factors = [pow(cap_E, 0), pow(cap_E, 1), pow(cap_E, 2)]
+            angles = [pycal.mpf(10.5), pycal.mpf(20.25), pycal.mpf(30.125)]
+            cases = [("solar_longitude", lambda: pycal.solar_longitude(tee)),
+                     ("compute_nth_new_moon", lambda: pycal.compute_nth_new_moon(24724)),
+                     ("solar series: sigma", lambda: sigma_solar_series(c)),
+                     ("solar series: sine_series",
+                      lambda: pycal.sine_series(pycal.SOLAR_LONGITUDE_TERMS, c)),
+                     ("new moon series: sigma", lambda: sigma_new_moon_series(cap_E, *angles)),
+                     ("new moon series: argument_sine_series",
+                      lambda: pycal.argument_sine_series(pycal.NEW_MOON_CORRECTION_TERMS, factors, *angles))]
+            for name, func in cases:
+                print "%-8s %-38s %12.1f" % (backend, name, per_call(func, number) * 1e6)
+        finally:
+            pycal.use_backend(previous)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+"""
+Benchmark suite of the calendar classes and the heavy PyCalCal functions.
+
+Each benchmark times a function over fixed inputs with timeit, and reports the best time per call of several repeats
+(and the throughput for bulk benchmarks). Results can be saved as a JSON baseline and compared against it later:
+
+python benchmarks/suite.py run [--filter NAME] [--output results.json]
+python benchmarks/suite.py save [--baseline benchmarks/baseline.json]
+python benchmarks/suite.py compare [--baseline benchmarks/baseline.json] [--threshold 1.2]
+
+compare exits with status 1 if any benchmark is slower than its baseline by more than the threshold ratio.
+Baselines are only comparable on the same machine and Python version, which are stored with them.
+"""
+
+import argparse
+from collections import OrderedDict
+from datetime import date, timedelta
+import json
+import os
+import platform
+import sys
+import timeit
+
+from calendars.calendars import RegularDate, FiscalDate, RetailDate, IsoDate, LunarDate
+import pycalcal.pycalcal as pycal
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+CALENDAR_CLASSES = [RegularDate, FiscalDate, RetailDate, IsoDate, LunarDate]
+
+# Benchmarks by name: (setup function returning the function to time, number of items per call)
+BENCHMARKS = OrderedDict()
+
+
+def benchmark(name, items=1):
+    """ Register a benchmark: the decorated setup function returns the function to time.
+
+    :param name: name of the benchmark.
+    :param items: number of items (e.g., dates) processed by each call, for throughput.
+    """
+    def register(setup):
+        BENCHMARKS[name] = (setup, items)
+        return setup
+    return register
+
+
+def sample_dates(count, step=7):
+    """ Fixed sample of dates, from 2000-01-01 every step days.
+    """
+    start = date(2000, 1, 1)
+    return [start + timedelta(days * step) for days in xrange(count)]
+
+
+def sample_fixed_dates(count, step=37):
+    """ Fixed sample of RD dates of the sample_dates, as used by PyCalCal.
+    """
+    return [pycal.fixed_from_gregorian([mdate.year, mdate.month, mdate.day])
+            for mdate in sample_dates(count, step)]
+
+
+#################################
+# Calendar classes
+#################################
+
+def _register_calendar_benchmarks(calendar_class):
+    name = calendar_class.__name__
+    count = 100 if calendar_class is LunarDate else 1000
+
+    @benchmark('%s.construct' % name, items=count)
+    def construct():
+        dates = sample_dates(count)
+        return lambda: [calendar_class(mdate) for mdate in dates]
+
+    @benchmark('%s.properties' % name, items=count)
+    def properties():
+        dates = sample_dates(count)
+
+        def access():
+            for mdate in dates:
+                instance = calendar_class(mdate)
+                instance.year, instance.quarter, instance.quarter_start_date, instance.quarter_end_date
+                instance.year_start_date, instance.year_end_date
+        return access
+
+    # Bulk tagging of consecutive days, i.e., a calendar dimension table
+    days = 3653
+
+    @benchmark('%s.iter_days' % name, items=days)
+    def iter_days():
+        start = date(2000, 1, 1)
+        end = start + timedelta(days - 1)
+        return lambda: sum(1 for _ in calendar_class.iter_days(start, end))
+
+    if np is not None and calendar_class is not LunarDate:
+        @benchmark('%s.batch' % name, items=days * 10)
+        def batch():
+            dates = np.datetime64('1950-01-01') + np.arange(days * 10)
+            return lambda: calendar_class.batch(dates)
+
+
+for _calendar_class in CALENDAR_CLASSES:
+    _register_calendar_benchmarks(_calendar_class)
+
+
+#################################
+# PyCalCal functions
+#################################
+
+@benchmark('pycal.chinese_from_fixed', items=200)
+def chinese_from_fixed():
+    fixed_dates = sample_fixed_dates(200)
+    return lambda: [pycal.chinese_from_fixed(fixed_date) for fixed_date in fixed_dates]
+
+
+@benchmark('pycal.compute_chinese_from_fixed', items=2)
+def compute_chinese_from_fixed():
+    fixed_dates = sample_fixed_dates(2, step=4000)
+    return lambda: [pycal.compute_chinese_from_fixed(fixed_date) for fixed_date in fixed_dates]
+
+
+@benchmark('pycal.fixed_from_chinese', items=200)
+def fixed_from_chinese():
+    c_dates = [pycal.chinese_from_fixed(fixed_date) for fixed_date in sample_fixed_dates(200)]
+    return lambda: [pycal.fixed_from_chinese(c_date) for c_date in c_dates]
+
+
+@benchmark('pycal.solar_longitude', items=100)
+def solar_longitude():
+    moments = [fixed_date + 0.25 for fixed_date in sample_fixed_dates(100)]
+    return lambda: [pycal.solar_longitude(tee) for tee in moments]
+
+
+if np is not None:
+    import pycalcal.arrays as pyarr
+
+    @benchmark('pyarr.lunar_longitude', items=3653)
+    def array_lunar_longitude():
+        moments = np.arange(pycal.fixed_from_gregorian([2000, 1, 1]), pycal.fixed_from_gregorian([2010, 1, 1])) + 0.25
+        return lambda: pyarr.lunar_longitude(moments)
+
+    @benchmark('pyarr.solar_events', items=366)
+    def array_solar_events():
+        fixed_dates = np.arange(pycal.fixed_from_gregorian([2016, 1, 1]), pycal.fixed_from_gregorian([2017, 1, 1]))
+        return lambda: pyarr.solar_events(fixed_dates, pycal.URBANA, 18)
+
+
+@benchmark('pycal.nth_new_moon', items=50)
+def nth_new_moon():
+    return lambda: [pycal.compute_nth_new_moon(n) for n in xrange(24000, 25000, 20)]
+
+
+@benchmark('pycal.new_moon_before', items=100)
+def new_moon_before():
+    moments = [fixed_date + 0.25 for fixed_date in sample_fixed_dates(100)]
+    pycal.clear_new_moon_cache()
+    pycal.warm_new_moons(2000, 2010)
+    return lambda: [pycal.new_moon_before(tee) for tee in moments]
+
+
+@benchmark('pycal.hebrew_from_fixed', items=3653)
+def hebrew_from_fixed():
+    start = pycal.fixed_from_gregorian([2000, 1, 1])
+    return lambda: [pycal.hebrew_from_fixed(fixed_date) for fixed_date in xrange(start, start + 3653)]
+
+
+@benchmark('pycal.fixed_from_hebrew', items=3653)
+def fixed_from_hebrew():
+    start = pycal.fixed_from_gregorian([2000, 1, 1])
+    h_dates = [pycal.hebrew_from_fixed(fixed_date) for fixed_date in xrange(start, start + 3653)]
+    return lambda: [pycal.fixed_from_hebrew(h_date) for h_date in h_dates]
+
+
+@benchmark('pycal.observational_islamic_from_fixed', items=60)
+def observational_islamic_from_fixed():
+    start = pycal.fixed_from_gregorian([2016, 1, 1])
+    return lambda: [pycal.observational_islamic_from_fixed(fixed_date) for fixed_date in xrange(start, start + 60)]
+
+
+@benchmark('pycal.next', items=1000)
+def next_search():
+    return lambda: pycal.next(0, lambda i: i >= 1000)
+
+
+@benchmark('pycal.binary_search', items=1)
+def binary_search():
+    return lambda: pycal.binary_search(0.0, 1000.0, lambda lo, hi: hi - lo <= 1e-9, lambda x: x >= 123.456)
+
+
+@benchmark('pycal.solar_longitude_after', items=10)
+def solar_longitude_after():
+    moments = [fixed_date + 0.25 for fixed_date in sample_fixed_dates(10)]
+    return lambda: [pycal.solar_longitude_after(pycal.SPRING, tee) for tee in moments]
+
+
+@benchmark('pycal.lunar_phase_at_or_after', items=10)
+def lunar_phase_at_or_after():
+    moments = [fixed_date + 0.25 for fixed_date in sample_fixed_dates(10)]
+    return lambda: [pycal.lunar_phase_at_or_after(pycal.FULL, tee) for tee in moments]
+
+
+@benchmark('pycal.sunrise', items=10)
+def sunrise():
+    fixed_dates = sample_fixed_dates(10)
+    return lambda: [pycal.sunrise(fixed_date, pycal.URBANA) for fixed_date in fixed_dates]
+
+
+@benchmark('pycal.hindu_solar_from_fixed', items=10)
+def hindu_solar_from_fixed():
+    fixed_dates = sample_fixed_dates(10)
+    return lambda: [pycal.hindu_solar_from_fixed(fixed_date) for fixed_date in fixed_dates]
+
+
+@benchmark('pycal.hindu_lunar_from_fixed', items=10)
+def hindu_lunar_from_fixed():
+    fixed_dates = sample_fixed_dates(10)
+    return lambda: [pycal.hindu_lunar_from_fixed(fixed_date) for fixed_date in fixed_dates]
+
+
+@benchmark('pycal.hindu_new_moon_before', items=100)
+def hindu_new_moon_before():
+    moments = [fixed_date + 0.25 for fixed_date in sample_fixed_dates(100)]
+    return lambda: [pycal.hindu_new_moon_before(tee) for tee in moments]
+
+
+@benchmark('pycal.fixed_from_hindu_lunar', items=10)
+def fixed_from_hindu_lunar():
+    l_dates = [pycal.hindu_lunar_from_fixed(fixed_date) for fixed_date in sample_fixed_dates(10)]
+    return lambda: [pycal.fixed_from_hindu_lunar(l_date) for l_date in l_dates]
+
+
+#################################
+# Running and reporting
+#################################
+
+def run_benchmark(name, repeat=5, min_time=0.2):
+    """ Time the benchmark with the given name.
+
+    The number of calls per repeat is chosen so that a repeat takes at least min_time seconds.
+    :return: dict with the best seconds per call and the items per call.
+    """
+    setup, items = BENCHMARKS[name]
+    func = setup()
+    # Warm up, e.g., the shared caches, and estimate the time of a call.
+    timer = timeit.Timer(func)
+    number = max(1, int(min_time / max(timer.timeit(1), 1e-9)))
+    seconds = min(timer.repeat(repeat=repeat, number=number)) / number
+    return {'seconds': seconds, 'items': items}
+
+
+def run(names, repeat=5, min_time=0.2, out=sys.stdout):
+    results = OrderedDict()
+    for name in names:
+        result = run_benchmark(name, repeat, min_time)
+        results[name] = result
+        out.write("%-36s %12.6f s %14.0f items/s\n" % (name, result['seconds'], result['items'] / result['seconds']))
+        out.flush()
+    return {'python': platform.python_version(),
+            'machine': platform.platform(),
+            'results': results}
+
+
+def compare(current, baseline, threshold=1.2, out=sys.stdout):
+    """ Report the ratios of the current times to the baseline times.
+
+    :param current: results of run().
+    :param baseline: results of run() saved as baseline.
+    :param threshold: ratio above which a benchmark is a regression (and below 1/threshold an improvement).
+    :return: list of names of the regressed benchmarks.
+    """
+    if (current['python'], current['machine']) != (baseline['python'], baseline['machine']):
+        out.write("Warning: baseline from Python %s on %s\n" % (baseline['python'], baseline['machine']))
+
+    regressions = []
+    out.write("%-36s %12s %12s %8s\n" % ("benchmark", "baseline", "current", "ratio"))
+    for name, result in current['results'].items():
+        if name not in baseline['results']:
+            out.write("%-36s %12s %12.6f\n" % (name, "-", result['seconds']))
+            continue
+        base_seconds = baseline['results'][name]['seconds']
+        ratio = result['seconds'] / base_seconds
+        if ratio > threshold:
+            status = "REGRESSION"
+            regressions.append(name)
+        elif ratio < 1.0 / threshold:
+            status = "improved"
+        else:
+            status = ""
+        out.write("%-36s %12.6f %12.6f %8.2f %s\n" % (name, base_seconds, result['seconds'], ratio, status))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark suite of the calendars and PyCalCal.")
+    parser.add_argument('command', choices=['list', 'run', 'save', 'compare'])
+    parser.add_argument('--filter', default='', help="only run the benchmarks whose name contains this string")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--output', help="also write the results to this JSON file")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.2, help="minimum seconds per repeat")
+    parser.add_argument('--threshold', type=float, default=1.2)
+    args = parser.parse_args(argv)
+
+    names = [name for name in BENCHMARKS if args.filter in name]
+    if args.command == 'list':
+        print "\n".join(names)
+        return 0
+
+    current = run(names, args.repeat, args.min_time)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(current, f, indent=2)
+
+    if args.command == 'save':
+        baseline = {'results': {}}
+        if args.filter and os.path.exists(args.baseline):
+            # Only update the filtered benchmarks of the existing baseline.
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline['results'].update(current['results'])
+        baseline['python'], baseline['machine'] = current['python'], current['machine']
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print "Saved baseline to %s" % args.baseline
+    elif args.command == 'compare':
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print "%d regression(s): %s" % (len(regressions), ", ".join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
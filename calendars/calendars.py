@@ -4,8 +4,8 @@ Created on April 2nd, 2016
 Utility classes for the following calendars:
 
 1) Regular solar calendar
-2) Fiscal calendar, based on class constant FISCAL_START.
-3) Retail calendar, based on class constant FISCAL_START.
+2) Fiscal calendar, based on the given CalendarSpec (default: class constants).
+3) Retail calendar, based on the given CalendarSpec (default: class constants).
 4) ISO calendar.
 
 More information about retail calendar (a.k.a. 4-4-5 calendar):
@@ -14,9 +14,19 @@ https://en.wikipedia.org/wiki/4%E2%80%934%E2%80%935_calendar
 @author: tdongsi
 """
 
+from bisect import bisect_right
+from collections import OrderedDict, namedtuple
 from datetime import date, timedelta
+import threading
+
 import pycalcal.pycalcal as pycal
 
+try:
+    import numpy as np
+except ImportError:
+    # NumPy is only needed for the batch calculations over date arrays.
+    np = None
+
 
 def cumsum(alist):
     """ A generator that return a cumulative running sum of elements in a list.
@@ -30,46 +40,555 @@ def cumsum(alist):
         yield tot
 
 
+#################################
+# Batch (vectorized) calculations
+#################################
+
+# Python's date.toordinal() of numpy's datetime64 epoch, 1970-01-01.
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("NumPy is required for batch calculations over date arrays.")
+
+
+def to_day_array(dates):
+    """ Convert an array of dates into a numpy datetime64[D] array.
+
+    :param dates: numpy datetime64 array, or array of ordinals as returned by date.toordinal().
+    :return: tuple of datetime64[D] array and whether the input was given as ordinals.
+    """
+    _require_numpy()
+    dates = np.asarray(dates)
+    if np.issubdtype(dates.dtype, np.integer):
+        return (dates - _EPOCH_ORDINAL).astype('datetime64[D]'), True
+    return dates.astype('datetime64[D]'), False
+
+
+def _from_day_array(days, as_ordinals):
+    """ Convert a datetime64[D] array back into the representation of the input.
+    """
+    if as_ordinals:
+        return days.astype(np.int64) + _EPOCH_ORDINAL
+    return days
+
+
+def _years_of(days):
+    """ Gregorian year numbers of a datetime64[D] array.
+    """
+    return days.astype('datetime64[Y]').astype(np.int64) + 1970
+
+
+def _months_of(days):
+    """ One-based Gregorian month numbers of a datetime64[D] array.
+    """
+    return days.astype('datetime64[M]').astype(np.int64) % 12 + 1
+
+
+def _make_dates(years, month, day):
+    """ datetime64[D] array of the given month and day in each of the given years.
+    """
+    months = (np.asarray(years) - 1970).astype('datetime64[Y]').astype('datetime64[M]') + (month - 1)
+    return months.astype('datetime64[D]') + (day - 1)
+
+
+def _weekdays_of(days):
+    """ Weekday numbers of a datetime64[D] array, with Monday as 0 like date.weekday().
+    """
+    # 1970-01-01 is a Thursday.
+    return (days.astype(np.int64) + 3) % 7
+
+
+def _batch_result(as_ordinals, year, quarter, quarter_start, quarter_end, year_start, year_end):
+    """ Pack the batch results into a dict keyed by the names of the equivalent properties.
+    """
+    return {'year': year,
+            'quarter': quarter,
+            'quarter_start_date': _from_day_array(quarter_start, as_ordinals),
+            'quarter_end_date': _from_day_array(quarter_end, as_ordinals),
+            'year_start_date': _from_day_array(year_start, as_ordinals),
+            'year_end_date': _from_day_array(year_end, as_ordinals)}
+
+
+def _batch_week_quarters(days, year_start, year_end, weeks_in_month, leap_month):
+    """ Vectorized quarter number, starting and ending dates for week-based calendars (retail and ISO).
+
+    :param days: datetime64[D] array of the input dates.
+    :param year_start: datetime64[D] array of the starting dates of the years containing the input dates.
+    :param year_end: datetime64[D] array of the ending dates of the years containing the input dates.
+    :param weeks_in_month: number of weeks in each month of a 52-week year.
+    :param leap_month: the month that gets the extra week in a 53-week year.
+    :return: tuple of quarter, quarter_start, quarter_end arrays.
+    """
+    is_53_week = (year_end - year_start).astype(np.int64) + 1 == 53 * 7
+    week_num = (days - year_start).astype(np.int64) // 7
+
+    quarter = np.zeros(days.shape, dtype=np.int64)
+    start_weeks = np.zeros(days.shape, dtype=np.int64)
+    end_weeks = np.zeros(days.shape, dtype=np.int64)
+    for leap in (False, True):
+        weeks = list(weeks_in_month)
+        if leap:
+            weeks[leap_month-1] += 1
+        week_cumsum = [0]
+        week_cumsum.extend(cumsum([sum(weeks[0:3]), sum(weeks[3:6]), sum(weeks[6:9]), sum(weeks[9:12])]))
+        week_cumsum = np.array(week_cumsum)
+
+        mask = is_53_week == leap
+        # A week past the last quarter is counted in the last quarter.
+        quarter[mask] = np.minimum(np.searchsorted(week_cumsum[1:], week_num[mask], side='right') + 1, 4)
+        start_weeks[mask] = week_cumsum[quarter[mask] - 1]
+        end_weeks[mask] = week_cumsum[quarter[mask]]
+
+    quarter_start = year_start + (start_weeks * 7).astype('timedelta64[D]')
+    quarter_end = year_start + (end_weeks * 7 - 1).astype('timedelta64[D]')
+    return quarter, quarter_start, quarter_end
+
+
 class CalendarImplError(Exception):
     """ Raise this error when a property in the base class, e.g. BaseDate, is not overridden or implemented.
     """
     pass
 
 
+class LRUCache(object):
+    """ A thread-safe mapping of bounded size that evicts the least recently used entries.
+    """
+
+    def __init__(self, maxsize=128):
+        """ Initialize an empty cache.
+
+        :param maxsize: maximum number of entries kept in the cache.
+        :return:
+        """
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, factory):
+        """ Get the entry of the given key, creating it with the given factory on cache miss.
+
+        :param key: hashable key of the entry.
+        :param factory: function without argument that returns the entry to cache.
+        :return: the cached entry.
+        """
+        with self._lock:
+            try:
+                # Re-insert to mark it as most recently used.
+                value = self._entries.pop(key)
+                self._entries[key] = value
+                return value
+            except KeyError:
+                pass
+
+        value = factory()
+        with self._lock:
+            self._entries[key] = value
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        """ Remove all entries.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class PeriodIndex(namedtuple('PeriodIndex', ['year_start', 'offsets'])):
+    """
+    Consecutive periods (e.g., quarters, months or weeks) covering a year.
+
+    The periods are given by the offsets in days of their starting dates from the year's starting date, followed by
+    the number of days in the year. Finding the period containing a date is a binary search on the offsets.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_weeks(cls, year_start, weeks_in_period):
+        """ Create the index of periods with the given numbers of weeks.
+
+        :param year_start: starting date of the year.
+        :param weeks_in_period: number of weeks in each period.
+        :return: PeriodIndex instance.
+        """
+        offsets = [0]
+        offsets.extend(weeks * 7 for weeks in cumsum(weeks_in_period))
+        return cls(year_start, tuple(offsets))
+
+    def period_of(self, mdate):
+        """ Find the one-based number of the period containing the given date.
+        """
+        return bisect_right(self.offsets, (mdate - self.year_start).days, 1, len(self.offsets) - 1)
+
+    def start_date(self, num):
+        """ Starting date of the period with the given one-based number.
+        """
+        return self.year_start + timedelta(self.offsets[num-1])
+
+    def end_date(self, num):
+        """ Ending date of the period with the given one-based number.
+        """
+        return self.year_start + timedelta(self.offsets[num] - 1)
+
+
+class WeekYearLayout(namedtuple('WeekYearLayout', ['year', 'year_start', 'year_end', 'is_53_week', 'weeks_in_month',
+                                                   'weeks_in_quarter', 'quarters', 'months', 'weeks'])):
+    """
+    Immutable period boundaries of one year in a week-based calendar, i.e., retail or ISO calendar.
+
+    A layout is computed once per year and configuration, and shared by all the date instances in that year.
+    The quarters, months and weeks of the year are PeriodIndex instances.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_year_boundaries(cls, year, year_start, year_end, weeks_in_month, leap_month):
+        """ Compute the layout of a year with the given boundaries.
+
+        :param year: the year number.
+        :param year_start: starting date of the year.
+        :param year_end: ending date of the year.
+        :param weeks_in_month: number of weeks in each month of a 52-week year, e.g. 5-4-4.
+        :param leap_month: one-based month that gets the additional week in a 53-week year.
+        :return: WeekYearLayout instance.
+        """
+        is_53_week = (year_end - year_start).days + 1 == 53 * 7
+        weeks = list(weeks_in_month)
+        if is_53_week:
+            # Add additional week to the leap month
+            weeks[leap_month-1] += 1
+        weeks_in_quarter = (sum(weeks[0:3]), sum(weeks[3:6]), sum(weeks[6:9]), sum(weeks[9:12]))
+
+        return cls(year, year_start, year_end, is_53_week, tuple(weeks), weeks_in_quarter,
+                   PeriodIndex.from_weeks(year_start, weeks_in_quarter),
+                   PeriodIndex.from_weeks(year_start, weeks),
+                   PeriodIndex.from_weeks(year_start, [1] * sum(weeks)))
+
+
+# Weekdays as numbered by date.weekday()
+MONDAY = 0
+SUNDAY = 6
+
+
+class CalendarSpec(namedtuple('CalendarSpec', ['start_month', 'start_day', 'weeks_in_month', 'leap_month',
+                                               'week_start'])):
+    """
+    Immutable definition of a fiscal, retail or ISO calendar, given to the date classes as parameter.
+
+    start_month, start_day: starting month and day of the fiscal year. A retail year starts on the first day of the
+        week containing the fiscal year's starting date. Not used by ISO calendar.
+    weeks_in_month: number of weeks in each of the 12 months of a 52-week year.
+    leap_month: one-based month that gets the additional week in a 53-week year.
+    week_start: weekday starting a retail week, with Monday as 0 like date.weekday(). ISO weeks start on Monday.
+
+    Specs are hashable values: the caches shared by date instances (e.g., year layouts) are keyed by spec, so that
+    different calendars can be used concurrently, e.g., by several threads of a multi-tenant service.
+    """
+    __slots__ = ()
+
+    # Specs shared by shared()
+    _shared = {}
+
+    def __new__(cls, start_month=8, start_day=1, weeks_in_month='5-4-4', leap_month=12, week_start=SUNDAY):
+        """ Create a calendar spec.
+
+        :param start_month: starting month of the fiscal year.
+        :param start_day: starting day of the fiscal year, up to 28 so that every quarter can start on that day.
+        :param weeks_in_month: weeks in the months of a quarter as a '5-4-4', '4-4-5' or '4-5-4' string or a
+            sequence of 3 numbers, or weeks in each of the 12 months as a sequence of 12 numbers.
+        :param leap_month: one-based month that gets the additional week in a 53-week year.
+        :param week_start: weekday starting a retail week, with Monday as 0 like date.weekday().
+        :return:
+        """
+        if isinstance(weeks_in_month, basestring):
+            weeks_in_month = [int(weeks) for weeks in weeks_in_month.split('-')]
+        weeks_in_month = tuple(weeks_in_month)
+        if len(weeks_in_month) == 3:
+            weeks_in_month *= 4
+
+        if not 1 <= start_month <= 12:
+            raise ValueError("Invalid start month: %r" % start_month)
+        if not 1 <= start_day <= 28:
+            raise ValueError("Invalid start day: %r" % start_day)
+        if len(weeks_in_month) != 12 or sum(weeks_in_month) != 52:
+            raise ValueError("Invalid weeks in month: %r" % (weeks_in_month,))
+        if not 1 <= leap_month <= 12:
+            raise ValueError("Invalid leap month: %r" % leap_month)
+        if not 0 <= week_start <= 6:
+            raise ValueError("Invalid week start: %r" % week_start)
+        return super(CalendarSpec, cls).__new__(cls, start_month, start_day, weeks_in_month, leap_month, week_start)
+
+    @classmethod
+    def shared(cls, *args):
+        """ Get the shared spec with the given arguments, e.g., for the default specs of the date classes.
+        """
+        try:
+            return cls._shared[args]
+        except KeyError:
+            spec = cls(*args)
+            cls._shared[args] = spec
+            return spec
+
+
+class FiscalYearLayout(namedtuple('FiscalYearLayout', ['year', 'year_start', 'year_end', 'quarters'])):
+    """
+    Immutable period boundaries of one year in a fiscal calendar.
+
+    A layout is computed once per year and spec, and shared by all the date instances in that year.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_start_year(cls, start_year, spec):
+        """ Compute the layout of the fiscal year starting in the given calendar year.
+
+        :param start_year: the calendar year of the fiscal year's starting date.
+        :param spec: CalendarSpec of the fiscal calendar.
+        :return: FiscalYearLayout instance.
+        """
+        year_start = date(start_year, spec.start_month, spec.start_day)
+        # Starting dates of the four quarters and of the next year
+        quarter_starts = []
+        for months in xrange(0, 15, 3):
+            year, month = divmod(spec.start_month - 1 + months, 12)
+            quarter_starts.append(date(start_year + year, month + 1, spec.start_day))
+        year_end = quarter_starts[-1] - timedelta(1)
+
+        quarters = PeriodIndex(year_start, tuple((start - year_start).days for start in quarter_starts))
+        return cls(year_end.year, year_start, year_end, quarters)
+
+
+def _system_today():
+    """ Today's date from the system clock.
+    """
+    # Look up date at call time, so that date.today() can be mocked, e.g. with freezegun.
+    return date.today()
+
+
+_clock = _system_today
+
+
+def set_clock(clock):
+    """ Set the clock telling today's date to calendar instances created without today's date.
+
+    :param clock: function without argument returning today's date, or None for the system clock.
+    :return: the previous clock.
+    """
+    global _clock
+    previous = _clock
+    _clock = clock if clock else _system_today
+    return previous
+
+
+def clock_today():
+    """ Today's date as told by the current clock.
+    """
+    return _clock()
+
+
+class CurrentPeriods(object):
+    """
+    The periods containing a given today's date, i.e., the current year of each calendar class.
+
+    Instances are shared through CurrentPeriods.of(today), so that the current year of each calendar is computed once
+    per day and spec, instead of once per date instance.
+    """
+
+    # CurrentPeriods instances of recently used today's dates.
+    _instances = LRUCache(maxsize=16)
+
+    def __init__(self, today):
+        """ Initialize the periods of the given today's date.
+
+        :param today: the given today's date.
+        :return:
+        """
+        self.today = today
+        # Current year by calendar class and spec, shared by concurrent callers.
+        self._years = LRUCache(maxsize=64)
+
+    @classmethod
+    def of(cls, today):
+        """ Get the shared CurrentPeriods instance of the given today's date.
+        """
+        return cls._instances.get(today, lambda: cls(today))
+
+    def year(self, calendar_class, spec=None):
+        """ The current year in the given calendar class and spec, i.e., the year containing today's date.
+        """
+        key = (calendar_class, spec or calendar_class.default_spec())
+        return self._years.get(key, lambda: calendar_class(self.today, self.today, spec).year)
+
+
+class DayRecord(namedtuple('DayRecord', ['date', 'year', 'quarter', 'month', 'week', 'quarter_start_date',
+                                         'quarter_end_date', 'year_start_date', 'year_end_date'])):
+    """
+    Compact record of the periods containing a date, as generated by BaseDate.iter_days.
+
+    Fields other than date have the values of the equivalent properties, or None for calendars without month and week
+    properties. The date objects of period boundaries are shared by the records of the same period.
+    """
+    __slots__ = ()
+
+
+class PeriodRecord(namedtuple('PeriodRecord', ['period', 'year', 'number', 'start_date', 'end_date'])):
+    """
+    Boundaries of a period, i.e., year, quarter, month or week, as generated by BaseDate.iter_periods.
+
+    number is the one-based number of the period in its year, e.g. the quarter number, or the year number for years.
+    """
+    __slots__ = ()
+
+
+# Position of the period numbers in DayRecord, after the date
+_PERIOD_FIELDS = {'year': 0, 'quarter': 1, 'month': 2, 'week': 3}
+
+
+def _merge_segments(segments, end, period, position):
+    """ Merge the consecutive segments of each period, as generated by BaseDate._segments, into PeriodRecords.
+
+    :param segments: segments starting with the first segment of the first period.
+    :param end: the last date of the range.
+    :param period: the period name.
+    :param position: position of the period number in the segment fields.
+    :return: generator of PeriodRecord instances.
+    """
+    current_key, current_start, current_end = None, None, None
+    for segment_start, segment_end, fields in segments:
+        key = (fields[0], fields[position])
+        if key != current_key:
+            if current_key is not None:
+                yield PeriodRecord(period, current_key[0], current_key[1], current_start, current_end)
+            if segment_start > end:
+                return
+            current_key, current_start = key, segment_start
+        current_end = segment_end
+
+
+def _week_layout_segments(calendar_class, start, spec):
+    """ Generate the weeks of a week-based calendar, i.e., retail or ISO calendar, as BaseDate._segments.
+
+    The weeks are read from the year layouts, advancing to the layout containing the day after each year end.
+    """
+    layout = calendar_class(start, spec=spec)._layout
+    week = layout.weeks.period_of(start)
+    while True:
+        quarters, months, weeks = layout.quarters, layout.months, layout.weeks
+        quarter_bounds = [(quarters.start_date(num), quarters.end_date(num)) for num in xrange(1, 5)]
+        quarter = quarters.period_of(weeks.start_date(week))
+        month = months.period_of(weeks.start_date(week))
+        for week in xrange(week, len(weeks.offsets)):
+            week_start = weeks.start_date(week)
+            if week_start > quarter_bounds[quarter-1][1]:
+                quarter += 1
+            if week_start > months.end_date(month):
+                month += 1
+            quarter_start, quarter_end = quarter_bounds[quarter-1]
+            yield week_start, weeks.end_date(week), (layout.year, quarter, month, week, quarter_start, quarter_end,
+                                                     layout.year_start, layout.year_end)
+        layout = calendar_class(layout.year_end + timedelta(1), spec=spec)._layout
+        week = 1
+
+
 class BaseDate(object):
     """
     The base calendar class for polymorphism and shared property implementations
+
+    Date instances are immutable values with __slots__: they only store the date's ordinal, today's date if given and
+    references to shared objects (e.g., CalendarSpec and year layouts). Expensive derived fields are computed on first
+    access and cached in slots.
     """
+    __slots__ = ('_ordinal', '_today', '_spec')
 
-    def __init__(self, mdate):
-        """ Initialize a date in regular calendar with the given datetime.date object.
+    def __init__(self, mdate, today=None, spec=None):
+        """ Initialize a date in this calendar with the given datetime.date object.
 
         :param mdate: the given datetime.date object.
+        :param today: default is the current date (today), if not specified.
+        :param spec: CalendarSpec defining this calendar. Default is the class' default_spec(), if not specified.
         :return:
         """
-        self.__date = mdate
+        object.__setattr__(self, '_ordinal', mdate.toordinal())
+        object.__setattr__(self, '_spec', spec)
+        # If not given, today is resolved by the clock only when needed, i.e., by is_current_year and is_previous_year.
+        # Specifying it is useful when verifying functionality when running on a particular date.
+        object.__setattr__(self, '_today', today)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("%s instances are immutable" % type(self).__name__)
+
+    def __delattr__(self, name):
+        raise AttributeError("%s instances are immutable" % type(self).__name__)
+
+    @classmethod
+    def default_spec(cls):
+        """ CalendarSpec used when none is given, defined by the class constants.
+
+        None for calendars that are not configurable.
+        """
+        return None
 
     @property
-    def year(self):
-        return self.__date.year
+    def spec(self):
+        """ CalendarSpec defining the calendar of this date instance.
+        """
+        return self._spec or self.default_spec()
+
+    def _cached(self, slot, compute):
+        """ Get the derived field cached in the given slot, computing it on first access.
+
+        :param slot: name of the slot caching the field.
+        :param compute: function without argument that computes the field.
+        :return: the value of the field.
+        """
+        try:
+            return getattr(self, slot)
+        except AttributeError:
+            value = compute()
+            object.__setattr__(self, slot, value)
+            return value
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self._ordinal == other._ordinal and self.spec == other.spec
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((type(self).__name__, self._ordinal, self.spec))
+
+    def __repr__(self):
+        return "%s(%r)" % (type(self).__name__, self._date)
+
+    def __reduce__(self):
+        return type(self), (self._date, self._today, self._spec)
 
     @property
-    def year_start_date(self):
-        raise CalendarImplError("Not implemented")
-        pass
+    def _date(self):
+        """ The given date as datetime.date object.
+        """
+        return date.fromordinal(self._ordinal)
 
     @property
-    def year_end_date(self):
-        raise CalendarImplError("Not implemented")
-        pass
+    def year(self):
+        return self._date.year
 
     @property
-    def is_current_year(self):
+    def year_start_date(self):
         raise CalendarImplError("Not implemented")
         pass
 
     @property
-    def is_previous_year(self):
+    def year_end_date(self):
         raise CalendarImplError("Not implemented")
         pass
 
@@ -88,10 +607,95 @@ class BaseDate(object):
         raise CalendarImplError("Not implemented")
         pass
 
+    @classmethod
+    def batch(cls, dates, spec=None):
+        """ Vectorized year and quarter properties for an array of dates.
+
+        :param dates: numpy datetime64 array, or int array of ordinals as returned by date.toordinal().
+        :param spec: CalendarSpec of the calendar, default_spec() if not specified.
+        :return: dict of numpy arrays keyed by property name: year, quarter, quarter_start_date, quarter_end_date,
+            year_start_date and year_end_date. Dates are in the same representation as the input.
+        """
+        raise CalendarImplError("Not implemented")
+
+    @classmethod
+    def _segments(cls, start, spec=None):
+        """ Generate the consecutive segments of days having the same periods, starting with the one containing the
+        given start date.
+
+        The default segments are the quarters, with the periods computed by a date instance per quarter. Calendars with
+        periods shorter than quarters override it.
+        :return: generator of (segment_start, segment_end, fields) tuples, fields being the DayRecord fields after date.
+        """
+        mdate = start
+        while True:
+            instance = cls(mdate, spec=spec)
+            quarter_start, quarter_end = instance.quarter_start_date, instance.quarter_end_date
+            yield quarter_start, quarter_end, (instance.year, instance.quarter, None, None, quarter_start, quarter_end,
+                                               instance.year_start_date, instance.year_end_date)
+            mdate = quarter_end + timedelta(1)
+
+    @classmethod
+    def iter_days(cls, start, end, spec=None):
+        """ Generate DayRecord of each date from start to end, both inclusive.
+
+        The periods are computed once per segment of days (e.g., quarter or week) and reused for the following days,
+        so iterating over a long date range is fast and uses constant memory.
+        :param start: the first datetime.date of the range.
+        :param end: the last datetime.date of the range.
+        :param spec: CalendarSpec of the calendar, default_spec() if not specified.
+        :return: generator of DayRecord instances.
+        """
+        make_record = DayRecord._make
+        from_ordinal = date.fromordinal
+        first, last = start.toordinal(), end.toordinal()
+        for segment_start, segment_end, fields in cls._segments(start, spec):
+            for ordinal in xrange(max(first, segment_start.toordinal()), min(last, segment_end.toordinal()) + 1):
+                yield make_record((from_ordinal(ordinal),) + fields)
+            if segment_end >= end:
+                return
+
+    @classmethod
+    def iter_periods(cls, start, end, period='quarter', spec=None):
+        """ Generate PeriodRecord of each period overlapping the range from start to end, both inclusive.
+
+        :param start: the first datetime.date of the range.
+        :param end: the last datetime.date of the range.
+        :param period: 'year', 'quarter' or, for calendars with month and week properties, 'month' or 'week'.
+        :param spec: CalendarSpec of the calendar, default_spec() if not specified.
+        :return: generator of PeriodRecord instances with the full boundaries of the periods.
+        """
+        if period not in _PERIOD_FIELDS or not hasattr(cls, period):
+            raise ValueError("%s has no %r periods" % (cls.__name__, period))
+        position = _PERIOD_FIELDS[period]
+
+        if period != 'week':
+            # Start from the first segment of the period containing the start date
+            start = getattr(cls(start, spec=spec), period + '_start_date')
+        return _merge_segments(cls._segments(start, spec), end, period, position)
+
     #################################
     # Shared implementation
     #################################
 
+    @property
+    def _current_periods(self):
+        """ CurrentPeriods of today's date as given, or as told by the clock if not given.
+        """
+        return CurrentPeriods.of(self._today if self._today else clock_today())
+
+    @property
+    def is_current_year(self):
+        """ Is this instance in the current year, if today is as given?
+        """
+        return self._current_periods.year(type(self), self.spec) == self.year
+
+    @property
+    def is_previous_year(self):
+        """ Is the given date in the previous year, if today is as given?
+        """
+        return self._current_periods.year(type(self), self.spec) - 1 == self.year
+
     @property
     def year_num_of_days(self):
         """ Number of days in the calendar year containing this date instance.
@@ -155,22 +759,15 @@ class RegularDate(BaseDate):
                              3: ((7, 1), (9, 30)),
                              4: ((10, 1), (12, 31))}
 
-    def __init__(self, mdate, today=None):
-        """ Initialize a date in regular calendar with the given datetime.date object.
+    __slots__ = ()
 
-        :param mdate: the given datetime.date object.
-        :param today: default is the current date (today), if not specified.
-        :return:
-        """
-        self._date = mdate
-        if not today:
-            self._today = date.today()
-        else:
-            # Useful when verifying functionality when running on a particular date.
-            self._today = today
+    @property
+    def year_start(self):
+        return date(self._date.year, 1, 1)
 
-        self.year_start = date(self._date.year, 1, 1)
-        self.year_end = date(self._date.year, 12, 31)
+    @property
+    def year_end(self):
+        return date(self._date.year, 12, 31)
 
     @property
     def year(self):
@@ -190,18 +787,6 @@ class RegularDate(BaseDate):
         """
         return self.year_end
 
-    @property
-    def is_current_year(self):
-        """ Is this instance in the current calendar year, if today is as given?
-        """
-        return True if (self._today.year == self.year) else False
-
-    @property
-    def is_previous_year(self):
-        """ Is the given date in the previous calendar year, if today is as given?
-        """
-        return True if (self._today.year - 1 == self.year) else False
-
     @property
     def quarter(self):
         """ Find the quarter number for the given date.
@@ -227,6 +812,24 @@ class RegularDate(BaseDate):
         end_date = self._QUARTER_NUM_TO_DATE[self.quarter][1]
         return date(self.year, *end_date)
 
+    @classmethod
+    def batch(cls, dates, spec=None):
+        """ Vectorized year and quarter properties for an array of dates. See BaseDate.batch.
+        """
+        days, as_ordinals = to_day_array(dates)
+        year = _years_of(days)
+        quarter = (_months_of(days) - 1) // 3 + 1
+
+        quarter_start = np.empty_like(days)
+        quarter_end = np.empty_like(days)
+        for num, (start_date, end_date) in cls._QUARTER_NUM_TO_DATE.items():
+            mask = quarter == num
+            quarter_start[mask] = _make_dates(year[mask], *start_date)
+            quarter_end[mask] = _make_dates(year[mask], *end_date)
+
+        return _batch_result(as_ordinals, year, quarter, quarter_start, quarter_end,
+                             _make_dates(year, 1, 1), _make_dates(year, 12, 31))
+
     #################################
     # String format properties
     #################################
@@ -247,55 +850,69 @@ class FiscalDate(BaseDate):
     This utility class converts a given datetime.date instance into a FISCAL calendar's date instance with
     different pre-computed attributes of interest such as quarter starting date for that date, etc.
 
-    To use for another fiscal calendar (e.g., different fiscal month), it is user's responsibility to update all
-    internal class constants properly before creating FiscalDate instances:
+    The fiscal year starts on the start_month and start_day of the given CalendarSpec, and each quarter starts three
+    months after the previous one. If no spec is given, the spec is defined by the class constants:
 
     _FISCAL_START_MONTH
     _FISCAL_START_DAY
-    _QUARTER_NUM_TO_DATE
     """
     # Each fiscal year starts on August 1st.
     _FISCAL_START_MONTH = 8
     _FISCAL_START_DAY = 1
 
-    # quarter's starting and ending dates
-    # It is easier and less error-prone to edit this constant than write code
-    _QUARTER_NUM_TO_DATE = { 1: ((8, 1), (10, 31)),
-                             2: ((11, 1), (1, 31)),
-                             3: ((2, 1), (4, 30)),
-                             4: ((5, 1), (7, 31))}
+    # Lazily looked up FiscalYearLayout of the fiscal year
+    __slots__ = ('_year_layout',)
 
-    def __init__(self, mdate, today=None):
-        """ Initialize a date in fiscal calendar with the given datetime.date object.
+    @classmethod
+    def default_spec(cls):
+        return CalendarSpec.shared(cls._FISCAL_START_MONTH, cls._FISCAL_START_DAY)
 
-        :param mdate: the given datetime.date object.
-        :param today: default is the current date (today), if not specified.
-        :return:
+    @property
+    def _layout(self):
+        return self._cached('_year_layout', self._find_layout)
+
+    def _find_layout(self):
+        """ Find the layout of the fiscal year containing this date instance.
+        """
+        mdate = self._date
+        spec = self.spec
+        if mdate < date(mdate.year, spec.start_month, spec.start_day):
+            return self.year_layout(mdate.year - 1, spec)
+        return self.year_layout(mdate.year, spec)
+
+    # Year layouts shared by all FiscalDate instances.
+    _year_layouts = LRUCache(maxsize=256)
+
+    @classmethod
+    def year_layout(cls, start_year, spec=None):
+        """ Get the layout of the fiscal year starting in the given calendar year, computed once per spec.
+
+        :param start_year: the calendar year of the fiscal year's starting date.
+        :param spec: CalendarSpec of the fiscal calendar, default_spec() if not specified.
+        :return: FiscalYearLayout instance.
         """
-        self._date = mdate
-        if not today:
-            self._today = date.today()
-        else:
-            # Useful when verifying functionality when running on a particular date.
-            self._today = today
+        spec = spec or cls.default_spec()
+        return cls._year_layouts.get((spec, start_year),
+                                     lambda: FiscalYearLayout.from_start_year(start_year, spec))
 
-        self.year_start, self.year_end = FiscalDate.get_fiscal_start_end(self._date)
-        pass
+    @property
+    def year_start(self):
+        return self._layout.year_start
+
+    @property
+    def year_end(self):
+        return self._layout.year_end
 
     @staticmethod
-    def get_fiscal_start_end(mdate):
+    def get_fiscal_start_end(mdate, spec=None):
         """ Get the fiscal year's starting and ending dates that contain the given date
 
         :param mdate: the given date.
+        :param spec: CalendarSpec of the fiscal calendar, FiscalDate.default_spec() if not specified.
         :return:
         """
-        if mdate < date(mdate.year, FiscalDate._FISCAL_START_MONTH, FiscalDate._FISCAL_START_DAY):
-            year_start = date(mdate.year - 1, FiscalDate._FISCAL_START_MONTH, FiscalDate._FISCAL_START_DAY)
-            year_end = date(mdate.year, FiscalDate._FISCAL_START_MONTH, FiscalDate._FISCAL_START_DAY) - timedelta(1)
-        else:
-            year_start = date(mdate.year, FiscalDate._FISCAL_START_MONTH, FiscalDate._FISCAL_START_DAY)
-            year_end = date(mdate.year + 1, FiscalDate._FISCAL_START_MONTH, FiscalDate._FISCAL_START_DAY) - timedelta(1)
-        return year_start, year_end
+        layout = FiscalDate(mdate, spec=spec)._layout
+        return layout.year_start, layout.year_end
 
     @property
     def year(self):
@@ -304,7 +921,7 @@ class FiscalDate(BaseDate):
         Fiscal year is defined as the year number of the fiscal year end.
         :return:
         """
-        return self.year_end.year
+        return self._layout.year
 
     @property
     def year_start_date(self):
@@ -318,57 +935,53 @@ class FiscalDate(BaseDate):
         """
         return self.year_end
 
-    @property
-    def is_current_year(self):
-        """ Is this instance in the current fiscal year, if today is as given?
-        """
-        _, today_year_end = self.get_fiscal_start_end(self._today)
-        return True if (today_year_end.year == self.year) else False
-
-    @property
-    def is_previous_year(self):
-        """ Is the given date in the previous fiscal year, if today is as given?
-        """
-        _, today_year_end = self.get_fiscal_start_end(self._today)
-        return True if (today_year_end.year - 1 == self.year) else False
-
     @property
     def quarter(self):
         """ Find the fiscal quarter number for the given date.
 
-        Quarter is based on month (every three months), which is one-based in self._date.
+        Quarter is based on month (every three months from the fiscal year's starting date).
         :return: Quarter number for the input date.
         """
-        if self._date.year == self.year - 1:
-            zero_based_month = self._date.month - self._FISCAL_START_MONTH
-            quarter_num = zero_based_month / 3 + 1
-            return quarter_num
-        else:
-            zero_based_month = self._date.month + 12 - self._FISCAL_START_MONTH
-            quarter_num = zero_based_month / 3 + 1
-            return quarter_num
+        return self._layout.quarters.period_of(self._date)
 
     @property
     def quarter_start_date(self):
         """ Find the starting date of the quarter that contains the given date.
         """
-        # Make sure the starting date of the first quarter is as defined.
-        assert self._QUARTER_NUM_TO_DATE[1][0] == (self._FISCAL_START_MONTH, self._FISCAL_START_DAY)
-
-        start_date = self._QUARTER_NUM_TO_DATE[self.quarter][0]
-        start_year = self.year if self.quarter > 2 else self.year-1
-        return date(start_year, *start_date)
+        return self._layout.quarters.start_date(self.quarter)
 
     @property
     def quarter_end_date(self):
         """ Find the ending date of the quarter that contains the given date.
         """
-        # Make sure the starting date of the first quarter is as defined.
-        assert self._QUARTER_NUM_TO_DATE[1][0] == (self._FISCAL_START_MONTH, self._FISCAL_START_DAY)
+        return self._layout.quarters.end_date(self.quarter)
 
-        end_date = self._QUARTER_NUM_TO_DATE[self.quarter][1]
-        end_year = self.year if self.quarter > 1 else self.year-1
-        return date(end_year, *end_date)
+    @classmethod
+    def batch(cls, dates, spec=None):
+        """ Vectorized year and quarter properties for an array of dates. See BaseDate.batch.
+        """
+        spec = spec or cls.default_spec()
+        days, as_ordinals = to_day_array(dates)
+        calendar_year = _years_of(days)
+
+        fiscal_start = _make_dates(calendar_year, spec.start_month, spec.start_day)
+        year_start = np.where(days < fiscal_start,
+                              _make_dates(calendar_year - 1, spec.start_month, spec.start_day),
+                              fiscal_start)
+
+        # Starting dates of the four quarters and of the next fiscal year
+        start_month = year_start.astype('datetime64[M]')
+        starts = np.array([(start_month + months).astype('datetime64[D]') + (spec.start_day - 1)
+                           for months in (0, 3, 6, 9, 12)])
+        year_end = starts[4] - 1
+        year = _years_of(year_end)
+
+        quarter = 1 + (days >= starts[1]).astype(np.int64) + (days >= starts[2]) + (days >= starts[3])
+        columns = np.arange(days.size).reshape(days.shape)
+        quarter_start = starts[quarter - 1, columns]
+        quarter_end = starts[quarter, columns] - 1
+
+        return _batch_result(as_ordinals, year, quarter, quarter_start, quarter_end, year_start, year_end)
 
     #################################
     # String format properties
@@ -383,6 +996,9 @@ class RetailDate(BaseDate):
     different pre-computed attributes of interest such as quarter starting date for that date, etc.
 
     More on Retail calendar: https://en.wikipedia.org/wiki/4%E2%80%934%E2%80%935_calendar
+
+    The retail calendar is defined by the given CalendarSpec. If no spec is given, the spec is defined by the class
+    constants below, with weeks starting on Sunday.
     """
     # Each fiscal year starts on August 1st.
     # Retail calendar's end date is the last Saturday of the month at fiscal year end.
@@ -394,85 +1010,161 @@ class RetailDate(BaseDate):
     # In the case of 53-week, the extra week is put in the last month. In this case, last quarter is (5, 4, 5)
     LEAP_MONTH = 12
 
-    def __init__(self, mdate, today=None):
-        """ Initialize a date in retail calendar with the given datetime.date object.
+    # Lazily looked up WeekYearLayout of the retail year
+    __slots__ = ('_year_layout',)
 
-        :param mdate: the given datetime.date object.
-        :param today: default is the current date (today), if not specified.
-        :return:
+    @property
+    def _layout(self):
+        return self._cached('_year_layout', self._find_layout)
+
+    def _find_layout(self):
+        """ Find the layout of the retail year containing this date instance.
         """
-        self._date = mdate
-        if not today:
-            self._today = date.today()
-        else:
-            # Useful when verifying functionality when running on a particular date.
-            self._today = today
+        # The retail year of a date is either the same as its calendar year, the previous or the next one.
+        mdate = self._date
+        spec = self.spec
+        layout = self.year_layout(mdate.year, spec)
+        if mdate < layout.year_start:
+            layout = self.year_layout(mdate.year - 1, spec)
+        elif mdate > layout.year_end:
+            layout = self.year_layout(mdate.year + 1, spec)
+        return layout
+
+    @classmethod
+    def default_spec(cls):
+        return CalendarSpec.shared(cls.FISCAL_START_MONTH, cls.FISCAL_START_DAY, tuple(cls.WEEKS_IN_MONTH),
+                                   cls.LEAP_MONTH, SUNDAY)
+
+    # Year layouts shared by all RetailDate instances.
+    _year_layouts = LRUCache(maxsize=256)
+
+    @classmethod
+    def year_layout(cls, year, spec=None):
+        """ Get the layout of the given retail year, computed once per spec.
+
+        Retail year is defined as the year number of the retail year end, or of the fiscal start for a fiscal
+        start in the first week of January (see _end_year_offset).
+        :param year: the retail year.
+        :param spec: CalendarSpec of the retail calendar, default_spec() if not specified.
+        :return: WeekYearLayout instance.
+        """
+        spec = spec or cls.default_spec()
 
-        self.year_start, self.year_end = RetailDate.get_retail_start_end(self._date)
+        def compute_layout():
+            year_start = cls._retail_end_in_year(year - 1, spec) + timedelta(1)
+            year_end = cls._retail_end_in_year(year, spec)
+            return WeekYearLayout.from_year_boundaries(year, year_start, year_end,
+                                                       spec.weeks_in_month, spec.leap_month)
 
-        self.is_53_week = True if self.year_num_of_days == 53 * 7 else False
-        # Create an instance copy
-        self._weeks_in_month = self.WEEKS_IN_MONTH[:]
-        if self.is_53_week:
-            # Add additional week to the leap month
-            self._weeks_in_month[self.LEAP_MONTH-1] += 1
+        return cls._year_layouts.get((spec, year), compute_layout)
 
-        self.weeks_in_quarter = [sum(self._weeks_in_month[0:3]),
-                            sum(self._weeks_in_month[3:6]),
-                            sum(self._weeks_in_month[6:9]),
-                            sum(self._weeks_in_month[9:12])]
-        pass
+    @property
+    def year_start(self):
+        return self._layout.year_start
+
+    @property
+    def year_end(self):
+        return self._layout.year_end
+
+    @property
+    def is_53_week(self):
+        return self._layout.is_53_week
+
+    @property
+    def weeks_in_quarter(self):
+        return list(self._layout.weeks_in_quarter)
 
     @staticmethod
-    def get_retail_start_end(mdate):
+    def get_retail_start_end(mdate, spec=None):
         """ Get the retail year's starting and ending dates that contain the given date
 
         :param mdate: the given date.
+        :param spec: CalendarSpec of the retail calendar, RetailDate.default_spec() if not specified.
         :return:
         """
-
-        retail_end = RetailDate.retail_end_by_year(mdate.year)
-
-        if mdate <= retail_end:
-            # mdate is in the current retail year
-            year_start = RetailDate.retail_end_by_year(mdate.year-1) + timedelta(1)
-            year_end = retail_end
-        else:
-            # mdate is in the next retail year
-            year_start = retail_end + timedelta(1)
-            year_end = RetailDate.retail_end_by_year(mdate.year+1)
-
-        return year_start, year_end
+        layout = RetailDate(mdate, spec=spec)._layout
+        return layout.year_start, layout.year_end
 
     @staticmethod
-    def retail_end_by_year(year):
+    def retail_end_by_year(year, spec=None):
         """ Retail calendar's year end for the given year.
-        Retail calendar's end date is the last Saturday of the month at fiscal year end.
+        Retail calendar's end date is the last day of the last week (e.g., last Saturday) before the fiscal year start.
 
         :param year:
+        :param spec: CalendarSpec of the retail calendar, RetailDate.default_spec() if not specified.
         :return:
         """
-        fiscal_start = date(year, RetailDate.FISCAL_START_MONTH, RetailDate.FISCAL_START_DAY)
-        # if fiscal_start is Sunday, then it's a retail start.
-        # Otherwise, it is the very last Sunday.
-        if fiscal_start.weekday() == 6:
-            retail_start = fiscal_start
-        else:
-            # If Monday, weekday() == 0, move it back by 1 day
-            # If Saturday, weekday() = 5, move it back by 6 days
-            retail_start = fiscal_start - timedelta(fiscal_start.weekday() + 1)
+        spec = spec or RetailDate.default_spec()
+        fiscal_start = date(year, spec.start_month, spec.start_day)
+        # if fiscal_start is the first day of a week (e.g., Sunday), then it's a retail start.
+        # Otherwise, it is the very last first day of a week.
+        # E.g., for weeks starting on Sunday: if Monday, weekday() == 0, move it back by 1 day;
+        # if Saturday, weekday() = 5, move it back by 6 days
+        retail_start = fiscal_start - timedelta((fiscal_start.weekday() - spec.week_start) % 7)
 
         # Retail year end is simply the day before that.
         return retail_start-timedelta(1)
 
+    @staticmethod
+    def _end_year_offset(spec):
+        """ Offset from a retail year to the year of the fiscal start following it.
+
+        A fiscal start in the first week of January is preceded by a retail year end in either the last days of
+        December or the first days of January. Like ISO years, these retail years are then numbered by the calendar
+        year they mostly cover, i.e., the year of the fiscal start they contain, so that each number is used once.
+        """
+        return 1 if spec.start_month == 1 and spec.start_day <= 7 else 0
+
+    @staticmethod
+    def _retail_end_in_year(year, spec):
+        """ End date of the given retail year.
+
+        It falls in the calendar year year, or in the first 6 days of the next one for a fiscal start in the first
+        week of January.
+        """
+        return RetailDate.retail_end_by_year(year + RetailDate._end_year_offset(spec), spec)
+
+    @staticmethod
+    def _batch_retail_end_by_year(years, spec):
+        """ Vectorized retail_end_by_year for an array of years.
+        """
+        fiscal_start = _make_dates(years, spec.start_month, spec.start_day)
+        days_back = (_weekdays_of(fiscal_start) - spec.week_start) % 7
+        return fiscal_start - days_back.astype('timedelta64[D]') - 1
+
+    @classmethod
+    def _batch_retail_end_in_year(cls, years, spec):
+        """ Vectorized _retail_end_in_year for an array of years.
+        """
+        return cls._batch_retail_end_by_year(years + cls._end_year_offset(spec), spec)
+
+    @classmethod
+    def batch(cls, dates, spec=None):
+        """ Vectorized year and quarter properties for an array of dates. See BaseDate.batch.
+        """
+        spec = spec or cls.default_spec()
+        days, as_ordinals = to_day_array(dates)
+        calendar_year = _years_of(days)
+
+        year = (calendar_year
+                - (days <= cls._batch_retail_end_in_year(calendar_year - 1, spec)).astype(np.int64)
+                + (days > cls._batch_retail_end_in_year(calendar_year, spec)).astype(np.int64))
+        year_start = cls._batch_retail_end_in_year(year - 1, spec) + 1
+        year_end = cls._batch_retail_end_in_year(year, spec)
+
+        quarter, quarter_start, quarter_end = _batch_week_quarters(days, year_start, year_end,
+                                                                   spec.weeks_in_month, spec.leap_month)
+        return _batch_result(as_ordinals, year, quarter, quarter_start, quarter_end, year_start, year_end)
+
     @property
     def year(self):
         """ Return the retail year of the given date.
 
-        Retail year is defined as the year number of the retail year end.
+        Retail year is defined as the year number of the retail year end, or of the fiscal start for a fiscal
+        start in the first week of January (see _end_year_offset).
         :return:
         """
-        return self.year_end.year
+        return self._layout.year
 
     @property
     def year_start_date(self):
@@ -486,20 +1178,6 @@ class RetailDate(BaseDate):
         """
         return self.year_end
 
-    @property
-    def is_current_year(self):
-        """ Is this instance in the current retail year, if today is as given?
-        """
-        _, today_year_end = self.get_retail_start_end(self._today)
-        return True if (today_year_end.year == self.year) else False
-
-    @property
-    def is_previous_year(self):
-        """ Is the given date in the previous retail year, if today is as given?
-        """
-        _, today_year_end = self.get_retail_start_end(self._today)
-        return True if (today_year_end.year - 1 == self.year) else False
-
     @property
     def quarter(self):
         """ Find the retail quarter number for the given date.
@@ -507,35 +1185,56 @@ class RetailDate(BaseDate):
         Quarter is based on month (every three months), which is one-based in self._date.
         :return: Quarter number for the input date.
         """
-        num_days = (self._date - self.year_start_date).days
-        week_num = num_days / 7
-
-        week_cumsum = [0]
-        week_cumsum.extend(cumsum(self.weeks_in_quarter))
-        count = 0
-        for count in xrange(1, len(week_cumsum)):
-            if week_cumsum[count-1] <= week_num < week_cumsum[count]:
-                break
-        return count
+        return self._layout.quarters.period_of(self._date)
 
     @property
     def quarter_start_date(self):
         """ Find the starting date of the quarter that contains the given date.
         """
-        # Find the running total of weeks per quarter
-        week_cumsum = [0]
-        week_cumsum.extend(cumsum(self.weeks_in_quarter))
-        start_date = self.year_start_date + timedelta(week_cumsum[self.quarter-1]*7)
-        return start_date
+        return self._layout.quarters.start_date(self.quarter)
 
     @property
     def quarter_end_date(self):
         """ Find the ending date of the quarter that contains the given date.
         """
-        # Find the running total of weeks per quarter
-        week_cumsum = list(cumsum(self.weeks_in_quarter))
-        end_date = self.year_start_date + timedelta(week_cumsum[self.quarter-1]*7-1)
-        return end_date
+        return self._layout.quarters.end_date(self.quarter)
+
+    @property
+    def month(self):
+        """ Find the retail month number for the given date.
+
+        Months are groups of weeks in each quarter, e.g. 5-4-4, with the additional week of a 53-week year in the
+        leap month.
+        :return: Month number (1-12) for the input date.
+        """
+        return self._layout.months.period_of(self._date)
+
+    @property
+    def month_start_date(self):
+        """ Find the starting date of the month that contains the given date.
+        """
+        return self._layout.months.start_date(self.month)
+
+    @property
+    def month_end_date(self):
+        """ Find the ending date of the month that contains the given date.
+        """
+        return self._layout.months.end_date(self.month)
+
+    @property
+    def week(self):
+        """ Find the retail week number for the given date.
+
+        :return: Week number (1-53) for the input date.
+        """
+        return self._layout.weeks.period_of(self._date)
+
+    @classmethod
+    def _segments(cls, start, spec=None):
+        """ Generate the consecutive weeks starting with the one containing the given start date. See
+        BaseDate._segments.
+        """
+        return _week_layout_segments(cls, start, spec)
 
     #################################
     # String format properties
@@ -551,6 +1250,9 @@ class IsoDate(BaseDate):
 
     http://www.staff.science.uu.nl/~gent0113/calendar/isocalendar.htm
     https://en.wikipedia.org/wiki/ISO_week_date
+
+    ISO years and weeks are fixed by the standard. The grouping of weeks into months is defined by the given
+    CalendarSpec or, if no spec is given, by the class constants below.
     """
 
     # Weeks in each month: Grouping of 13 weeks in a quarter can be 5-4-4 or 4-4-5.
@@ -558,37 +1260,68 @@ class IsoDate(BaseDate):
     # In the case of 53-week, the extra week is put in the last month. In this case, last quarter is (5, 4, 5)
     LEAP_MONTH = 12
 
-    def __init__(self, mdate, today=None):
-        """ Initialize a date in regular calendar with the given datetime.date object.
+    # Lazily looked up WeekYearLayout of the ISO year
+    __slots__ = ('_year_layout',)
 
-        :param mdate: the given datetime.date object.
-        :param today: default is the current date (today), if not specified.
-        :return:
+    @property
+    def _layout(self):
+        return self._cached('_year_layout', self._find_layout)
+
+    def _find_layout(self):
+        """ Find the layout of the ISO year containing this date instance.
         """
-        self._date = mdate
-        if not today:
-            self._today = date.today()
-        else:
-            # Useful when verifying functionality when running on a particular date.
-            self._today = today
-
-        self._year = self._date.isocalendar()[0]
-        self.year_start = self.iso_year_start(self._date)
-        self.year_end = self.iso_year_end(self._date)
-
-        self.is_53_week = True if self.year_num_of_days == 53 * 7 else False
-        # Create an instance copy
-        self._weeks_in_month = self.WEEKS_IN_MONTH[:]
-        if self.is_53_week:
-            # Add additional week to the leap month
-            self._weeks_in_month[self.LEAP_MONTH-1] += 1
+        # The ISO year of a date is either the same as its calendar year, the previous or the next one.
+        mdate = self._date
+        spec = self.spec
+        layout = self.year_layout(mdate.year, spec)
+        if mdate < layout.year_start:
+            layout = self.year_layout(mdate.year - 1, spec)
+        elif mdate > layout.year_end:
+            layout = self.year_layout(mdate.year + 1, spec)
+        return layout
+
+    @classmethod
+    def default_spec(cls):
+        return CalendarSpec.shared(1, 1, tuple(cls.WEEKS_IN_MONTH), cls.LEAP_MONTH, MONDAY)
+
+    # Year layouts shared by all IsoDate instances.
+    _year_layouts = LRUCache(maxsize=256)
+
+    @classmethod
+    def year_layout(cls, year, spec=None):
+        """ Get the layout of the given ISO year, computed once per spec.
+
+        :param year: the ISO year.
+        :param spec: CalendarSpec of the ISO calendar, default_spec() if not specified.
+        :return: WeekYearLayout instance.
+        """
+        spec = spec or cls.default_spec()
+
+        def compute_layout():
+            forth_jan = date(year, 1, 4)
+            return WeekYearLayout.from_year_boundaries(year, cls.iso_year_start(forth_jan), cls.iso_year_end(forth_jan),
+                                                       spec.weeks_in_month, spec.leap_month)
+
+        return cls._year_layouts.get((spec, year), compute_layout)
 
-        self.weeks_in_quarter = [sum(self._weeks_in_month[0:3]),
-                            sum(self._weeks_in_month[3:6]),
-                            sum(self._weeks_in_month[6:9]),
-                            sum(self._weeks_in_month[9:12])]
+    @property
+    def year_start(self):
+        return self._layout.year_start
+
+    @property
+    def year_end(self):
+        return self._layout.year_end
 
-    def iso_year_start(self, mdate):
+    @property
+    def is_53_week(self):
+        return self._layout.is_53_week
+
+    @property
+    def weeks_in_quarter(self):
+        return list(self._layout.weeks_in_quarter)
+
+    @staticmethod
+    def iso_year_start(mdate):
         """ Find starting date of ISO year that contains the given date.
 
         The first week of the ISO calendar year is the earliest week that contains at least 4 days of January.
@@ -600,7 +1333,8 @@ class IsoDate(BaseDate):
         year_start = forth_jan + timedelta(days=1-forth_jan.isocalendar()[2])
         return year_start
 
-    def iso_year_end(self, mdate):
+    @staticmethod
+    def iso_year_end(mdate):
         """ Find ending date of ISO year that contains the given date.
 
         4th January is the latest that week 1 can start.
@@ -611,11 +1345,36 @@ class IsoDate(BaseDate):
         year_end = forth_jan - timedelta(days=forth_jan.isocalendar()[2])
         return year_end
 
+    @staticmethod
+    def _batch_iso_year_start(years):
+        """ Vectorized starting dates of the given ISO years: the Monday of the week containing 4th January.
+        """
+        forth_jan = _make_dates(years, 1, 4)
+        return forth_jan - _weekdays_of(forth_jan).astype('timedelta64[D]')
+
+    @classmethod
+    def batch(cls, dates, spec=None):
+        """ Vectorized year and quarter properties for an array of dates. See BaseDate.batch.
+        """
+        spec = spec or cls.default_spec()
+        days, as_ordinals = to_day_array(dates)
+        calendar_year = _years_of(days)
+
+        year = (calendar_year
+                - (days < cls._batch_iso_year_start(calendar_year)).astype(np.int64)
+                + (days >= cls._batch_iso_year_start(calendar_year + 1)).astype(np.int64))
+        year_start = cls._batch_iso_year_start(year)
+        year_end = cls._batch_iso_year_start(year + 1) - 1
+
+        quarter, quarter_start, quarter_end = _batch_week_quarters(days, year_start, year_end,
+                                                                   spec.weeks_in_month, spec.leap_month)
+        return _batch_result(as_ordinals, year, quarter, quarter_start, quarter_end, year_start, year_end)
+
     @property
     def year(self):
         """ Return the calendar year of the given date.
         """
-        return self._year
+        return self._layout.year
 
     @property
     def year_start_date(self):
@@ -629,18 +1388,6 @@ class IsoDate(BaseDate):
         """
         return self.year_end
 
-    @property
-    def is_current_year(self):
-        """ Is this instance in the current calendar year, if today is as given?
-        """
-        return True if (self._today.isocalendar()[0] == self.year) else False
-
-    @property
-    def is_previous_year(self):
-        """ Is the given date in the previous calendar year, if today is as given?
-        """
-        return True if (self._today.isocalendar()[0] - 1 == self.year) else False
-
     @property
     def quarter(self):
         """ Find the retail quarter number for the given date.
@@ -648,35 +1395,56 @@ class IsoDate(BaseDate):
         Quarter is based on month (every three months), which is one-based in self._date.
         :return: Quarter number for the input date.
         """
-        num_days = (self._date - self.year_start_date).days
-        week_num = num_days / 7
-
-        week_cumsum = [0]
-        week_cumsum.extend(cumsum(self.weeks_in_quarter))
-        count = 0
-        for count in xrange(1, len(week_cumsum)):
-            if week_cumsum[count-1] <= week_num < week_cumsum[count]:
-                break
-        return count
+        return self._layout.quarters.period_of(self._date)
 
     @property
     def quarter_start_date(self):
         """ Find the starting date of the quarter that contains the given date.
         """
-        # Find the running total of weeks per quarter
-        week_cumsum = [0]
-        week_cumsum.extend(cumsum(self.weeks_in_quarter))
-        start_date = self.year_start_date + timedelta(week_cumsum[self.quarter-1]*7)
-        return start_date
+        return self._layout.quarters.start_date(self.quarter)
 
     @property
     def quarter_end_date(self):
         """ Find the ending date of the quarter that contains the given date.
         """
-        # Find the running total of weeks per quarter
-        week_cumsum = list(cumsum(self.weeks_in_quarter))
-        end_date = self.year_start_date + timedelta(week_cumsum[self.quarter-1]*7-1)
-        return end_date
+        return self._layout.quarters.end_date(self.quarter)
+
+    @property
+    def month(self):
+        """ Find the ISO month number for the given date.
+
+        Months are groups of weeks in each quarter, e.g. 5-4-4, with the additional week of a 53-week year in the
+        leap month.
+        :return: Month number (1-12) for the input date.
+        """
+        return self._layout.months.period_of(self._date)
+
+    @property
+    def month_start_date(self):
+        """ Find the starting date of the month that contains the given date.
+        """
+        return self._layout.months.start_date(self.month)
+
+    @property
+    def month_end_date(self):
+        """ Find the ending date of the month that contains the given date.
+        """
+        return self._layout.months.end_date(self.month)
+
+    @property
+    def week(self):
+        """ Find the ISO week number for the given date.
+
+        :return: Week number (1-53) for the input date.
+        """
+        return self._layout.weeks.period_of(self._date)
+
+    @classmethod
+    def _segments(cls, start, spec=None):
+        """ Generate the consecutive weeks starting with the one containing the given start date. See
+        BaseDate._segments.
+        """
+        return _week_layout_segments(cls, start, spec)
 
     #################################
     # String format properties
@@ -699,31 +1467,42 @@ class LunarDate(BaseDate):
     different pre-computed attributes of interest such as quarter starting date for that date, etc.
     """
 
-    def __init__(self, mdate, today=None):
-        """ Initialize a date in lunar calendar with the given datetime.date object.
+    # Lazily computed PyCalCal's Chinese date and (year_start, year_end) tuple
+    __slots__ = ('_chinese', '_year_bounds')
 
-        :param mdate: the given datetime.date object.
-        :param today: default is the current date (today), if not specified.
-        :return:
-        """
-        self._date = mdate
-        if not today:
-            self._today = date.today()
-        else:
-            # Useful when verifying functionality when running on a particular date.
-            self._today = today
-
-        self._chinese_date = self.lunar_from_regular(self._date)
-        fixed_date = pycal.fixed_from_gregorian((self._date.year, self._date.month, self._date.day))
-        self._chinese_date = pycal.chinese_from_fixed(fixed_date)
-        cycle, year, month, leap_month, day = self._chinese_date
-        self._year = self.normalize_lunar_year(cycle, year)
-        self._month = month
-        self._day = day
+    @property
+    def _chinese_date(self):
+        return self._cached('_chinese', lambda: self.lunar_from_regular(self._date))
 
+    @property
+    def _year(self):
+        cycle, year, _, _, _ = self._chinese_date
+        return self.normalize_lunar_year(cycle, year)
+
+    @property
+    def _month(self):
+        return self._chinese_date[2]
+
+    @property
+    def _day(self):
+        return self._chinese_date[4]
+
+    def _find_year_bounds(self):
+        """ Find the starting and ending dates of the lunar year containing this date instance.
+        """
+        cycle, year, _, leap_month, _ = self._chinese_date
         # chinese_new_year_on_or_before does not work
-        self._year_start = self.regular_from_lunar((cycle, year, 1, leap_month, 1))
-        self._year_end = self.regular_from_lunar((cycle, year + 1, 1, leap_month, 1)) - timedelta(1)
+        year_start = self.regular_from_lunar((cycle, year, 1, leap_month, 1))
+        year_end = self.regular_from_lunar((cycle, year + 1, 1, leap_month, 1)) - timedelta(1)
+        return year_start, year_end
+
+    @property
+    def _year_start(self):
+        return self._cached('_year_bounds', self._find_year_bounds)[0]
+
+    @property
+    def _year_end(self):
+        return self._cached('_year_bounds', self._find_year_bounds)[1]
 
     def normalize_lunar_year(self, cycle, year):
         """ Normalize lunar year to make it close to solar year number.
@@ -773,22 +1552,6 @@ class LunarDate(BaseDate):
         """
         return self._year_end
 
-    @property
-    def is_current_year(self):
-        """ Is this instance in the current calendar year, if today is as given?
-        """
-        cycle, year, _, _, _ = self.lunar_from_regular(self._today)
-        today_year = self.normalize_lunar_year(cycle, year)
-        return True if (today_year == self.year) else False
-
-    @property
-    def is_previous_year(self):
-        """ Is the given date in the previous calendar year, if today is as given?
-        """
-        cycle, year, _, _, _ = self.lunar_from_regular(self._today)
-        today_year = self.normalize_lunar_year(cycle, year)
-        return True if (today_year - 1 == self.year) else False
-
     @property
     def quarter(self):
         """ Find the quarter number for the given date.
@@ -823,6 +1586,26 @@ class LunarDate(BaseDate):
         quarter_end = self.regular_from_lunar((cycle, year, month, leap_month, 1))
         return quarter_end - timedelta(1)
 
+    @classmethod
+    def _segments(cls, start, spec=None):
+        """ Generate the consecutive lunar months starting with the one containing the given start date. See
+        BaseDate._segments.
+
+        The periods of a date only depend on its lunar month, i.e., on its Chinese date without the day.
+        """
+        mdate = start
+        while True:
+            instance = cls(mdate)
+            month_start = mdate - timedelta(instance._day - 1)
+            # A lunar month has 29 or 30 days.
+            if instance.lunar_from_regular(month_start + timedelta(29))[4] == 30:
+                month_end = month_start + timedelta(29)
+            else:
+                month_end = month_start + timedelta(28)
+            yield month_start, month_end, (instance.year, instance.quarter, None, None, instance.quarter_start_date,
+                                           instance.quarter_end_date, instance.year_start_date, instance.year_end_date)
+            mdate = month_end + timedelta(1)
+
     #################################
     # String format properties
     #################################
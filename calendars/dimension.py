@@ -0,0 +1,205 @@
+"""
+Calendar dimension table (dim_date) exporter.
+
+Materialize a table with one row per date of a date range and the attributes of the regular, fiscal, retail, ISO and
+lunar calendars, e.g. for warehouse joins. The table is generated in columnar chunks and written in a streaming
+fashion to CSV, or to Arrow IPC or Parquet files when pyarrow is available.
+
+Usage: python -m calendars.dimension START END OUTPUT [--format csv|arrow|parquet] [--calendars regular,retail,...]
+"""
+
+from __future__ import absolute_import
+
+import argparse
+from collections import OrderedDict
+import csv
+from datetime import date, datetime
+from itertools import islice
+import sys
+import time
+
+from calendars.calendars import RegularDate, FiscalDate, RetailDate, IsoDate, LunarDate
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    # pyarrow is only needed for the Arrow IPC and Parquet formats.
+    pa = None
+    pq = None
+
+
+# Calendar classes by column prefix, in column order
+CALENDARS = OrderedDict([('regular', RegularDate),
+                         ('fiscal', FiscalDate),
+                         ('retail', RetailDate),
+                         ('iso', IsoDate),
+                         ('lunar', LunarDate)])
+
+FORMATS = ('csv', 'arrow', 'parquet')
+
+# Default number of rows in each chunk
+CHUNK_SIZE = 10000
+
+# Fields of DayRecord exported for each calendar, with their column types
+_PERIOD_COLUMNS = [('year', 'int'),
+                   ('quarter', 'int'),
+                   ('month', 'int'),
+                   ('week', 'int'),
+                   ('quarter_start_date', 'date'),
+                   ('quarter_end_date', 'date'),
+                   ('year_start_date', 'date'),
+                   ('year_end_date', 'date')]
+
+
+def dim_date_columns(calendars=tuple(CALENDARS)):
+    """ Names and types of the columns of the dim_date table.
+
+    :param calendars: names of the calendars in CALENDARS to include.
+    :return: list of (name, type) tuples, with type 'int' or 'date'.
+    """
+    columns = [('date_key', 'int'), ('date', 'date'), ('day_of_week', 'int')]
+    for name in calendars:
+        if name not in CALENDARS:
+            raise ValueError("Unknown calendar: %r" % name)
+        cls = CALENDARS[name]
+        columns.extend(('%s_%s' % (name, field), column_type) for field, column_type in _PERIOD_COLUMNS
+                       if hasattr(cls, field))
+    return columns
+
+
+def iter_dim_date_chunks(start, end, calendars=tuple(CALENDARS), specs=None, chunk_size=CHUNK_SIZE):
+    """ Generate the dim_date table of the given date range in columnar chunks.
+
+    :param start: the first datetime.date of the range.
+    :param end: the last datetime.date of the range.
+    :param calendars: names of the calendars in CALENDARS to include.
+    :param specs: dict of CalendarSpec by calendar name, for calendars not using their default spec.
+    :param chunk_size: maximum number of rows in each chunk.
+    :return: generator of OrderedDict of column lists keyed by column name, in dim_date_columns order.
+    """
+    specs = specs or {}
+    dim_date_columns(calendars)
+
+    dates = (date.fromordinal(ordinal) for ordinal in xrange(start.toordinal(), end.toordinal() + 1))
+    records = [CALENDARS[name].iter_days(start, end, specs.get(name)) for name in calendars]
+    fields = [[(num + 1, field) for num, (field, _) in enumerate(_PERIOD_COLUMNS) if hasattr(CALENDARS[name], field)]
+              for name in calendars]
+
+    while True:
+        chunk_dates = list(islice(dates, chunk_size))
+        if not chunk_dates:
+            return
+
+        chunk = OrderedDict()
+        chunk['date_key'] = [mdate.year * 10000 + mdate.month * 100 + mdate.day for mdate in chunk_dates]
+        chunk['date'] = chunk_dates
+        chunk['day_of_week'] = [mdate.isoweekday() for mdate in chunk_dates]
+        for name, calendar_records, calendar_fields in zip(calendars, records, fields):
+            # Transpose the DayRecords of the chunk into columns
+            columns = zip(*islice(calendar_records, len(chunk_dates)))
+            for num, field in calendar_fields:
+                chunk['%s_%s' % (name, field)] = list(columns[num])
+        yield chunk
+
+
+class CsvWriter(object):
+    """
+    Write chunks of the dim_date table to a CSV file, with a header row.
+    """
+
+    def __init__(self, output, columns):
+        self._file = open(output, 'wb')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow([name for name, _ in columns])
+
+    def write(self, chunk):
+        self._writer.writerows(zip(*chunk.values()))
+
+    def close(self):
+        self._file.close()
+
+
+class ArrowWriter(object):
+    """
+    Write chunks of the dim_date table to an Arrow IPC or Parquet file, one record batch or row group per chunk.
+    """
+
+    _TYPES = {'int': 'int32', 'date': 'date32'}
+
+    def __init__(self, output, columns, file_format='arrow'):
+        if pa is None:
+            raise ImportError("pyarrow is required for the %s format." % file_format)
+        self._schema = pa.schema([pa.field(name, getattr(pa, self._TYPES[column_type])())
+                                  for name, column_type in columns])
+        if file_format == 'parquet':
+            self._writer = pq.ParquetWriter(output, self._schema)
+        else:
+            self._writer = pa.RecordBatchFileWriter(output, self._schema)
+
+    def write(self, chunk):
+        arrays = [pa.array(values, type=field.type) for values, field in zip(chunk.values(), self._schema)]
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self._schema))
+
+    def close(self):
+        self._writer.close()
+
+
+def write_dim_date(output, start, end, file_format='csv', calendars=tuple(CALENDARS), specs=None,
+                   chunk_size=CHUNK_SIZE):
+    """ Write the dim_date table of the given date range to a file, one chunk at a time.
+
+    :param output: path of the output file.
+    :param start: the first datetime.date of the range.
+    :param end: the last datetime.date of the range.
+    :param file_format: 'csv', 'arrow' (Arrow IPC file) or 'parquet'.
+    :param calendars: names of the calendars in CALENDARS to include.
+    :param specs: dict of CalendarSpec by calendar name, for calendars not using their default spec.
+    :param chunk_size: maximum number of rows in each chunk.
+    :return: tuple of number of rows written and elapsed time in seconds.
+    """
+    if file_format not in FORMATS:
+        raise ValueError("Unknown format: %r" % file_format)
+    columns = dim_date_columns(calendars)
+
+    start_time = time.time()
+    if file_format == 'csv':
+        writer = CsvWriter(output, columns)
+    else:
+        writer = ArrowWriter(output, columns, file_format)
+    rows = 0
+    try:
+        for chunk in iter_dim_date_chunks(start, end, calendars, specs, chunk_size):
+            writer.write(chunk)
+            rows += len(chunk['date'])
+    finally:
+        writer.close()
+    return rows, time.time() - start_time
+
+
+def _parse_date(text):
+    return datetime.strptime(text, '%Y-%m-%d').date()
+
+
+def main(argv=None):
+    """ Command-line entry point: write the dim_date table and report the throughput.
+    """
+    parser = argparse.ArgumentParser(description="Write a calendar dimension (dim_date) table.")
+    parser.add_argument('start', type=_parse_date, help="first date, YYYY-MM-DD")
+    parser.add_argument('end', type=_parse_date, help="last date, YYYY-MM-DD")
+    parser.add_argument('output', help="output file")
+    parser.add_argument('--format', dest='file_format', choices=FORMATS, default='csv')
+    parser.add_argument('--calendars', default=','.join(CALENDARS),
+                        help="comma-separated calendars, default: %(default)s")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    calendars = [name.strip() for name in args.calendars.split(',') if name.strip()]
+    rows, seconds = write_dim_date(args.output, args.start, args.end, args.file_format, calendars,
+                                   chunk_size=args.chunk_size)
+    print "Wrote %d rows to %s in %.2f s (%.0f rows/sec)" % (rows, args.output, seconds, rows / max(seconds, 1e-9))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,6 @@
 from datetime import date
 
-from calendars.calendars import FiscalDate
+from calendars.calendars import FiscalDate, RetailDate, CalendarSpec
 
 
 def main():
@@ -11,13 +11,18 @@ def main():
 
     # Another company may have another fiscal date.
     # Change fiscal date to September 1st.
-    FiscalDate._FISCAL_START_MONTH = 9
-    second_fd = FiscalDate(date(2016, 8, 15))
+    september = CalendarSpec(start_month=9, start_day=1)
+    second_fd = FiscalDate(date(2016, 8, 15), spec=september)
     print second_fd.year
     print first_fd.year
 
     print second_fd.quarter_end_date
 
+    # Retail calendar with 4-4-5 quarters and weeks starting on Monday.
+    retail_spec = CalendarSpec(start_month=2, start_day=1, weeks_in_month='4-4-5', week_start=0)
+    rd = RetailDate(date(2016, 8, 15), spec=retail_spec)
+    print rd.year_start_date, rd.year_end_date
+
     pass
 
 
@@ -0,0 +1,333 @@
+"""
+Vectorized PyCalCal astronomical functions over NumPy arrays of moments.
+
+The functions of this module take arrays of moments (RD dates with fractional days, as floats) and return float64
+arrays with the values of the PyCalCal functions of the same name, e.g., for tabulating the solar and lunar longitudes
+of every day of a long range in one call instead of thousands of scalar calls.
+The periodic terms are evaluated as matrix products over the coefficient tables of the pycalcal module,
+so the series are the same as the scalar ones, only computed in float64 instead of mpmath.
+
+The results agree with the scalar (mpmath) functions within the TOLERANCE envelope, in degrees or days.
+NumPy is required.
+"""
+
+from __future__ import absolute_import, division
+
+from datetime import date
+
+import numpy as np
+
+import pycalcal.pycalcal as pycal
+
+
+# Maximum absolute difference from the scalar mpmath functions over the years 1000-3000,
+# in degrees, or in days for nth_new_moon, equation_of_time and solar_events.
+TOLERANCE = {'solar_longitude': 1e-8,
+             'nutation': 1e-12,
+             'aberration': 1e-12,
+             'lunar_longitude': 1e-7,
+             'lunar_latitude': 1e-8,
+             'lunar_phase': 1e-7,
+             'nth_new_moon': 1e-7,
+             'equation_of_time': 1e-12,
+             'solar_events': 1e-8}
+
+# Python's date.toordinal(), i.e. the RD date, of numpy's datetime64 epoch, 1970-01-01.
+_EPOCH_FIXED = date(1970, 1, 1).toordinal()
+
+_J2000 = float(pycal.J2000)
+_MEAN_SYNODIC_MONTH = float(pycal.MEAN_SYNODIC_MONTH)
+
+
+def _floats(values):
+    return np.array([float(value) for value in values])
+
+
+def _columns(terms):
+    """ Float64 column arrays of a table of terms of the pycalcal module.
+    """
+    return [_floats(column) for column in zip(*terms)]
+
+
+def _poly(x, coefficients):
+    """ Evaluate the polynomial with the given coefficients (constant term first) at each element of x.
+    """
+    result = np.zeros_like(x) + float(coefficients[-1])
+    for coefficient in reversed(coefficients[:-1]):
+        result = result * x + float(coefficient)
+    return result
+
+
+def _sin_degrees(theta):
+    return np.sin(np.radians(theta))
+
+
+def _moments(tee):
+    return np.asarray(tee, dtype=np.float64)
+
+
+#################################
+# Time
+#################################
+
+def _fixed_from_days(days):
+    return days.astype(np.int64) + _EPOCH_FIXED
+
+
+def ephemeris_correction(tee):
+    """ Dynamical Time minus Universal Time (in days) at each moment of tee.
+    """
+    tee = _moments(tee)
+    years = (np.floor(tee).astype(np.int64) - _EPOCH_FIXED).astype('datetime64[D]').astype('datetime64[Y]')
+    new_years = years.astype('datetime64[D]')
+    year = years.astype(np.int64) + 1970
+    july_firsts = (years.astype('datetime64[M]') + 6).astype('datetime64[D]')
+    c = (_fixed_from_days(july_firsts) - pycal.fixed_from_gregorian([1900, 1, 1])) / 36525.0
+    x = 0.5 + (_fixed_from_days(new_years) - pycal.fixed_from_gregorian([1810, 1, 1]))
+
+    conditions = [(1988 <= year) & (year <= 2019),
+                  (1900 <= year) & (year <= 1987),
+                  (1800 <= year) & (year <= 1899),
+                  (1700 <= year) & (year <= 1799),
+                  (1620 <= year) & (year <= 1699)]
+    choices = [(year - 1933) / 86400,
+               _poly(c, [-0.00002, 0.000297, 0.025184, -0.181133, 0.553040, -0.861938, 0.677066, -0.212591]),
+               _poly(c, [-0.000009, 0.003844, 0.083563, 0.865736, 4.867575, 15.845535, 31.332267, 38.291999,
+                         28.316289, 11.636204, 2.043794]),
+               _poly((year - 1700).astype(np.float64), [8.118780842, -0.005092142, 0.003336121, -0.0000266484]) / 86400,
+               _poly((year - 1600).astype(np.float64), [196.58333, -4.0675, 0.0219167]) / 86400]
+    return np.select(conditions, choices, default=((x * x) / 41048480 - 15) / 86400)
+
+
+def julian_centuries(tee):
+    """ Julian centuries since 2000 at each moment of tee.
+    """
+    tee = _moments(tee)
+    return (tee + ephemeris_correction(tee) - _J2000) / 36525.0
+
+
+#################################
+# Sun
+#################################
+
+_SOLAR_COEFFICIENTS, _SOLAR_ADDENDS, _SOLAR_MULTIPLIERS = _columns(pycal.SOLAR_LONGITUDE_TERMS)
+
+
+def nutation(tee):
+    """ Longitudinal nutation at each moment of tee.
+    """
+    c = julian_centuries(tee)
+    cap_A = _poly(c, pycal.NUTATION_A_COEFFS)
+    cap_B = _poly(c, pycal.NUTATION_B_COEFFS)
+    return -0.004778 * _sin_degrees(cap_A) - 0.0003667 * _sin_degrees(cap_B)
+
+
+def aberration(tee):
+    """ Aberration at each moment of tee.
+    """
+    c = julian_centuries(tee)
+    return 0.0000974 * np.cos(np.radians(177.63 + 35999.01848 * c)) - 0.005575
+
+
+def solar_longitude(tee):
+    """ Longitude of the sun (in degrees) at each moment of tee.
+    """
+    tee = _moments(tee)
+    c = julian_centuries(tee)
+    series = _sin_degrees(_SOLAR_ADDENDS + np.multiply.outer(c, _SOLAR_MULTIPLIERS)).dot(_SOLAR_COEFFICIENTS)
+    lam = 282.7771834 + 36000.76953744 * c + 0.000005729577951308232 * series
+    return np.mod(lam + aberration(tee) + nutation(tee), 360)
+
+
+def obliquity(tee):
+    """ Obliquity of the ecliptic (in degrees) at each moment of tee.
+    """
+    c = julian_centuries(tee)
+    return 23 + 26 / 60 + 21.448 / 3600 + _poly(c, [0, -46.8150 / 3600, -0.00059 / 3600, 0.001813 / 3600])
+
+
+def equation_of_time(tee):
+    """ Equation of time (as fraction of day) at each moment of tee.
+    """
+    c = julian_centuries(tee)
+    lamb = _poly(c, [280.46645, 36000.76983, 0.0003032])
+    anomaly = _poly(c, [357.52910, 35999.05030, -0.0001559, -0.00000048])
+    eccentricity = _poly(c, [0.016708617, -0.000042037, -0.0000001236])
+    y = np.tan(np.radians(obliquity(tee) / 2)) ** 2
+    equation = (1 / 2 / np.pi) * (y * _sin_degrees(2 * lamb) +
+                                  -2 * eccentricity * _sin_degrees(anomaly) +
+                                  4 * eccentricity * y * _sin_degrees(anomaly) * np.cos(np.radians(2 * lamb)) +
+                                  -0.5 * y * y * _sin_degrees(4 * lamb) +
+                                  -1.25 * eccentricity * eccentricity * _sin_degrees(2 * anomaly))
+    return np.sign(equation) * np.minimum(np.abs(equation), 0.5)
+
+
+#################################
+# Solar events
+#################################
+
+def _sine_offset(tee, location, alpha):
+    """ Sine of the angle between the sun at each local moment of tee and when its depression is alpha.
+    """
+    phi = np.radians(float(pycal.latitude(location)))
+    tee_prime = tee - float(pycal.longitude(location)) / 360
+    delta = np.arcsin(np.sin(np.radians(obliquity(tee_prime))) * _sin_degrees(solar_longitude(tee_prime)))
+    return np.tan(phi) * np.tan(delta) + _sin_degrees(alpha) / (np.cos(delta) * np.cos(phi))
+
+
+def _approx_moment_of_depression(tee, location, alpha, early):
+    """ Local moments near each moment of tee when the depression of the sun is alpha, or NaN if it is not reached.
+
+    alpha and early are arrays of the same shape as tee.
+    """
+    date = np.floor(tee)
+    value = _sine_offset(tee, location, alpha)
+    alt = np.where(alpha >= 0, np.where(early, date, date + 1), date + 0.5)
+    out_of_range = np.abs(value) > 1
+    if out_of_range.any():
+        value = np.where(out_of_range, _sine_offset(alt, location, alpha), value)
+    reached = np.abs(value) <= 1
+    offset = np.mod(0.5 + np.degrees(np.arcsin(np.where(reached, value, 0))) / 360, 1) - 0.25
+    temp = np.where(early, -offset, offset) + date + 0.5
+    local = temp - equation_of_time(temp - float(pycal.longitude(location)) / 360)
+    return np.where(reached, local, np.nan)
+
+
+def _moment_of_depression(approx, location, alpha, early):
+    """ Iterate _approx_moment_of_depression from approx until it moves by less than 30 seconds, as
+    pycalcal.moment_of_depression, for the moments that have not converged yet.
+    """
+    tee = _approx_moment_of_depression(approx, location, alpha, early)
+    # The events that do not occur (NaN) stop.
+    active = np.nan_to_num(np.abs(approx - tee)) >= 30 / 86400
+    while active.any():
+        approx = tee[active]
+        tee[active] = _approx_moment_of_depression(approx, location, alpha[active], early[active])
+        active[active] = np.nan_to_num(np.abs(approx - tee[active])) >= 30 / 86400
+    return tee
+
+
+def solar_events(fixed_dates, location, depression=None):
+    """ Standard times of sunrise and sunset, and of dawn and dusk at a depression angle, at location on each
+    fixed date, as pycalcal.sunrise, sunset, dawn and dusk.
+
+    The events of all the dates are solved together, so each iteration of the search evaluates the solar
+    longitude, obliquity and equation of time of every pending event at once.
+    :param fixed_dates: array of fixed dates.
+    :param location: PyCalCal location.
+    :param depression: depression angle of the sun at dawn and dusk, in degrees (e.g. 18 for astronomical twilight),
+    or None for sunrise and sunset only.
+    :return: dict of name ('sunrise', 'sunset', and 'dawn' and 'dusk' with depression) to float64 array of
+    standard times, NaN when the event does not occur on the date.
+    """
+    fixed_dates = np.asarray(fixed_dates, dtype=np.float64)
+    # The refraction only depends on the elevation of the location.
+    refraction = float(pycal.refraction(0, location))
+    # (name, depression, hour of the first guess, early)
+    events = [('sunrise', refraction, 6, True), ('sunset', refraction, 18, False)]
+    if depression is not None:
+        events += [('dawn', depression, 6, True), ('dusk', depression, 18, False)]
+
+    count = len(fixed_dates)
+    approx = np.concatenate([fixed_dates + hour / 24 for _, _, hour, _ in events])
+    alpha = np.repeat([float(alpha) for _, alpha, _, _ in events], count)
+    early = np.repeat([early for _, _, _, early in events], count)
+    local = _moment_of_depression(approx, location, alpha, early)
+    standard = local - float(pycal.longitude(location)) / 360 + float(pycal.zone(location))
+    return dict((name, standard[i * count:(i + 1) * count]) for i, (name, _, _, _) in enumerate(events))
+
+
+#################################
+# Moon
+#################################
+
+def _lunar_arguments(c):
+    """ Mean lunar longitude, lunar elongation, solar anomaly, lunar anomaly and moon node of centuries c, in degrees.
+    """
+    return [np.mod(_poly(c, coefficients), 360)
+            for coefficients in [pycal.MEAN_LUNAR_LONGITUDE_COEFFS, pycal.LUNAR_ELONGATION_COEFFS,
+                                 pycal.SOLAR_ANOMALY_COEFFS, pycal.LUNAR_ANOMALY_COEFFS, pycal.MOON_NODE_COEFFS]]
+
+
+def _lunar_series(terms, c, cap_D, cap_M, cap_M_prime, cap_F):
+    """ Sum of v * cap_E ** |x| * sin_degrees(w * cap_D + x * cap_M + y * cap_M_prime + z * cap_F) over the terms.
+    """
+    v, w, x, y, z = terms
+    cap_E = _poly(c, pycal.NEW_MOON_E_COEFFS)
+    arguments = (np.multiply.outer(cap_D, w) + np.multiply.outer(cap_M, x) +
+                 np.multiply.outer(cap_M_prime, y) + np.multiply.outer(cap_F, z))
+    factors = np.power.outer(cap_E, np.abs(x))
+    return (factors * _sin_degrees(arguments)).dot(v)
+
+
+_LUNAR_LONGITUDE_TERMS = _columns(pycal.LUNAR_LONGITUDE_TERMS)
+_LUNAR_LATITUDE_TERMS = _columns(pycal.LUNAR_LATITUDE_TERMS)
+
+
+def lunar_longitude(tee):
+    """ Longitude of the moon (in degrees) at each moment of tee.
+    """
+    tee = _moments(tee)
+    c = julian_centuries(tee)
+    cap_L_prime, cap_D, cap_M, cap_M_prime, cap_F = _lunar_arguments(c)
+    correction = _lunar_series(_LUNAR_LONGITUDE_TERMS, c, cap_D, cap_M, cap_M_prime, cap_F) / 1000000
+    venus = 3958 / 1000000 * _sin_degrees(119.75 + c * 131.849)
+    jupiter = 318 / 1000000 * _sin_degrees(53.09 + c * 479264.29)
+    flat_earth = 1962 / 1000000 * _sin_degrees(cap_L_prime - cap_F)
+    return np.mod(cap_L_prime + correction + venus + jupiter + flat_earth + nutation(tee), 360)
+
+
+def lunar_latitude(tee):
+    """ Latitude of the moon (in degrees) at each moment of tee.
+    """
+    c = julian_centuries(tee)
+    cap_L_prime, cap_D, cap_M, cap_M_prime, cap_F = _lunar_arguments(c)
+    beta = _lunar_series(_LUNAR_LATITUDE_TERMS, c, cap_D, cap_M, cap_M_prime, cap_F) / 1000000
+    venus = 175 / 1000000 * (_sin_degrees(119.75 + c * 131.849 + cap_F) + _sin_degrees(119.75 + c * 131.849 - cap_F))
+    flat_earth = (-2235 / 1000000 * _sin_degrees(cap_L_prime) +
+                  127 / 1000000 * _sin_degrees(cap_L_prime - cap_M_prime) +
+                  -115 / 1000000 * _sin_degrees(cap_L_prime + cap_M_prime))
+    extra = 382 / 1000000 * _sin_degrees(313.45 + c * 481266.484)
+    return beta + venus + flat_earth + extra
+
+
+_NEW_MOON_CORRECTION_TERMS = _columns(pycal.NEW_MOON_CORRECTION_TERMS)
+_NEW_MOON_ADDITIONAL_TERMS = _columns(pycal.NEW_MOON_ADDITIONAL_TERMS)
+
+
+def nth_new_moon(n):
+    """ Moment of the n-th new moon after (or before) the new moon of January 11, 1, for each element of n.
+    """
+    k = np.asarray(n, dtype=np.float64) - 24724
+    c = k / 1236.85
+    approx = _J2000 + _poly(c, pycal.NEW_MOON_APPROX_COEFFS)
+    cap_E = _poly(c, pycal.NEW_MOON_E_COEFFS)
+    solar_anomaly = _poly(c, pycal.NEW_MOON_SOLAR_ANOMALY_COEFFS)
+    lunar_anomaly = _poly(c, pycal.NEW_MOON_LUNAR_ANOMALY_COEFFS)
+    moon_argument = _poly(c, pycal.NEW_MOON_MOON_ARGUMENT_COEFFS)
+    cap_omega = _poly(c, pycal.NEW_MOON_CAP_OMEGA_COEFFS)
+
+    v, w, x, y, z = _NEW_MOON_CORRECTION_TERMS
+    arguments = (np.multiply.outer(solar_anomaly, x) + np.multiply.outer(lunar_anomaly, y) +
+                 np.multiply.outer(moon_argument, z))
+    correction = (-0.00017 * _sin_degrees(cap_omega) +
+                  (np.power.outer(cap_E, w) * _sin_degrees(arguments)).dot(v))
+    extra = 0.000325 * _sin_degrees(_poly(c, pycal.NEW_MOON_EXTRA_COEFFS))
+    add_factor, add_const, add_coeff = _NEW_MOON_ADDITIONAL_TERMS
+    additional = _sin_degrees(add_const + np.multiply.outer(k, add_coeff)).dot(add_factor)
+
+    tee = approx + correction + extra + additional
+    return tee - ephemeris_correction(tee)
+
+
+def lunar_phase(tee):
+    """ Lunar phase, as an angle in degrees, at each moment of tee.
+    """
+    tee = _moments(tee)
+    phi = np.mod(lunar_longitude(tee) - solar_longitude(tee), 360)
+    t0 = float(pycal.nth_new_moon(0))
+    # iround rounds halves away from zero.
+    ratio = (tee - t0) / _MEAN_SYNODIC_MONTH
+    n = np.sign(ratio) * np.floor(np.abs(ratio) + 0.5)
+    phi_prime = 360 * np.mod((tee - nth_new_moon(n)) / _MEAN_SYNODIC_MONTH, 1)
+    return np.where(np.abs(phi - phi_prime) > 180, phi_prime, phi)
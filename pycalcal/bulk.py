@@ -0,0 +1,176 @@
+"""
+Bulk conversions with the PyCalCal functions over a pool of processes.
+
+The astronomical conversions (e.g., chinese_from_fixed, hindu_lunar_from_fixed, astro_hindu_lunar_from_fixed or
+fixed_from_observational_hebrew) are CPU-bound pure Python, so convert() partitions the input by year and converts the
+partitions in worker processes. Within a worker, the conversions of a year share their intermediate results: for the
+functions of NEW_MOON_FUNCTIONS, the new moons of the year are indexed once (see warm_new_moons), and repeated inputs
+are converted once.
+The results are returned in input order.
+
+The concurrent.futures module does not exist in Python 2, so the pool is a multiprocessing.Pool.
+
+Usage: python -m pycalcal.bulk FUNCTION START END [--processes 1,2,4,8] reports the throughput of converting every
+fixed date of a range with each number of processes.
+"""
+
+from __future__ import absolute_import
+
+import argparse
+from collections import OrderedDict
+from datetime import datetime
+import multiprocessing
+import sys
+import time
+
+import pycalcal.pycalcal as pycal
+
+
+# *_from_fixed functions that search new moons, for which the workers index the new moons of each year
+NEW_MOON_FUNCTIONS = frozenset(['chinese_from_fixed', 'compute_chinese_from_fixed', 'astro_hindu_lunar_from_fixed'])
+
+
+def partition_year(function_name, arg):
+    """ Year of the argument of a conversion, by which the input is partitioned.
+
+    :param function_name: name of the PyCalCal function.
+    :param arg: argument of the function: a fixed date for the *_from_fixed functions, or a date of the calendar,
+    whose first field is the year, for the fixed_from_* functions.
+    :return: the Gregorian year of the fixed date, or the year of the calendar date.
+    """
+    if function_name.startswith('fixed_from_'):
+        return arg[0]
+    return pycal.gregorian_year_from_fixed(arg)
+
+
+def _convert_partition(task):
+    """ Convert the arguments of a partition in a worker process.
+
+    :param task: tuple of backend, function name, Gregorian year range whose new moons to index (None if the function
+    does not search new moons, see _warm_years) and list of (index, argument) tuples.
+    :return: list of (index, result) tuples.
+    """
+    backend, function_name, years, items = task
+    pycal.use_backend(backend)
+    function = getattr(pycal, function_name)
+    if years is not None:
+        # The new moon searches of the year become bisections of the index. The index of a previous partition is
+        # replaced, not extended, so that a worker never computes the new moons between the years of its partitions.
+        pycal.warm_new_moons(years[0] - 1, years[1] + 1, extend=False)
+    results = {}
+    converted = []
+    for index, arg in items:
+        key = repr(arg)
+        if key not in results:
+            results[key] = function(arg)
+        converted.append((index, results[key]))
+    return converted
+
+
+def _warm_years(function_name, year, items):
+    """ Years whose new moons the workers index before converting a partition.
+
+    :param function_name: name of the PyCalCal function.
+    :param year: the year of the partition.
+    :param items: list of (index, argument) tuples of the partition.
+    :return: the Gregorian year range of the partition, or None if the function does not search new moons, e.g. the
+    arithmetic calendars, or chinese_from_fixed on dates of the Chinese table.
+    """
+    if function_name not in NEW_MOON_FUNCTIONS:
+        return None
+    if function_name == 'chinese_from_fixed' and all(pycal.chinese_table_from_fixed(arg) is not None
+                                                     for _, arg in items):
+        return None
+    return year, year
+
+
+def _partitions(function_name, args):
+    """ Partition the arguments by year.
+
+    :return: list of tuples of year and list of (index, argument) tuples, in year order.
+    """
+    partitions = OrderedDict()
+    for index, arg in enumerate(args):
+        partitions.setdefault(partition_year(function_name, arg), []).append((index, arg))
+    return sorted(partitions.items())
+
+
+def convert(function, args, processes=None, pool=None):
+    """ Convert the arguments with a PyCalCal function, one year at a time over a pool of processes.
+
+    :param function: the PyCalCal function, or its name.
+    :param args: list of arguments: fixed dates for the *_from_fixed functions, dates of the calendar for the
+    fixed_from_* functions.
+    :param processes: number of worker processes, by default the number of CPUs. With 1, convert in this process.
+    Ignored if pool is given.
+    :param pool: a multiprocessing.Pool to convert in, which is left open, so that several calls share its workers and
+    their memoized new moons. By default, a pool of processes is started and closed for this call.
+    :return: list of the results, in the order of args.
+    """
+    function_name = function if isinstance(function, basestring) else function.__name__
+    if not callable(getattr(pycal, function_name, None)):
+        raise ValueError("Unknown PyCalCal function: %r" % function_name)
+    processes = processes or multiprocessing.cpu_count()
+
+    tasks = [(pycal.BACKEND, function_name, _warm_years(function_name, year, items), items)
+             for year, items in _partitions(function_name, args)]
+
+    results = [None] * len(args)
+    own_pool = None
+    if pool is None and processes == 1:
+        converted = (_convert_partition(task) for task in tasks)
+        # Do not leave the new moons indexed for the partitions in this process.
+        indexes = dict(pycal.NEW_MOON_INDEXES)
+    else:
+        if pool is None:
+            pool = own_pool = multiprocessing.Pool(processes)
+        converted = pool.imap_unordered(_convert_partition, tasks)
+    try:
+        for partition in converted:
+            for index, result in partition:
+                results[index] = result
+    finally:
+        if own_pool is not None:
+            own_pool.close()
+            own_pool.join()
+        elif pool is None:
+            pycal.NEW_MOON_INDEXES.clear()
+            pycal.NEW_MOON_INDEXES.update(indexes)
+    return results
+
+
+def parse_fixed(text):
+    """ Parse a command-line date.
+
+    :param text: the date as YYYY-MM-DD.
+    :return: the fixed date.
+    """
+    return datetime.strptime(text, '%Y-%m-%d').date().toordinal()
+
+
+def main(argv=None):
+    """ Command-line entry point: report the throughput of bulk conversions by number of processes.
+    """
+    parser = argparse.ArgumentParser(description="Time the bulk conversion of a range of fixed dates.")
+    parser.add_argument('function', help="name of a PyCalCal *_from_fixed function, e.g. compute_chinese_from_fixed")
+    parser.add_argument('start', type=parse_fixed, help="first date, YYYY-MM-DD")
+    parser.add_argument('end', type=parse_fixed, help="last date, YYYY-MM-DD")
+    parser.add_argument('--processes', default='1,2,4,8', help="comma-separated numbers of processes")
+    args = parser.parse_args(argv)
+
+    fixed_dates = range(args.start, args.end + 1)
+    baseline = None
+    for processes in [int(number) for number in args.processes.split(',')]:
+        # Do not let the workers inherit the new moons of the previous runs.
+        pycal.clear_new_moon_cache()
+        start_time = time.time()
+        convert(args.function, fixed_dates, processes)
+        seconds = time.time() - start_time
+        baseline = baseline or seconds
+        print "%2d processes: %8.2f s %10.1f dates/sec %6.2fx" % (
+            processes, seconds, len(fixed_dates) / seconds, baseline / seconds)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""
+Memory-mapped lookup file of the dates of several calendars, by fixed date.
+
+build_lookup_file precomputes the Chinese, Hebrew, Islamic, Persian and Hindu lunar dates of every fixed date of a
+range with the PyCalCal *_from_fixed functions, and writes them as fixed-size binary records.
+LookupFile maps the file in memory and reads the record of a fixed date at offset (fixed - start) * record size,
+so lookups are O(1) without parsing the file, and the processes that open the same file share its pages.
+
+Usage: python -m pycalcal.lookup OUTPUT START END [--processes N], with START and END as YYYY-MM-DD.
+"""
+
+from __future__ import absolute_import
+
+import argparse
+from collections import OrderedDict
+import mmap
+import multiprocessing
+import struct
+import sys
+import time
+
+import pycalcal.bulk as bulk
+import pycalcal.pycalcal as pycal
+
+
+# Calendars of the records, in record order: (conversion function, struct codes of the fields of its dates).
+# Booleans (leap months and days) are stored as bytes.
+CALENDARS = OrderedDict([('chinese', (pycal.chinese_from_fixed, 'hBBBB')),
+                         ('hebrew', (pycal.hebrew_from_fixed, 'hBB')),
+                         ('islamic', (pycal.islamic_from_fixed, 'hBB')),
+                         ('persian', (pycal.persian_from_fixed, 'hBB')),
+                         ('hindu_lunar', (pycal.hindu_lunar_from_fixed, 'hBBBB'))])
+
+# Fields of the dates that are booleans, by calendar
+_BOOLEANS = {'chinese': (3,),
+             'hindu_lunar': (2, 4)}
+
+MAGIC = b'PCLK'
+
+VERSION = 1
+
+# magic, version, start fixed date, number of records, record size, calendar names
+HEADER = struct.Struct('<4sHiIH54s')
+
+RECORD = struct.Struct('<' + ''.join(codes for _, codes in CALENDARS.values()))
+
+# Number of days converted at a time
+BLOCK_DAYS = 3653
+
+
+def build_lookup_file(output, start, end, processes=1):
+    """ Compute the dates of CALENDARS of a range of fixed dates and write them to a lookup file.
+
+    The conversions are slow: they run over one pool of processes for the whole range with pycalcal.bulk, and it
+    helps to enable the PyCalCal persistent cache when rebuilding similar ranges.
+    :param output: path of the output file.
+    :param start: the first fixed date of the range.
+    :param end: the last fixed date of the range.
+    :param processes: number of worker processes, see pycalcal.bulk.convert.
+    :return: tuple of number of records written and elapsed time in seconds.
+    """
+    if end < start:
+        raise ValueError("Empty range: %d to %d" % (start, end))
+    start_time = time.time()
+    count = end - start + 1
+    processes = processes or multiprocessing.cpu_count()
+    pool = multiprocessing.Pool(processes) if processes > 1 else None
+    try:
+        with open(output, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, start, count, RECORD.size, ','.join(CALENDARS)))
+            for block_start in xrange(start, end + 1, BLOCK_DAYS):
+                fixed_dates = range(block_start, min(block_start + BLOCK_DAYS - 1, end) + 1)
+                dates = [bulk.convert(function, fixed_dates, processes, pool) for function, _ in CALENDARS.values()]
+                for record_dates in zip(*dates):
+                    f.write(RECORD.pack(*[int(value) for c_date in record_dates for value in c_date]))
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    return count, time.time() - start_time
+
+
+class LookupFile(object):
+    """
+    Read-only memory map of a lookup file written by build_lookup_file.
+    """
+
+    def __init__(self, filename):
+        """ Open and map the lookup file.
+
+        :param filename: path of the lookup file.
+        """
+        with open(filename, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.start, self.count, record_size, names = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError("%s is not a version %d lookup file" % (filename, VERSION))
+        if record_size != RECORD.size or names.rstrip(b'\0') != ','.join(CALENDARS):
+            self.close()
+            raise ValueError("%s has another record layout" % filename)
+        self.end = self.start + self.count - 1
+
+        # Offsets of the fields of each calendar in the records
+        self._slices = {}
+        offset = 0
+        for name, (_, codes) in CALENDARS.items():
+            self._slices[name] = (offset, offset + len(codes))
+            offset += len(codes)
+
+    def __contains__(self, fixed_date):
+        return self.start <= fixed_date <= self.end
+
+    def record(self, fixed_date):
+        """ Get the raw record of a fixed date.
+
+        :param fixed_date: the fixed date, in the range of the file.
+        :return: tuple of the integer fields of the dates of CALENDARS, in order.
+        """
+        if fixed_date not in self:
+            raise KeyError(fixed_date)
+        return RECORD.unpack_from(self._map, HEADER.size + (fixed_date - self.start) * RECORD.size)
+
+    def lookup(self, name, fixed_date):
+        """ Get the date of a calendar, as returned by its PyCalCal function.
+
+        :param name: name of the calendar in CALENDARS.
+        :param fixed_date: the fixed date, in the range of the file.
+        :return: list of the fields of the date.
+        """
+        first, last = self._slices[name]
+        values = list(self.record(fixed_date)[first:last])
+        for i in _BOOLEANS.get(name, ()):
+            values[i] = bool(values[i])
+        return values
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main(argv=None):
+    """ Command-line entry point: build a lookup file and report the throughput.
+    """
+    parser = argparse.ArgumentParser(description="Build a memory-mapped lookup file of calendar dates.")
+    parser.add_argument('output', help="output file")
+    parser.add_argument('start', type=bulk.parse_fixed, help="first date, YYYY-MM-DD")
+    parser.add_argument('end', type=bulk.parse_fixed, help="last date, YYYY-MM-DD")
+    parser.add_argument('--processes', type=int, default=1, help="number of worker processes, 0 for all CPUs")
+    args = parser.parse_args(argv)
+
+    count, seconds = build_lookup_file(args.output, args.start, args.end, args.processes)
+    print "Wrote %d records of %d bytes to %s in %.2f s (%.0f dates/sec)" % (
+        count, RECORD.size, args.output, seconds, count / max(seconds, 1e-9))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
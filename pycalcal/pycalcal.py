@@ -100,20 +100,34 @@ def amod(x, y):
 # see lines 259-264 in calendrica-3.0.cl
 def next(i, p):
     """Return first integer greater or equal to initial index, i,
-    such that condition, p, holds."""
-    return i if p(i) else next(i+1, p)
+    such that condition, p, holds.
+    This is an iterative implementation."""
+    while not p(i):
+        i += 1
+    return i
 
 # see lines 266-271 in calendrica-3.0.cl
 def final(i, p):
     """Return last integer greater or equal to initial index, i,
-    such that condition, p, holds."""
-    return i - 1 if not p(i) else final(i+1, p)
+    such that condition, p, holds.
+    This is an iterative implementation."""
+    while p(i):
+        i += 1
+    return i - 1
 
 # see lines 273-281 in calendrica-3.0.cl
 def summa(f, k, p):
     """Return the sum of f(i) from i=k, k+1, ... till p(i) holds true or 0.
-    This is a tail recursive implementation."""
-    return 0 if not p(k) else f(k) + summa(f, k+1, p)
+    This is an iterative implementation, adding the terms from the last
+    one like the tail recursive definition."""
+    terms = []
+    while p(k):
+        terms.append(f(k))
+        k += 1
+    result = 0
+    for term in reversed(terms):
+        result = term + result
+    return result
 
 def altsumma(f, k, p):
     """Return the sum of f(i) from i=k, k+1, ... till p(i) holds true or 0.
@@ -139,22 +153,84 @@ def altsumma(f, k, p):
 # see lines 283-293 in calendrica-3.0.cl
 def binary_search(lo, hi, p, e):
     """Bisection search for x in [lo, hi] such that condition 'e' holds.
-    p determines when to go left."""
+    p determines when to go left.
+    This is an iterative implementation."""
     x = (lo + hi) / 2
-    if p(lo, hi):
-        return x
-    elif e(x):
-        return binary_search(lo, x, p, e)
-    else:
-        return binary_search(x, hi, p, e)
+    while not p(lo, hi):
+        if e(x):
+            hi = x
+        else:
+            lo = x
+        x = (lo + hi) / 2
+    return x
 
 # see lines 295-302 in calendrica-3.0.cl
-def invert_angular(f, y, a, b, prec=10**-5):
+def invert_angular(f, y, a, b, prec=10**-5, rate=None):
     """Find inverse of angular function 'f' at 'y' within interval [a,b].
-    Default precision is 0.00001"""
+    Default precision is 0.00001.  rate is the mean rate of 'f', in
+    degrees per day, if known.  The solver is ANGULAR_SOLVER."""
+    return ANGULAR_SOLVERS[ANGULAR_SOLVER](f, y, a, b, prec, rate)
+
+def bisection_invert_angular(f, y, a, b, prec=10**-5, rate=None):
+    """Find inverse of angular function 'f' at 'y' within interval [a,b]
+    by bisection, as in calendrica-3.0.cl.  rate is ignored."""
     return binary_search(a, b,
                          (lambda l, h: ((h - l) <= prec)),
                          (lambda x: mod((f(x) - y), 360) < 180))
+
+# Not in calendrica-3.0.cl: safeguarded secant solver.
+def secant_invert_angular(f, y, a, b, prec=10**-5, rate=None):
+    """Find inverse of angular function 'f' at 'y' within interval [a,b].
+    Like bisection, keep a bracket [lo, hi] of the inverse and return its
+    midpoint once it is at most prec wide; but probe next to the secant
+    estimate of the inverse (the Newton estimate with rate, before two
+    probes are known), a quarter of prec past it so that the following
+    probe can close the bracket.  Probe the midpoint instead when the
+    estimate is outside the bracket or the last two probes did not halve
+    it."""
+    lo, hi = a, b
+    widths = [hi - lo, hi - lo]
+    x = (lo + hi) / 2
+    x_prev = d_prev = None
+    while (hi - lo) > prec:
+        # signed angular distance of f(x) past y, in [-180, 180)
+        d = mod(f(x) - y + 180, 360) - 180
+        if d >= 0:
+            hi = x
+        else:
+            lo = x
+        slope = rate
+        if (x_prev is not None) and (d != d_prev):
+            secant = (d - d_prev) / (x - x_prev)
+            # Keep the mean rate when f is too rough for the secant
+            if (rate is None) or (rate / 2 < secant < rate * 2):
+                slope = secant
+        x_prev, d_prev = x, d
+        if (slope is None) or (slope <= 0) or ((hi - lo) > widths[0] / 2):
+            x = (lo + hi) / 2
+        else:
+            x = x - d / slope + (prec / 4 if d < 0 else -prec / 4)
+            if not (lo < x < hi):
+                x = (lo + hi) / 2
+        widths = [widths[1], hi - lo]
+    return (lo + hi) / 2
+
+ANGULAR_SOLVERS = {'bisection': bisection_invert_angular,
+                   'secant': secant_invert_angular}
+
+ANGULAR_SOLVER = 'bisection'
+
+def use_angular_solver(name):
+    """Use solver 'name' of ANGULAR_SOLVERS in invert_angular: 'bisection'
+    (as in calendrica-3.0.cl) or 'secant' (fast).  Return the previous
+    solver."""
+    global ANGULAR_SOLVER
+    if name not in ANGULAR_SOLVERS:
+        raise ValueError("Unknown angular solver: %r" % name)
+    previous = ANGULAR_SOLVER
+    ANGULAR_SOLVER = name
+    return previous
+
 #def invert_angular(f, y, a, b):
 #      from scipy.optimize import brentq
 #    return(brentq((lambda x: mod(f(x) - y), 360)), a, b, xtol=error)
@@ -201,6 +277,26 @@ def poly(x, a):
         p = p * x + a[n-i]
     return p
 
+
+# Not in calendrica-3.0.cl: series evaluation kernels.
+# The periodic terms of the astronomical series are module constants,
+# tuples of terms, instead of lists rebuilt on every call and zipped by
+# sigma.  Each term is evaluated with the same operations as the sigma
+# body it replaces, so the results are unchanged.
+def sine_series(terms, c):
+    """Return the sum of x * sin_degrees(y + z * c) over the (x, y, z)
+    terms."""
+    from math import sin
+    return sum(x * sin(radians_from_degrees(y + (z * c))) for x, y, z in terms)
+
+def argument_sine_series(terms, factors, a, b, d):
+    """Return the sum of v * factors[w] * sin_degrees(x * a + y * b + z * d)
+    over the (v, w, x, y, z) terms."""
+    from math import sin
+    return sum(v * factors[w] *
+               sin(radians_from_degrees((x * a) + (y * b) + (z * d)))
+               for v, w, x, y, z in terms)
+
 # see lines 323-329 in calendrica-3.0.cl
 # Epoch definition. I took it out explicitly from rd().
 def epoch():
@@ -1305,9 +1401,91 @@ def is_short_kislev(h_year):
     """Return True if Kislev is short in Hebrew year h_year."""
     return days_in_hebrew_year(h_year) in [353, 383]
 
-# see lines 1702-1721 in calendrica-3.0.cl
+# Not in calendrica-3.0.cl: per-year Hebrew cache.
+# fixed_from_hebrew sums the lengths of the months before the date, each
+# of which may compute the length of the year, and hebrew_from_fixed
+# searches the year and the month with fixed_from_hebrew.  HebrewYear
+# holds the new year, the length and the month offsets of a Hebrew year,
+# computed once by hebrew_year_data and kept in HEBREW_YEAR_CACHE, so
+# that both conversions are lookups in it.  compute_fixed_from_hebrew and
+# compute_hebrew_from_fixed are the original conversions.
+from bisect import bisect_right
+
+HEBREW_YEAR_CACHE_SIZE = 10000
+
+# h_year -> HebrewYear
+HEBREW_YEAR_CACHE = {}
+
+class HebrewYear(object):
+    """New year, length and month offsets of Hebrew year 'year'.
+
+    offsets[m] is the number of days from the new year to the first of
+    month m, for m in 1..13, as in compute_fixed_from_hebrew; starts is
+    the list of the fixed dates of the first days of the months in
+    calendar order, from Tishri, and months the list of these months."""
+
+    def __init__(self, year):
+        self.year = year
+        self.new_year = hebrew_new_year(year)
+        self.days = hebrew_new_year(year + 1) - self.new_year
+        last_month = last_month_of_hebrew_year(year)
+        # as last_day_of_hebrew_month, with the length of the year
+        # computed once
+        lengths = {}
+        for m in range(NISAN, ADARII + 1):
+            if ((m in [IYYAR, TAMMUZ, ELUL, TEVET, ADARII])
+                or ((m == ADAR) and (last_month == ADAR))
+                or ((m == MARHESHVAN) and (self.days not in [355, 385]))
+                or ((m == KISLEV) and (self.days in [353, 383]))):
+                lengths[m] = 29
+            else:
+                lengths[m] = 30
+        self.offsets = [None]
+        for month in range(NISAN, ADARII + 1):
+            if month < TISHRI:
+                offset = (sum(lengths[m] for m in range(TISHRI,
+                                                        last_month + 1)) +
+                          sum(lengths[m] for m in range(NISAN, month)))
+            else:
+                offset = sum(lengths[m] for m in range(TISHRI, month))
+            self.offsets.append(offset)
+        self.months = (list(range(TISHRI, last_month + 1)) +
+                       list(range(NISAN, TISHRI)))
+        self.starts = [self.new_year + self.offsets[m] for m in self.months]
+
+def hebrew_year_data(h_year):
+    """Return the HebrewYear of Hebrew year h_year, from
+    HEBREW_YEAR_CACHE."""
+    data = HEBREW_YEAR_CACHE.get(h_year)
+    if data is None:
+        if len(HEBREW_YEAR_CACHE) >= HEBREW_YEAR_CACHE_SIZE:
+            HEBREW_YEAR_CACHE.clear()
+        data = HEBREW_YEAR_CACHE[h_year] = HebrewYear(h_year)
+    return data
+
 def fixed_from_hebrew(h_date):
-    """Return fixed date of Hebrew date h_date."""
+    """Return fixed date of Hebrew date h_date.
+    The year is looked up in the Hebrew year cache, see hebrew_year_data."""
+    month = standard_month(h_date)
+    if not (NISAN <= month <= ADARII):
+        return compute_fixed_from_hebrew(h_date)
+    data = hebrew_year_data(standard_year(h_date))
+    return data.new_year + standard_day(h_date) - 1 + data.offsets[month]
+
+def hebrew_from_fixed(date):
+    """Return  Hebrew (year month day) corresponding to fixed date date.
+    The years are looked up in the Hebrew year cache, see
+    hebrew_year_data."""
+    year = quotient(date - HEBREW_EPOCH, 35975351/98496)
+    while hebrew_year_data(year + 1).new_year <= date:
+        year += 1
+    data = hebrew_year_data(year)
+    i = bisect_right(data.starts, date) - 1
+    return hebrew_date(year, data.months[i], date - data.starts[i] + 1)
+
+# see lines 1702-1721 in calendrica-3.0.cl
+def compute_fixed_from_hebrew(h_date):
+    """Return fixed date of Hebrew date h_date, computed month by month."""
     month = standard_month(h_date)
     day   = standard_day(h_date)
     year  = standard_year(h_date)
@@ -1327,17 +1505,18 @@ def fixed_from_hebrew(h_date):
     return hebrew_new_year(year) + day - 1 + tmp
 
 # see lines 1723-1751 in calendrica-3.0.cl
-def hebrew_from_fixed(date):
-    """Return  Hebrew (year month day) corresponding to fixed date date.
+def compute_hebrew_from_fixed(date):
+    """Return  Hebrew (year month day) corresponding to fixed date date,
+    searched with compute_fixed_from_hebrew.
     # The fraction can be approximated by 365.25."""
     approx = quotient(date - HEBREW_EPOCH, 35975351/98496) + 1
     year = final(approx - 1, lambda y: hebrew_new_year(y) <= date)
     start = (TISHRI
-             if (date < fixed_from_hebrew(hebrew_date(year, NISAN, 1)))
+             if (date < compute_fixed_from_hebrew(hebrew_date(year, NISAN, 1)))
              else  NISAN)
-    month = next(start, lambda m: date <= fixed_from_hebrew(
+    month = next(start, lambda m: date <= compute_fixed_from_hebrew(
         hebrew_date(year, m, last_day_of_hebrew_month(m, year))))
-    day = date - fixed_from_hebrew(hebrew_date(year, month, 1)) + 1
+    day = date - compute_fixed_from_hebrew(hebrew_date(year, month, 1)) + 1
     return hebrew_date(year, month, day)
 
 # see lines 1753-1761 in calendrica-3.0.cl
@@ -2484,13 +2663,10 @@ def moment_of_depression(approx, location, alpha, early):
     early is true when MORNING event is sought, and false for EVENING.
     Returns BOGUS if depression angle is not reached."""
     tee = approx_moment_of_depression(approx, location, alpha, early)
-    if (tee == BOGUS):
-        return BOGUS
-    else:
-        if (abs(approx - tee) < sec(30)):
-            return tee
-        else:
-            return moment_of_depression(tee, location, alpha, early)
+    while (tee != BOGUS) and (abs(approx - tee) >= sec(30)):
+        approx = tee
+        tee = approx_moment_of_depression(approx, location, alpha, early)
+    return tee
 
 # see lines 2965-2968 in calendrica-3.0.cl
 MORNING = True
@@ -2764,6 +2940,40 @@ def equation_of_time(tee):
     return signum(equation) * min(abs(equation), hr(mpf(12)))
 
 # see lines 3209-3259 in calendrica-3.0.cl
+SOLAR_LONGITUDE_COEFFICIENTS = [403406, 195207, 119433, 112392, 3891, 2819, 1721,
+                660, 350, 334, 314, 268, 242, 234, 158, 132, 129, 114,
+                99, 93, 86, 78,72, 68, 64, 46, 38, 37, 32, 29, 28, 27, 27,
+                25, 24, 21, 21, 20, 18, 17, 14, 13, 13, 13, 12, 10, 10, 10,
+                10]
+SOLAR_LONGITUDE_MULTIPLIERS = [mpf(0.9287892), mpf(35999.1376958), mpf(35999.4089666),
+               mpf(35998.7287385), mpf(71998.20261), mpf(71998.4403),
+               mpf(36000.35726), mpf(71997.4812), mpf(32964.4678),
+               mpf(-19.4410), mpf(445267.1117), mpf(45036.8840), mpf(3.1008),
+               mpf(22518.4434), mpf(-19.9739), mpf(65928.9345),
+               mpf(9038.0293), mpf(3034.7684), mpf(33718.148), mpf(3034.448),
+               mpf(-2280.773), mpf(29929.992), mpf(31556.493), mpf(149.588),
+               mpf(9037.750), mpf(107997.405), mpf(-4444.176), mpf(151.771),
+               mpf(67555.316), mpf(31556.080), mpf(-4561.540),
+               mpf(107996.706), mpf(1221.655), mpf(62894.167),
+               mpf(31437.369), mpf(14578.298), mpf(-31931.757),
+               mpf(34777.243), mpf(1221.999), mpf(62894.511),
+               mpf(-4442.039), mpf(107997.909), mpf(119.066), mpf(16859.071),
+               mpf(-4.578), mpf(26895.292), mpf(-39.127), mpf(12297.536),
+               mpf(90073.778)]
+SOLAR_LONGITUDE_ADDENDS = [mpf(270.54861), mpf(340.19128), mpf(63.91854), mpf(331.26220),
+           mpf(317.843), mpf(86.631), mpf(240.052), mpf(310.26), mpf(247.23),
+           mpf(260.87), mpf(297.82), mpf(343.14), mpf(166.79), mpf(81.53),
+           mpf(3.50), mpf(132.75), mpf(182.95), mpf(162.03), mpf(29.8),
+           mpf(266.4), mpf(249.2), mpf(157.6), mpf(257.8),mpf(185.1),
+           mpf(69.9),  mpf(8.0), mpf(197.1), mpf(250.4), mpf(65.3),
+           mpf(162.7), mpf(341.5), mpf(291.6), mpf(98.5), mpf(146.7),
+           mpf(110.0), mpf(5.2), mpf(342.6), mpf(230.9), mpf(256.1),
+           mpf(45.3), mpf(242.9), mpf(115.2), mpf(151.8), mpf(285.3),
+           mpf(53.3), mpf(126.6), mpf(205.7), mpf(85.9), mpf(146.1)]
+SOLAR_LONGITUDE_TERMS = tuple(zip(SOLAR_LONGITUDE_COEFFICIENTS,
+                                  SOLAR_LONGITUDE_ADDENDS,
+                                  SOLAR_LONGITUDE_MULTIPLIERS))
+
 def solar_longitude(tee):
     """Return the longitude of sun at moment 'tee'.
     Adapted from 'Planetary Programs and Tables from -4000 to +2800'
@@ -2771,49 +2981,21 @@ def solar_longitude(tee):
     See also pag 166 of 'Astronomical Algorithms' by Jean Meeus, 2nd Ed 1998,
     with corrections Jun 2005."""
     c = julian_centuries(tee)
-    coefficients = [403406, 195207, 119433, 112392, 3891, 2819, 1721,
-                    660, 350, 334, 314, 268, 242, 234, 158, 132, 129, 114,
-                    99, 93, 86, 78,72, 68, 64, 46, 38, 37, 32, 29, 28, 27, 27,
-                    25, 24, 21, 21, 20, 18, 17, 14, 13, 13, 13, 12, 10, 10, 10,
-                    10]
-    multipliers = [mpf(0.9287892), mpf(35999.1376958), mpf(35999.4089666),
-                   mpf(35998.7287385), mpf(71998.20261), mpf(71998.4403),
-                   mpf(36000.35726), mpf(71997.4812), mpf(32964.4678),
-                   mpf(-19.4410), mpf(445267.1117), mpf(45036.8840), mpf(3.1008),
-                   mpf(22518.4434), mpf(-19.9739), mpf(65928.9345),
-                   mpf(9038.0293), mpf(3034.7684), mpf(33718.148), mpf(3034.448),
-                   mpf(-2280.773), mpf(29929.992), mpf(31556.493), mpf(149.588),
-                   mpf(9037.750), mpf(107997.405), mpf(-4444.176), mpf(151.771),
-                   mpf(67555.316), mpf(31556.080), mpf(-4561.540),
-                   mpf(107996.706), mpf(1221.655), mpf(62894.167),
-                   mpf(31437.369), mpf(14578.298), mpf(-31931.757),
-                   mpf(34777.243), mpf(1221.999), mpf(62894.511),
-                   mpf(-4442.039), mpf(107997.909), mpf(119.066), mpf(16859.071),
-                   mpf(-4.578), mpf(26895.292), mpf(-39.127), mpf(12297.536),
-                   mpf(90073.778)]
-    addends = [mpf(270.54861), mpf(340.19128), mpf(63.91854), mpf(331.26220),
-               mpf(317.843), mpf(86.631), mpf(240.052), mpf(310.26), mpf(247.23),
-               mpf(260.87), mpf(297.82), mpf(343.14), mpf(166.79), mpf(81.53),
-               mpf(3.50), mpf(132.75), mpf(182.95), mpf(162.03), mpf(29.8),
-               mpf(266.4), mpf(249.2), mpf(157.6), mpf(257.8),mpf(185.1),
-               mpf(69.9),  mpf(8.0), mpf(197.1), mpf(250.4), mpf(65.3),
-               mpf(162.7), mpf(341.5), mpf(291.6), mpf(98.5), mpf(146.7),
-               mpf(110.0), mpf(5.2), mpf(342.6), mpf(230.9), mpf(256.1),
-               mpf(45.3), mpf(242.9), mpf(115.2), mpf(151.8), mpf(285.3),
-               mpf(53.3), mpf(126.6), mpf(205.7), mpf(85.9), mpf(146.1)]
     lam = (deg(mpf(282.7771834)) +
            deg(mpf(36000.76953744)) * c +
            deg(mpf(0.000005729577951308232)) *
-           sigma([coefficients, addends, multipliers],
-                 lambda x, y, z:  x * sin_degrees(y + (z * c))))
+           sine_series(SOLAR_LONGITUDE_TERMS, c))
     return mod(lam + aberration(tee) + nutation(tee), 360)
 
 # see lines 3261-3271 in calendrica-3.0.cl
+NUTATION_A_COEFFS = deg([mpf(124.90), mpf(-1934.134), mpf(0.002063)])
+NUTATION_B_COEFFS = deg([mpf(201.11), mpf(72001.5377), mpf(0.00057)])
+
 def nutation(tee):
     """Return the longitudinal nutation at moment, tee."""
     c = julian_centuries(tee)
-    cap_A = poly(c, deg([mpf(124.90), mpf(-1934.134), mpf(0.002063)]))
-    cap_B = poly(c, deg([mpf(201.11), mpf(72001.5377), mpf(0.00057)]))
+    cap_A = poly(c, NUTATION_A_COEFFS)
+    cap_B = poly(c, NUTATION_B_COEFFS)
     return (deg(mpf(-0.004778))  * sin_degrees(cap_A) +
             deg(mpf(-0.0003667)) * sin_degrees(cap_B))
 
@@ -2833,7 +3015,7 @@ def solar_longitude_after(lam, tee):
     tau = tee + rate * mod(lam - solar_longitude(tee), 360)
     a = max(tee, tau - 5)
     b = tau + 5
-    return invert_angular(solar_longitude, lam, a, b)
+    return invert_angular(solar_longitude, lam, a, b, rate=1 / rate)
 
 # see lines 3297-3300 in calendrica-3.0.cl
 SPRING = deg(0)
@@ -2888,57 +3070,90 @@ def estimate_prior_solar_longitude(lam, tee):
     return min(tee, tau - (rate * cap_Delta))
 
 # see lines 3367-3376 in calendrica-3.0.cl
+MEAN_LUNAR_LONGITUDE_COEFFS = deg([mpf(218.3164477), mpf(481267.88123421),
+                                   mpf(-0.0015786), mpf(1/538841),
+                                   mpf(-1/65194000)])
+
 def mean_lunar_longitude(c):
     """Return mean longitude of moon (in degrees) at moment
     given in Julian centuries c (including the constant term of the
     effect of the light-time (-0".70).
     Adapted from eq. 47.1 in "Astronomical Algorithms" by Jean Meeus,
     Willmann_Bell, Inc., 2nd ed. with corrections, 2005."""
-    return degrees(poly(c,deg([mpf(218.3164477), mpf(481267.88123421),
-                               mpf(-0.0015786), mpf(1/538841),
-                               mpf(-1/65194000)])))
+    return degrees(poly(c, MEAN_LUNAR_LONGITUDE_COEFFS))
 
 # see lines 3378-3387 in calendrica-3.0.cl
+LUNAR_ELONGATION_COEFFS = deg([mpf(297.8501921), mpf(445267.1114034),
+                               mpf(-0.0018819), mpf(1/545868),
+                               mpf(-1/113065000)])
+
 def lunar_elongation(c):
     """Return elongation of moon (in degrees) at moment
     given in Julian centuries c.
     Adapted from eq. 47.2 in "Astronomical Algorithms" by Jean Meeus,
     Willmann_Bell, Inc., 2nd ed. with corrections, 2005."""
-    return degrees(poly(c, deg([mpf(297.8501921), mpf(445267.1114034),
-                                mpf(-0.0018819), mpf(1/545868),
-                                mpf(-1/113065000)])))
+    return degrees(poly(c, LUNAR_ELONGATION_COEFFS))
 
 # see lines 3389-3398 in calendrica-3.0.cl
+SOLAR_ANOMALY_COEFFS = deg([mpf(357.5291092), mpf(35999.0502909),
+                            mpf(-0.0001536), mpf(1/24490000)])
+
 def solar_anomaly(c):
     """Return mean anomaly of sun (in degrees) at moment
     given in Julian centuries c.
     Adapted from eq. 47.3 in "Astronomical Algorithms" by Jean Meeus,
     Willmann_Bell, Inc., 2nd ed. with corrections, 2005."""
-    return degrees(poly(c,deg([mpf(357.5291092), mpf(35999.0502909),
-                               mpf(-0.0001536), mpf(1/24490000)])))
+    return degrees(poly(c, SOLAR_ANOMALY_COEFFS))
 
 # see lines 3400-3409 in calendrica-3.0.cl
+LUNAR_ANOMALY_COEFFS = deg([mpf(134.9633964), mpf(477198.8675055),
+                            mpf(0.0087414), mpf(1/69699), mpf(-1/14712000)])
+
 def lunar_anomaly(c):
     """Return mean anomaly of moon (in degrees) at moment
     given in Julian centuries c.
     Adapted from eq. 47.4 in "Astronomical Algorithms" by Jean Meeus,
     Willmann_Bell, Inc., 2nd ed. with corrections, 2005."""
-    return degrees(poly(c, deg([mpf(134.9633964), mpf(477198.8675055),
-                                mpf(0.0087414), mpf(1/69699),
-                                mpf(-1/14712000)])))
+    return degrees(poly(c, LUNAR_ANOMALY_COEFFS))
 
 
 # see lines 3411-3420 in calendrica-3.0.cl
+MOON_NODE_COEFFS = deg([mpf(93.2720950), mpf(483202.0175233), mpf(-0.0036539),
+                        mpf(-1/3526000), mpf(1/863310000)])
+
 def moon_node(c):
     """Return Moon's argument of latitude (in degrees) at moment
     given in Julian centuries 'c'.
     Adapted from eq. 47.5 in "Astronomical Algorithms" by Jean Meeus,
     Willmann_Bell, Inc., 2nd ed. with corrections, 2005."""
-    return degrees(poly(c, deg([mpf(93.2720950), mpf(483202.0175233),
-                                mpf(-0.0036539), mpf(-1/3526000),
-                                mpf(1/863310000)])))
+    return degrees(poly(c, MOON_NODE_COEFFS))
 
 # see lines 3422-3485 in calendrica-3.0.cl
+# (sine_coefficient, lunar_elongation, solar_anomaly, lunar_anomaly,
+#  moon_node) terms of lunar_longitude
+LUNAR_LONGITUDE_TERMS = tuple(zip(
+    [6288774,1274027,658314,213618,-185116,-114332,
+     58793,57066,53322,45758,-40923,-34720,-30383,
+     15327,-12528,10980,10675,10034,8548,-7888,
+     -6766,-5163,4987,4036,3994,3861,3665,-2689,
+     -2602, 2390,-2348,2236,-2120,-2069,2048,-1773,
+     -1595,1215,-1110,-892,-810,759,-713,-700,691,
+     596,549,537,520,-487,-399,-381,351,-340,330,
+     327,-323,299,294],
+    [0, 2, 2, 0, 0, 0, 2, 2, 2, 2, 0, 1, 0, 2, 0, 0, 4, 0, 4, 2, 2, 1,
+     1, 2, 2, 4, 2, 0, 2, 2, 1, 2, 0, 0, 2, 2, 2, 4, 0, 3, 2, 4, 0, 2,
+     2, 2, 4, 0, 4, 1, 2, 0, 1, 3, 4, 2, 0, 1, 2],
+    [0, 0, 0, 0, 1, 0, 0, -1, 0, -1, 1, 0, 1, 0, 0, 0, 0, 0, 0, 1, 1,
+     0, 1, -1, 0, 0, 0, 1, 0, -1, 0, -2, 1, 2, -2, 0, 0, -1, 0, 0, 1,
+     -1, 2, 2, 1, -1, 0, 0, -1, 0, 1, 0, 1, 0, 0, -1, 2, 1, 0],
+    [1, -1, 0, 2, 0, 0, -2, -1, 1, 0, -1, 0, 1, 0, 1, 1, -1, 3, -2,
+     -1, 0, -1, 0, 1, 2, 0, -3, -2, -1, -2, 1, 0, 2, 0, -1, 1, 0,
+     -1, 2, -1, 1, -2, -1, -1, -2, 0, 1, 4, 0, -2, 0, 2, 1, -2, -3,
+     2, 1, -1, 3],
+    [0, 0, 0, 0, 0, 2, 0, 0, 0, 0, 0, 0, 0, -2, 2, -2, 0, 0, 0, 0, 0,
+     0, 0, 0, 0, 0, 0, 0, 2, 0, 0, 0, 0, 0, 0, -2, 2, 0, 2, 0, 0, 0, 0,
+     0, 0, -2, 0, 0, 0, 0, -2, -2, 0, 0, 0, 0, 0, 0, 0]))
+
 def lunar_longitude(tee):
     """Return longitude of moon (in degrees) at moment tee.
     Adapted from "Astronomical Algorithms" by Jean Meeus,
@@ -2951,42 +3166,13 @@ def lunar_longitude(tee):
     cap_F = moon_node(c)
     # see eq. 47.6 in Meeus
     cap_E = poly(c, [1, mpf(-0.002516), mpf(-0.0000074)])
-    args_lunar_elongation = \
-            [0, 2, 2, 0, 0, 0, 2, 2, 2, 2, 0, 1, 0, 2, 0, 0, 4, 0, 4, 2, 2, 1,
-             1, 2, 2, 4, 2, 0, 2, 2, 1, 2, 0, 0, 2, 2, 2, 4, 0, 3, 2, 4, 0, 2,
-             2, 2, 4, 0, 4, 1, 2, 0, 1, 3, 4, 2, 0, 1, 2]
-    args_solar_anomaly = \
-            [0, 0, 0, 0, 1, 0, 0, -1, 0, -1, 1, 0, 1, 0, 0, 0, 0, 0, 0, 1, 1,
-             0, 1, -1, 0, 0, 0, 1, 0, -1, 0, -2, 1, 2, -2, 0, 0, -1, 0, 0, 1,
-             -1, 2, 2, 1, -1, 0, 0, -1, 0, 1, 0, 1, 0, 0, -1, 2, 1, 0]
-    args_lunar_anomaly = \
-            [1, -1, 0, 2, 0, 0, -2, -1, 1, 0, -1, 0, 1, 0, 1, 1, -1, 3, -2,
-             -1, 0, -1, 0, 1, 2, 0, -3, -2, -1, -2, 1, 0, 2, 0, -1, 1, 0,
-             -1, 2, -1, 1, -2, -1, -1, -2, 0, 1, 4, 0, -2, 0, 2, 1, -2, -3,
-             2, 1, -1, 3]
-    args_moon_node = \
-            [0, 0, 0, 0, 0, 2, 0, 0, 0, 0, 0, 0, 0, -2, 2, -2, 0, 0, 0, 0, 0,
-             0, 0, 0, 0, 0, 0, 0, 2, 0, 0, 0, 0, 0, 0, -2, 2, 0, 2, 0, 0, 0, 0,
-             0, 0, -2, 0, 0, 0, 0, -2, -2, 0, 0, 0, 0, 0, 0, 0]
-    sine_coefficients = \
-            [6288774,1274027,658314,213618,-185116,-114332,
-             58793,57066,53322,45758,-40923,-34720,-30383,
-             15327,-12528,10980,10675,10034,8548,-7888,
-             -6766,-5163,4987,4036,3994,3861,3665,-2689,
-             -2602, 2390,-2348,2236,-2120,-2069,2048,-1773,
-             -1595,1215,-1110,-892,-810,759,-713,-700,691,
-             596,549,537,520,-487,-399,-381,351,-340,330,
-             327,-323,299,294]
     correction = (deg(1/1000000) *
-                  sigma([sine_coefficients, args_lunar_elongation,
-                         args_solar_anomaly, args_lunar_anomaly,
-                         args_moon_node],
-                        lambda v, w, x, y, z:
-                        v * pow(cap_E, abs(x)) *
-                        sin_degrees((w * cap_D) +
-                                    (x * cap_M) +
-                                    (y * cap_M_prime) +
-                                    (z * cap_F))))
+                  sum(v * pow(cap_E, abs(x)) *
+                      sin_degrees((w * cap_D) +
+                                  (x * cap_M) +
+                                  (y * cap_M_prime) +
+                                  (z * cap_F))
+                      for v, w, x, y, z in LUNAR_LONGITUDE_TERMS))
     A1 = deg(mpf(119.75)) + (c * deg(mpf(131.849)))
     venus = (deg(3958/1000000) * sin_degrees(A1))
     A2 = deg(mpf(53.09)) + c * deg(mpf(479264.29))
@@ -2997,6 +3183,31 @@ def lunar_longitude(tee):
                jupiter + flat_earth + nutation(tee), 360)
 
 # see lines 3663-3732 in calendrica-3.0.cl
+# (sine_coefficient, lunar_elongation, solar_anomaly, lunar_anomaly,
+#  moon_node) terms of lunar_latitude
+LUNAR_LATITUDE_TERMS = tuple(zip(
+    [5128122, 280602, 277693, 173237, 55413, 46271, 32573,
+     17198, 9266, 8822, 8216, 4324, 4200, -3359, 2463, 2211,
+     2065, -1870, 1828, -1794, -1749, -1565, -1491, -1475,
+     -1410, -1344, -1335, 1107, 1021, 833, 777, 671, 607,
+     596, 491, -451, 439, 422, 421, -366, -351, 331, 315,
+     302, -283, -229, 223, 223, -220, -220, -185, 181,
+     -177, 176, 166, -164, 132, -119, 115, 107],
+    [0, 0, 0, 2, 2, 2, 2, 0, 2, 0, 2, 2, 2, 2, 2, 2, 2, 0, 4, 0, 0, 0,
+     1, 0, 0, 0, 1, 0, 4, 4, 0, 4, 2, 2, 2, 2, 0, 2, 2, 2, 2, 4, 2, 2,
+     0, 2, 1, 1, 0, 2, 1, 2, 0, 4, 4, 1, 4, 1, 4, 2],
+    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, -1, 0, 0, 1, -1, -1, -1, 1, 0, 1,
+     0, 1, 0, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0, -1, 0, 0, 0, 0, 1, 1,
+     0, -1, -2, 0, 1, 1, 1, 1, 1, 0, -1, 1, 0, -1, 0, 0, 0, -1, -2],
+    [0, 1, 1, 0, -1, -1, 0, 2, 1, 2, 0, -2, 1, 0, -1, 0, -1, -1, -1,
+     0, 0, -1, 0, 1, 1, 0, 0, 3, 0, -1, 1, -2, 0, 2, 1, -2, 3, 2, -3,
+     -1, 0, 0, 1, 0, 1, 1, 0, 0, -2, -1, 1, -2, 2, -2, -1, 1, 1, -2,
+     0, 0],
+    [1, 1, -1, -1, 1, -1, 1, 1, -1, -1, -1, -1, 1, -1, 1, 1, -1, -1,
+     -1, 1, 3, 1, 1, 1, -1, -1, -1, 1, -1, 1, -3, 1, -3, -1, -1, 1,
+     -1, 1, -1, 1, 1, 1, 1, -1, 3, -1, -1, 1, -1, -1, 1, -1, 1, -1,
+     -1, -1, -1, -1, -1, 1]))
+
 def lunar_latitude(tee):
     """Return the latitude of moon (in degrees) at moment, tee.
     Adapted from "Astronomical Algorithms" by Jean Meeus,
@@ -3008,44 +3219,13 @@ def lunar_latitude(tee):
     cap_M_prime = lunar_anomaly(c)
     cap_F = moon_node(c)
     cap_E = poly(c, [1, mpf(-0.002516), mpf(-0.0000074)])
-    args_lunar_elongation = \
-            [0, 0, 0, 2, 2, 2, 2, 0, 2, 0, 2, 2, 2, 2, 2, 2, 2, 0, 4, 0, 0, 0,
-             1, 0, 0, 0, 1, 0, 4, 4, 0, 4, 2, 2, 2, 2, 0, 2, 2, 2, 2, 4, 2, 2,
-             0, 2, 1, 1, 0, 2, 1, 2, 0, 4, 4, 1, 4, 1, 4, 2]
-    args_solar_anomaly = \
-            [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, -1, 0, 0, 1, -1, -1, -1, 1, 0, 1,
-             0, 1, 0, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0, -1, 0, 0, 0, 0, 1, 1,
-             0, -1, -2, 0, 1, 1, 1, 1, 1, 0, -1, 1, 0, -1, 0, 0, 0, -1, -2]
-    args_lunar_anomaly = \
-            [0, 1, 1, 0, -1, -1, 0, 2, 1, 2, 0, -2, 1, 0, -1, 0, -1, -1, -1,
-             0, 0, -1, 0, 1, 1, 0, 0, 3, 0, -1, 1, -2, 0, 2, 1, -2, 3, 2, -3,
-             -1, 0, 0, 1, 0, 1, 1, 0, 0, -2, -1, 1, -2, 2, -2, -1, 1, 1, -2,
-             0, 0]
-    args_moon_node = \
-            [1, 1, -1, -1, 1, -1, 1, 1, -1, -1, -1, -1, 1, -1, 1, 1, -1, -1,
-             -1, 1, 3, 1, 1, 1, -1, -1, -1, 1, -1, 1, -3, 1, -3, -1, -1, 1,
-             -1, 1, -1, 1, 1, 1, 1, -1, 3, -1, -1, 1, -1, -1, 1, -1, 1, -1,
-             -1, -1, -1, -1, -1, 1]
-    sine_coefficients = \
-            [5128122, 280602, 277693, 173237, 55413, 46271, 32573,
-             17198, 9266, 8822, 8216, 4324, 4200, -3359, 2463, 2211,
-             2065, -1870, 1828, -1794, -1749, -1565, -1491, -1475,
-             -1410, -1344, -1335, 1107, 1021, 833, 777, 671, 607,
-             596, 491, -451, 439, 422, 421, -366, -351, 331, 315,
-             302, -283, -229, 223, 223, -220, -220, -185, 181,
-             -177, 176, 166, -164, 132, -119, 115, 107]
     beta = (deg(1/1000000) *
-            sigma([sine_coefficients,
-                   args_lunar_elongation,
-                   args_solar_anomaly,
-                   args_lunar_anomaly,
-                   args_moon_node],
-                  lambda v, w, x, y, z: (v *
-                                         pow(cap_E, abs(x)) *
-                                         sin_degrees((w * cap_D) +
-                                                     (x * cap_M) +
-                                                     (y * cap_M_prime) +
-                                                     (z * cap_F)))))
+            sum(v * pow(cap_E, abs(x)) *
+                sin_degrees((w * cap_D) +
+                            (x * cap_M) +
+                            (y * cap_M_prime) +
+                            (z * cap_F))
+                for v, w, x, y, z in LUNAR_LATITUDE_TERMS))
     venus = (deg(175/1000000) *
              (sin_degrees(deg(mpf(119.75)) + c * deg(mpf(131.849)) + cap_F) +
               sin_degrees(deg(mpf(119.75)) + c * deg(mpf(131.849)) - cap_F)))
@@ -3116,84 +3296,186 @@ def sidereal_lunar_longitude(tee):
 
 
 # see lines 99-190 in calendrica-3.0.errata.cl
+# Polynomial coefficients of nth_new_moon
+NEW_MOON_APPROX_COEFFS = [mpf(5.09766),
+                          MEAN_SYNODIC_MONTH * mpf(1236.85),
+                          mpf(0.0001437),
+                          mpf(-0.000000150),
+                          mpf(0.00000000073)]
+NEW_MOON_E_COEFFS = [1, mpf(-0.002516), mpf(-0.0000074)]
+NEW_MOON_SOLAR_ANOMALY_COEFFS = deg([mpf(2.5534),
+                                     (mpf(1236.85) * mpf(29.10535669)),
+                                     mpf(-0.0000014), mpf(-0.00000011)])
+NEW_MOON_LUNAR_ANOMALY_COEFFS = deg([mpf(201.5643),
+                                     (mpf(385.81693528) * mpf(1236.85)),
+                                     mpf(0.0107582), mpf(0.00001238),
+                                     mpf(-0.000000058)])
+NEW_MOON_MOON_ARGUMENT_COEFFS = deg([mpf(160.7108),
+                                     (mpf(390.67050284) * mpf(1236.85)),
+                                     mpf(-0.0016118), mpf(-0.00000227),
+                                     mpf(0.000000011)])
+NEW_MOON_CAP_OMEGA_COEFFS = [mpf(124.7746),
+                             (mpf(-1.56375588) * mpf(1236.85)),
+                             mpf(0.0020672), mpf(0.00000215)]
+NEW_MOON_EXTRA_COEFFS = deg([mpf(299.77), mpf(132.8475848), mpf(-0.009173)])
+
+# (sine_coeff, E_factor, solar_coeff, lunar_coeff, moon_coeff) terms of
+# the correction of nth_new_moon
+NEW_MOON_CORRECTION_TERMS = tuple(zip(
+    [mpf(-0.40720), mpf(0.17241), mpf(0.01608),
+     mpf(0.01039),  mpf(0.00739), mpf(-0.00514),
+     mpf(0.00208), mpf(-0.00111), mpf(-0.00057),
+     mpf(0.00056), mpf(-0.00042), mpf(0.00042),
+     mpf(0.00038), mpf(-0.00024), mpf(-0.00007),
+     mpf(0.00004), mpf(0.00004), mpf(0.00003),
+     mpf(0.00003), mpf(-0.00003), mpf(0.00003),
+     mpf(-0.00002), mpf(-0.00002), mpf(0.00002)],
+    [0, 1, 0, 0, 1, 1, 2, 0, 0, 1, 0, 1, 1, 1, 0, 0, 0, 0,
+     0, 0, 0, 0, 0, 0],
+    [0, 1, 0, 0, -1, 1, 2, 0, 0, 1, 0, 1, 1, -1, 2,
+     0, 3, 1, 0, 1, -1, -1, 1, 0],
+    [1, 0, 2, 0, 1, 1, 0, 1, 1, 2, 3, 0, 0, 2, 1, 2,
+     0, 1, 2, 1, 1, 1, 3, 4],
+    [0, 0, 0, 2, 0, 0, 0, -2, 2, 0, 0, 2, -2, 0, 0,
+     -2, 0, -2, 2, 2, 2, -2, 0, 0]))
+
+# (add_factor, add_const, add_coeff) terms of the additional corrections
+# of nth_new_moon
+NEW_MOON_ADDITIONAL_TERMS = tuple(zip(
+    [mpf(0.000165), mpf(0.000164), mpf(0.000126),
+     mpf(0.000110), mpf(0.000062), mpf(0.000060),
+     mpf(0.000056), mpf(0.000047), mpf(0.000042),
+     mpf(0.000040), mpf(0.000037), mpf(0.000035),
+     mpf(0.000023)],
+    [mpf(251.88), mpf(251.83), mpf(349.42), mpf(84.66),
+     mpf(141.74), mpf(207.14), mpf(154.84), mpf(34.52),
+     mpf(207.19), mpf(291.34), mpf(161.72), mpf(239.56),
+     mpf(331.55)],
+    [mpf(0.016321), mpf(26.651886), mpf(36.412478),
+     mpf(18.206239), mpf(53.303771), mpf(2.453732),
+     mpf(7.306860), mpf(27.261239), mpf(0.121824),
+     mpf(1.844379), mpf(24.198154), mpf(25.513099),
+     mpf(3.592518)]))
+
 def nth_new_moon(n):
+    """Return the moment of n-th new moon after (or before) the new moon
+    of January 11, 1.  The moments are memoized, see NEW_MOON_CACHE."""
+    key = (BACKEND, n)
+    tee = NEW_MOON_CACHE.get(key)
+    if tee is None:
+        if len(NEW_MOON_CACHE) >= NEW_MOON_CACHE_SIZE:
+            NEW_MOON_CACHE.clear()
+        tee = NEW_MOON_CACHE[key] = compute_nth_new_moon(n)
+    return tee
+
+def compute_nth_new_moon(n):
     """Return the moment of n-th new moon after (or before) the new moon
     of January 11, 1.  Adapted from "Astronomical Algorithms"
     by Jean Meeus, Willmann_Bell, Inc., 2nd ed., 1998."""
     n0 = 24724
     k = n - n0
     c = k / mpf(1236.85)
-    approx = (J2000 +
-              poly(c, [mpf(5.09766),
-                       MEAN_SYNODIC_MONTH * mpf(1236.85),
-                       mpf(0.0001437),
-                       mpf(-0.000000150),
-                       mpf(0.00000000073)]))
-    cap_E = poly(c, [1, mpf(-0.002516), mpf(-0.0000074)])
-    solar_anomaly = poly(c, deg([mpf(2.5534),
-                                 (mpf(1236.85) * mpf(29.10535669)),
-                                 mpf(-0.0000014), mpf(-0.00000011)]))
-    lunar_anomaly = poly(c, deg([mpf(201.5643),
-                                 (mpf(385.81693528) * mpf(1236.85)),
-                                 mpf(0.0107582), mpf(0.00001238),
-                                 mpf(-0.000000058)]))
-    moon_argument = poly(c, deg([mpf(160.7108),
-                                 (mpf(390.67050284) * mpf(1236.85)),
-                                 mpf(-0.0016118), mpf(-0.00000227),
-                                 mpf(0.000000011)]))
-    cap_omega = poly(c, [mpf(124.7746),
-                         (mpf(-1.56375588) * mpf(1236.85)),
-                         mpf(0.0020672), mpf(0.00000215)])
-    E_factor = [0, 1, 0, 0, 1, 1, 2, 0, 0, 1, 0, 1, 1, 1, 0, 0, 0, 0,
-                0, 0, 0, 0, 0, 0]
-    solar_coeff = [0, 1, 0, 0, -1, 1, 2, 0, 0, 1, 0, 1, 1, -1, 2,
-                   0, 3, 1, 0, 1, -1, -1, 1, 0]
-    lunar_coeff = [1, 0, 2, 0, 1, 1, 0, 1, 1, 2, 3, 0, 0, 2, 1, 2,
-                   0, 1, 2, 1, 1, 1, 3, 4]
-    moon_coeff = [0, 0, 0, 2, 0, 0, 0, -2, 2, 0, 0, 2, -2, 0, 0,
-                  -2, 0, -2, 2, 2, 2, -2, 0, 0]
-    sine_coeff = [mpf(-0.40720), mpf(0.17241), mpf(0.01608),
-                  mpf(0.01039),  mpf(0.00739), mpf(-0.00514),
-                  mpf(0.00208), mpf(-0.00111), mpf(-0.00057),
-                  mpf(0.00056), mpf(-0.00042), mpf(0.00042),
-                  mpf(0.00038), mpf(-0.00024), mpf(-0.00007),
-                  mpf(0.00004), mpf(0.00004), mpf(0.00003),
-                  mpf(0.00003), mpf(-0.00003), mpf(0.00003),
-                  mpf(-0.00002), mpf(-0.00002), mpf(0.00002)]
+    approx = J2000 + poly(c, NEW_MOON_APPROX_COEFFS)
+    cap_E = poly(c, NEW_MOON_E_COEFFS)
+    solar_anomaly = poly(c, NEW_MOON_SOLAR_ANOMALY_COEFFS)
+    lunar_anomaly = poly(c, NEW_MOON_LUNAR_ANOMALY_COEFFS)
+    moon_argument = poly(c, NEW_MOON_MOON_ARGUMENT_COEFFS)
+    cap_omega = poly(c, NEW_MOON_CAP_OMEGA_COEFFS)
+    # pow(cap_E, w) for the E_factor w of the correction terms
+    cap_E_powers = [pow(cap_E, 0), pow(cap_E, 1), pow(cap_E, 2)]
     correction = ((deg(mpf(-0.00017)) * sin_degrees(cap_omega)) +
-                  sigma([sine_coeff, E_factor, solar_coeff,
-                         lunar_coeff, moon_coeff],
-                        lambda v, w, x, y, z: (v *
-                                    pow(cap_E, w) *
-                                    sin_degrees((x * solar_anomaly) +
-                                                (y * lunar_anomaly) +
-                                                (z * moon_argument)))))
-    add_const = [mpf(251.88), mpf(251.83), mpf(349.42), mpf(84.66),
-                 mpf(141.74), mpf(207.14), mpf(154.84), mpf(34.52),
-                 mpf(207.19), mpf(291.34), mpf(161.72), mpf(239.56),
-                 mpf(331.55)]
-    add_coeff = [mpf(0.016321), mpf(26.651886), mpf(36.412478),
-                 mpf(18.206239), mpf(53.303771), mpf(2.453732),
-                 mpf(7.306860), mpf(27.261239), mpf(0.121824),
-                 mpf(1.844379), mpf(24.198154), mpf(25.513099),
-                 mpf(3.592518)]
-    add_factor = [mpf(0.000165), mpf(0.000164), mpf(0.000126),
-                  mpf(0.000110), mpf(0.000062), mpf(0.000060),
-                  mpf(0.000056), mpf(0.000047), mpf(0.000042),
-                  mpf(0.000040), mpf(0.000037), mpf(0.000035),
-                  mpf(0.000023)]
+                  argument_sine_series(NEW_MOON_CORRECTION_TERMS,
+                                       cap_E_powers, solar_anomaly,
+                                       lunar_anomaly, moon_argument))
     extra = (deg(mpf(0.000325)) *
-             sin_degrees(poly(c, deg([mpf(299.77), mpf(132.8475848),
-                                      mpf(-0.009173)]))))
-    additional = sigma([add_const, add_coeff, add_factor],
-                       lambda i, j, l: l * sin_degrees(i + j * k))
+             sin_degrees(poly(c, NEW_MOON_EXTRA_COEFFS)))
+    additional = sine_series(NEW_MOON_ADDITIONAL_TERMS, k)
 
     return universal_from_dynamical(approx + correction + extra + additional)
 
 
+# Not in calendrica-3.0.cl: new moon cache and index.
+# The searches for new moons evaluate nth_new_moon for the same n over and
+# over, e.g. when converting consecutive days.  nth_new_moon memoizes its
+# moments in NEW_MOON_CACHE, which is cleared when it holds
+# NEW_MOON_CACHE_SIZE moments.  warm_new_moons also stores the moments of
+# the new moons of a range of years in a sorted NewMoonIndex, so that
+# new_moon_before and new_moon_at_or_after are a bisection of the index
+# in that range.  Both are keyed by BACKEND, since the moments of the
+# backends differ slightly.
+from bisect import bisect_left
+
+NEW_MOON_CACHE_SIZE = 2 ** 16
+
+# (BACKEND, n) -> moment of n-th new moon
+NEW_MOON_CACHE = {}
+
+# BACKEND -> NewMoonIndex
+NEW_MOON_INDEXES = {}
+
+class NewMoonIndex(object):
+    """Moments of the consecutive new moons first_n, first_n + 1, ..."""
+
+    def __init__(self, first_n, moments):
+        self.first_n = first_n
+        self.moments = moments
+
+    def last_n(self):
+        return self.first_n + len(self.moments) - 1
+
+    def position(self, tee):
+        """Return the index in self.moments of the first new moon at or
+        after moment, tee, or None if the index cannot tell whether the
+        new moons just before and at or after tee are in it."""
+        i = bisect_left(self.moments, tee)
+        if 0 < i < len(self.moments):
+            return i
+        return None
+
+def warm_new_moons(start_year, end_year, extend=True):
+    """Index the new moons of Gregorian years start_year to end_year
+    (inclusive), extending the index of the current backend, or replacing
+    it if not 'extend', so that the new moons between far apart ranges are
+    not computed.  Return the number of new moons in the index."""
+    t0 = nth_new_moon(0)
+    first_n = iround((fixed_from_gregorian(gregorian_date(start_year,
+                                                          JANUARY, 1)) -
+                      t0) / MEAN_SYNODIC_MONTH) - 2
+    last_n = iround((fixed_from_gregorian(gregorian_date(end_year + 1,
+                                                         JANUARY, 1)) -
+                     t0) / MEAN_SYNODIC_MONTH) + 2
+    index = NEW_MOON_INDEXES.get(BACKEND) if extend else None
+    if index is not None:
+        first_n = min(first_n, index.first_n)
+        last_n = max(last_n, index.last_n())
+    index = NewMoonIndex(first_n, [nth_new_moon(n)
+                                   for n in range(first_n, last_n + 1)])
+    NEW_MOON_INDEXES[BACKEND] = index
+    return len(index.moments)
+
+def clear_new_moon_cache():
+    """Clear the new moon cache and indexes of all backends."""
+    NEW_MOON_CACHE.clear()
+    NEW_MOON_INDEXES.clear()
+
+def indexed_new_moon_position(tee):
+    """Return the index of the current backend and the position in it of
+    the first new moon at or after moment, tee, or None if tee is not in
+    the index."""
+    index = NEW_MOON_INDEXES.get(BACKEND)
+    if index is not None:
+        i = index.position(tee)
+        if i is not None:
+            return index, i
+    return None
+
 # see lines 3578-3585 in calendrica-3.0.cl
 def new_moon_before(tee):
     """Return the moment UT of last new moon before moment tee."""
+    indexed = indexed_new_moon_position(tee)
+    if indexed is not None:
+        index, i = indexed
+        return index.moments[i - 1]
     t0 = nth_new_moon(0)
     phi = lunar_phase(tee)
     n = iround(((tee - t0) / MEAN_SYNODIC_MONTH) - (phi / deg(360)))
@@ -3203,6 +3485,10 @@ def new_moon_before(tee):
 # see lines 3587-3594 in calendrica-3.0.cl
 def new_moon_at_or_after(tee):
     """Return the moment UT of first new moon at or after moment, tee."""
+    indexed = indexed_new_moon_position(tee)
+    if indexed is not None:
+        index, i = indexed
+        return index.moments[i]
     t0 = nth_new_moon(0)
     phi = lunar_phase(tee)
     n = iround((tee - t0) / MEAN_SYNODIC_MONTH - phi / deg(360))
@@ -3236,7 +3522,8 @@ def lunar_phase_at_or_before(phi, tee):
             mod(lunar_phase(tee) - phi, 360)))
     a = tau - 2
     b = min(tee, tau +2)
-    return invert_angular(lunar_phase, phi, a, b)
+    return invert_angular(lunar_phase, phi, a, b,
+                          rate=deg(360) / MEAN_SYNODIC_MONTH)
 
 
 # see lines 3627-3631 in calendrica-3.0.cl
@@ -3261,7 +3548,8 @@ def lunar_phase_at_or_after(phi, tee):
             mod(phi - lunar_phase(tee), 360)))
     a = max(tee, tau - 2)
     b = tau + 2
-    return invert_angular(lunar_phase, phi, a, b)
+    return invert_angular(lunar_phase, phi, a, b,
+                          rate=deg(360) / MEAN_SYNODIC_MONTH)
 
 
 
@@ -3391,9 +3679,10 @@ def visible_crescent(date, location):
             (altitude > deg(mpf(4.1))))
 
 # see lines 5847-5860 in calendrica-3.0.cl
-def phasis_on_or_before(date, location):
+def compute_phasis_on_or_before(date, location):
     """Return the closest fixed date on or before date 'date', when crescent
-    moon first became visible at location 'location'."""
+    moon first became visible at location 'location', searched day by
+    day."""
     mean = date - ifloor(lunar_phase(date + 1) / deg(360) *
                          MEAN_SYNODIC_MONTH)
     tau = ((mean - 30)
@@ -3450,9 +3739,10 @@ def astronomical_easter(g_year):
 JAFFA = location(angle(32, 1, 60), angle(34, 45, 0), mt(0), hr(2))
 
 # see lines 5925-5938 in calendrica-3.0.cl
-def phasis_on_or_after(date, location):
+def compute_phasis_on_or_after(date, location):
     """Return closest fixed date on or after date, date, on the eve
-    of which crescent moon first became visible at location, location."""
+    of which crescent moon first became visible at location, location,
+    searched day by day."""
     mean = date - ifloor(lunar_phase(date + 1) / deg(mpf(360)) *
                         MEAN_SYNODIC_MONTH)
     tau = (date if (((date - mean) <= 3) and
@@ -3461,7 +3751,7 @@ def phasis_on_or_after(date, location):
     return next(tau, lambda d: visible_crescent(d, location))
 
 # see lines 5940-5955 in calendrica-3.0.cl
-def observational_hebrew_new_year(g_year):
+def compute_observational_hebrew_new_year(g_year):
     """Return fixed date of Observational (classical)
     Nisan 1 occurring in Gregorian year, g_year."""
     jan1 = gregorian_new_year(g_year)
@@ -3470,6 +3760,99 @@ def observational_hebrew_new_year(g_year):
     return phasis_on_or_after(ifloor(equinox) - (14 if (equinox < sset) else 13),
                               JAFFA)
 
+# Not in calendrica-3.0.cl: crescent visibility cache.
+# compute_phasis_on_or_before and compute_phasis_on_or_after test
+# visible_crescent day after day, and each test computes dusk and the
+# lunar phase, altitude and latitude, so the observational calendars
+# search the first crescent of the month again for every date of the
+# month.  The phasis of the n-th lunation at a location, i.e., the first
+# day after the n-th new moon on the eve of which the crescent is
+# visible, is computed once by lunation_phasis and kept in PHASIS_CACHE,
+# keyed by backend, location and n.  phasis_on_or_before and
+# phasis_on_or_after pick among the phases of the lunations around the
+# date, and phasis_table computes the month starts of a range of years.
+# The observational Hebrew new years, found from the vernal equinox by
+# invert_angular, are kept in OBSERVATIONAL_HEBREW_NEW_YEARS, keyed by
+# backend, angular solver and Gregorian year.  Both caches are emptied
+# when they reach PHASIS_CACHE_SIZE entries.
+PHASIS_CACHE_SIZE = 2**14
+
+# (backend, location, n) -> fixed date
+PHASIS_CACHE = {}
+
+# (backend, angular solver, g_year) -> fixed date
+OBSERVATIONAL_HEBREW_NEW_YEARS = {}
+
+def clear_phasis_cache():
+    """Clear the crescent visibility cache."""
+    PHASIS_CACHE.clear()
+    OBSERVATIONAL_HEBREW_NEW_YEARS.clear()
+
+def lunation_phasis(n, location):
+    """Return the fixed date of the phasis of the n-th new moon at location
+    'location': the first day on the eve of which the crescent moon is
+    visible after the new moon."""
+    key = (BACKEND, tuple(location), n)
+    phasis = PHASIS_CACHE.get(key)
+    if phasis is None:
+        if len(PHASIS_CACHE) >= PHASIS_CACHE_SIZE:
+            PHASIS_CACHE.clear()
+        # The eve of the day before the new moon is before the new moon
+        # at any time zone.
+        phasis = next(ifloor(nth_new_moon(n)) - 1,
+                      lambda d: visible_crescent(d, location))
+        PHASIS_CACHE[key] = phasis
+    return phasis
+
+def mean_lunation(date):
+    """Return the number of the last mean new moon on or before fixed
+    date 'date'."""
+    return ifloor((date - nth_new_moon(0)) / MEAN_SYNODIC_MONTH)
+
+def phasis_on_or_before(date, location):
+    """Return the closest fixed date on or before date 'date', when crescent
+    moon first became visible at location 'location'.
+    The phases are looked up in the crescent visibility cache."""
+    n = mean_lunation(date)
+    return max(phasis
+               for phasis in (lunation_phasis(k, location)
+                              for k in range(n - 1, n + 2))
+               if phasis <= date)
+
+def phasis_on_or_after(date, location):
+    """Return closest fixed date on or after date, date, on the eve
+    of which crescent moon first became visible at location, location.
+    The phases are looked up in the crescent visibility cache."""
+    n = mean_lunation(date)
+    return min(phasis
+               for phasis in (lunation_phasis(k, location)
+                              for k in range(n, n + 3))
+               if phasis >= date)
+
+def phasis_table(g_start, g_end, location):
+    """Return the list of the fixed dates of the phases at location
+    'location' in Gregorian years g_start to g_end, i.e., the first days
+    of the months of the observational lunar calendars."""
+    start = gregorian_new_year(g_start)
+    end = gregorian_year_end(g_end)
+    phases = [lunation_phasis(n, location)
+              for n in range(mean_lunation(start) - 1,
+                             mean_lunation(end) + 2)]
+    return [phasis for phasis in phases if start <= phasis <= end]
+
+def observational_hebrew_new_year(g_year):
+    """Return fixed date of Observational (classical)
+    Nisan 1 occurring in Gregorian year, g_year.
+    The new years are cached with the phases."""
+    key = (BACKEND, ANGULAR_SOLVER, g_year)
+    new_year = OBSERVATIONAL_HEBREW_NEW_YEARS.get(key)
+    if new_year is None:
+        if len(OBSERVATIONAL_HEBREW_NEW_YEARS) >= PHASIS_CACHE_SIZE:
+            OBSERVATIONAL_HEBREW_NEW_YEARS.clear()
+        new_year = compute_observational_hebrew_new_year(g_year)
+        OBSERVATIONAL_HEBREW_NEW_YEARS[key] = new_year
+    return new_year
+
 # see lines 5957-5973 in calendrica-3.0.cl
 def fixed_from_observational_hebrew(h_date):
     """Return fixed date equivalent to Observational Hebrew date."""
@@ -3948,7 +4331,11 @@ def chinese_solar_longitude_on_or_after(lam, date):
 # see lines 4379-4387 in calendrica-3.0.cl
 def current_major_solar_term(date):
     """Return last Chinese major solar term (zhongqi) before
-    fixed date, date."""
+    fixed date, date.  The solar term table is consulted first, see
+    solar_term_table_angle."""
+    angle = solar_term_table_angle(date)
+    if angle is not None:
+        return amod(2 + quotient(angle, deg(30)), 12)
     s = solar_longitude(universal_from_standard(date,
                                                 chinese_location(date)))
     return amod(2 + quotient(int(s), deg(30)), 12)
@@ -3958,14 +4345,22 @@ def major_solar_term_on_or_after(date):
     """Return moment (in Beijing) of the first Chinese major
     solar term (zhongqi) on or after fixed date, date.  The
     major terms begin when the sun's longitude is a
-    multiple of 30 degrees."""
+    multiple of 30 degrees.  The solar term table is consulted first,
+    see solar_term_table_on_or_after."""
+    tee = solar_term_table_on_or_after(date, lambda angle: angle % 30 == 0)
+    if tee is not None:
+        return tee
     s = solar_longitude(midnight_in_china(date))
     l = mod(30 * ceiling(s / 30), 360)
     return chinese_solar_longitude_on_or_after(l, date)
 
 # see lines 4399-4407 in calendrica-3.0.cl
 def current_minor_solar_term(date):
-    """Return last Chinese minor solar term (jieqi) before date, date."""
+    """Return last Chinese minor solar term (jieqi) before date, date.
+    The solar term table is consulted first, see solar_term_table_angle."""
+    angle = solar_term_table_angle(date)
+    if angle is not None:
+        return amod(3 + quotient(angle - deg(15), deg(30)), 12)
     s = solar_longitude(universal_from_standard(date,
                                                 chinese_location(date)))
     return amod(3 + quotient(s - deg(15), deg(30)), 12)
@@ -3974,7 +4369,12 @@ def current_minor_solar_term(date):
 def minor_solar_term_on_or_after(date):
     """Return moment (in Beijing) of the first Chinese minor solar
     term (jieqi) on or after fixed date, date.  The minor terms
-    begin when the sun's longitude is an odd multiple of 15 degrees."""
+    begin when the sun's longitude is an odd multiple of 15 degrees.
+    The solar term table is consulted first, see
+    solar_term_table_on_or_after."""
+    tee = solar_term_table_on_or_after(date, lambda angle: angle % 30 == 15)
+    if tee is not None:
+        return tee
     s = solar_longitude(midnight_in_china(date))
     l = mod(30 * ceiling((s - deg(15)) / 30) + deg(15), 360)
     return chinese_solar_longitude_on_or_after(l, date)
@@ -4011,7 +4411,11 @@ def midnight_in_china(date):
 # see lines 4465-4474 in calendrica-3.0.cl
 def chinese_winter_solstice_on_or_before(date):
     """Return fixed date, in the Chinese zone, of winter solstice
-    on or before fixed date, date."""
+    on or before fixed date, date.  The solar term table is consulted
+    first, see solar_term_table_winter_solstice."""
+    solstice = solar_term_table_winter_solstice(date)
+    if solstice is not None:
+        return solstice
     approx = estimate_prior_solar_longitude(WINTER,
                                             midnight_in_china(date + 1))
     return next(ifloor(approx) - 1,
@@ -4039,6 +4443,9 @@ def chinese_new_year_in_sui(date):
 # see lines 4502-4511 in calendrica-3.0.cl
 def chinese_new_year_on_or_before(date):
     """Return fixed date of Chinese New Year on or before fixed date, date."""
+    new_year = chinese_table_new_year_on_or_before(date)
+    if new_year is not None:
+        return new_year
     new_year = chinese_new_year_in_sui(date)
     if (date >= new_year):
         return new_year
@@ -4053,7 +4460,17 @@ def chinese_new_year(g_year):
 
 # see lines 4520-4565 in calendrica-3.0.cl
 def chinese_from_fixed(date):
-    """Return Chinese date (cycle year month leap day) of fixed date, date."""
+    """Return Chinese date (cycle year month leap day) of fixed date, date.
+    The precomputed Chinese table is consulted first, see
+    chinese_table_from_fixed."""
+    c_date = chinese_table_from_fixed(date)
+    if c_date is not None:
+        return c_date
+    return compute_chinese_from_fixed(date)
+
+def compute_chinese_from_fixed(date):
+    """Return Chinese date (cycle year month leap day) of fixed date, date,
+    computed astronomically."""
     s1 = chinese_winter_solstice_on_or_before(date)
     s2 = chinese_winter_solstice_on_or_before(s1 + 370)
     next_m11 = chinese_new_moon_before(1 + s2)
@@ -4081,7 +4498,16 @@ def chinese_from_fixed(date):
 
 # see lines 4567-4596 in calendrica-3.0.cl
 def fixed_from_chinese(c_date):
-    """Return fixed date of Chinese date, c_date."""
+    """Return fixed date of Chinese date, c_date.
+    The precomputed Chinese table is consulted first, see
+    chinese_table_to_fixed."""
+    date = chinese_table_to_fixed(c_date)
+    if date is not None:
+        return date
+    return compute_fixed_from_chinese(c_date)
+
+def compute_fixed_from_chinese(c_date):
+    """Return fixed date of Chinese date, c_date, computed astronomically."""
     cycle = chinese_cycle(c_date)
     year  = chinese_year(c_date)
     month = chinese_month(c_date)
@@ -4104,9 +4530,365 @@ def is_chinese_prior_leap_month(m_prime, m):
     """Return True if there is a Chinese leap month on or after lunar
     month starting on fixed day, m_prime and at or before
     lunar month starting at fixed date, m."""
-    return ((m >= m_prime) and
-            (is_chinese_no_major_solar_term(m) or
-             is_chinese_prior_leap_month(m_prime, chinese_new_moon_before(m))))
+    while m >= m_prime:
+        if is_chinese_no_major_solar_term(m):
+            return True
+        m = chinese_new_moon_before(m)
+    return False
+
+
+# Not in calendrica-3.0.cl: precomputed Chinese calendar.
+# The astronomical conversions above search for solstices, new moons and
+# leap months on every call.  The month starts and month labels of a range
+# of Chinese years are computed once by write_chinese_table and shipped in
+# CHINESE_TABLE_FILE; chinese_from_fixed, fixed_from_chinese and
+# chinese_new_year_on_or_before answer from it when the date is in range
+# and fall back to the astronomical computation otherwise.
+import os
+from bisect import bisect_right
+
+CHINESE_TABLE_VERSION = 1
+
+CHINESE_TABLE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                  'chinese_table.dat')
+
+class ChineseTable(object):
+    """Month starts and labels of consecutive Chinese years.
+
+    'rows' is a list of (elapsed_years, new_year, leap_month, month_lengths)
+    tuples, one per Chinese year, as stored in CHINESE_TABLE_FILE.
+    'leap_month' is the number of the leap month or 0, and 'month_lengths'
+    the list of the lengths (29 or 30) of the months in the year."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        # fixed dates of all month starts, followed by the new year
+        # after the last row
+        self.starts = []
+        # (elapsed_years, month, leap) of each month in self.starts
+        self.labels = []
+        self.new_years = []
+        # elapsed_years -> index in self.starts of its first month
+        self.year_index = {}
+        for elapsed_years, new_year, leap_month, month_lengths in rows:
+            self.new_years.append(new_year)
+            self.year_index[elapsed_years] = len(self.starts)
+            start = new_year
+            labels = chinese_table_month_labels(leap_month, len(month_lengths))
+            for (month, leap), length in zip(labels, month_lengths):
+                self.starts.append(start)
+                self.labels.append((elapsed_years, month, leap))
+                start += length
+        self.starts.append(start)
+
+    def is_in_range(self, date):
+        """Return True if fixed date, date, is covered by the table."""
+        return self.starts[0] <= date < self.starts[-1]
+
+def chinese_table_month_labels(leap_month, months):
+    """Return the list of (month, leap) of a Chinese year with 'months'
+    months whose leap month is 'leap_month' (0 if none)."""
+    labels = []
+    for month in range(1, 13):
+        labels.append((month, False))
+        if month == leap_month:
+            labels.append((month, True))
+    if len(labels) != months:
+        raise ValueError("Leap month %d does not match %d months" %
+                         (leap_month, months))
+    return labels
+
+def read_chinese_table(filename=CHINESE_TABLE_FILE):
+    """Return the ChineseTable stored in file 'filename', or None if the
+    file does not exist or was written by another CHINESE_TABLE_VERSION."""
+    if not os.path.exists(filename):
+        return None
+    rows = []
+    with open(filename) as f:
+        for line in f:
+            if line.startswith('#'):
+                if line.startswith('# version '):
+                    if int(line.split()[2]) != CHINESE_TABLE_VERSION:
+                        return None
+                continue
+            elapsed_years, new_year, leap_month, bits = line.split()
+            rows.append((int(elapsed_years), int(new_year), int(leap_month),
+                         [29 + int(bit) for bit in bits]))
+    return ChineseTable(rows) if rows else None
+
+def write_chinese_table(filename=CHINESE_TABLE_FILE,
+                        start_year=1600, end_year=2400):
+    """Compute astronomically the Chinese years starting in Gregorian years
+    start_year..end_year and write them to file 'filename'.
+    This takes several minutes: every month start is checked against
+    compute_chinese_from_fixed."""
+    saved = use_chinese_table(False)
+    try:
+        new_year = chinese_new_year(start_year)
+        stop = chinese_new_year(end_year + 1)
+        rows = []
+        while new_year < stop:
+            row, new_year = compute_chinese_table_row(new_year)
+            rows.append(row)
+    finally:
+        use_chinese_table(saved)
+
+    with open(filename, 'w') as f:
+        f.write('# Chinese calendar table, see ChineseTable in pycalcal.py\n')
+        f.write('# version %d\n' % CHINESE_TABLE_VERSION)
+        f.write('# gregorian years %d %d\n' % (start_year, end_year))
+        f.write('# elapsed_years new_year leap_month '
+                'month_lengths (0 = 29 days, 1 = 30 days)\n')
+        for elapsed_years, new_year, leap_month, month_lengths in rows:
+            f.write('%d %d %d %s\n' %
+                    (elapsed_years, new_year, leap_month,
+                     ''.join(str(length - 29) for length in month_lengths)))
+
+def compute_chinese_table_row(new_year):
+    """Return the table row of the Chinese year starting on fixed date,
+    new_year, and the fixed date of the following new year.
+    Raise ValueError if the astronomical computation disagrees with the
+    assumptions the table lookups rely on."""
+    c_date = compute_chinese_from_fixed(new_year)
+    if chinese_month(c_date) != 1 or chinese_leap(c_date) or \
+       chinese_day(c_date) != 1:
+        raise ValueError("%d is not a Chinese new year" % new_year)
+    elapsed_years = 60 * (chinese_cycle(c_date) - 1) + chinese_year(c_date)
+    starts = [new_year]
+    labels = [(1, False)]
+    while True:
+        start = chinese_new_moon_on_or_after(starts[-1] + 1)
+        c_date = compute_chinese_from_fixed(start)
+        if chinese_month(c_date) == 1 and not chinese_leap(c_date):
+            break
+        starts.append(start)
+        labels.append((chinese_month(c_date), chinese_leap(c_date)))
+    starts.append(start)
+
+    leap_months = [month for month, leap in labels if leap]
+    leap_month = leap_months[0] if leap_months else 0
+    if labels != chinese_table_month_labels(leap_month, len(labels)):
+        raise ValueError("Unexpected months %s in Chinese year %d" %
+                         (labels, elapsed_years))
+    # fixed_from_chinese looks the year up from its middle
+    mid_year = ifloor(CHINESE_EPOCH +
+                      ((elapsed_years - 1 + 1/2) * MEAN_TROPICAL_YEAR))
+    if not (new_year <= mid_year < start):
+        raise ValueError("Middle of Chinese year %d out of year" %
+                         elapsed_years)
+    # chinese_from_fixed derives the year from the month and the date
+    for i, (month, _) in enumerate(labels):
+        for date in (starts[i], starts[i + 1] - 1):
+            if ifloor(mpf(1.5) - (month / 12) +
+                      ((date - CHINESE_EPOCH) / MEAN_TROPICAL_YEAR)) != \
+               elapsed_years:
+                raise ValueError("Year of Chinese month %d in year %d "
+                                 "changes within the month" %
+                                 (month, elapsed_years))
+    month_lengths = [starts[i + 1] - starts[i] for i in range(len(labels))]
+    return (elapsed_years, new_year, leap_month, month_lengths), start
+
+# the table in use: None until loaded, False if disabled
+CHINESE_TABLE = None
+
+def chinese_table():
+    """Return the ChineseTable in use, loading CHINESE_TABLE_FILE on first
+    use, or None if there is none."""
+    global CHINESE_TABLE
+    if CHINESE_TABLE is None:
+        CHINESE_TABLE = read_chinese_table() or False
+    return CHINESE_TABLE or None
+
+def use_chinese_table(table):
+    """Use ChineseTable, table, for Chinese conversions; False disables the
+    table and None reloads CHINESE_TABLE_FILE.  Return the previous value."""
+    global CHINESE_TABLE
+    previous = CHINESE_TABLE
+    CHINESE_TABLE = table
+    return previous
+
+def chinese_table_from_fixed(date):
+    """Return Chinese date (cycle year month leap day) of fixed date, date,
+    from the Chinese table, or None if date is not in the table."""
+    table = chinese_table()
+    if table is None or not table.is_in_range(date):
+        return None
+    i = bisect_right(table.starts, date) - 1
+    elapsed_years, month, leap = table.labels[i]
+    cycle = 1 + quotient(elapsed_years - 1, 60)
+    year = amod(elapsed_years, 60)
+    return chinese_date(cycle, year, month, leap, 1 + (date - table.starts[i]))
+
+def chinese_table_to_fixed(c_date):
+    """Return fixed date of Chinese date, c_date, from the Chinese table,
+    or None if its year is not in the table.
+    Like compute_fixed_from_chinese, a leap month that does not exist
+    is taken as the month that follows it."""
+    table = chinese_table()
+    if table is None:
+        return None
+    elapsed_years = 60 * (chinese_cycle(c_date) - 1) + chinese_year(c_date)
+    first = table.year_index.get(elapsed_years)
+    if first is None:
+        return None
+    i = first + chinese_month(c_date) - 1
+    if i + 1 >= len(table.starts):
+        return None
+    _, month, leap = table.labels[i]
+    if not (month == chinese_month(c_date) and leap == chinese_leap(c_date)):
+        i += 1
+    return table.starts[i] + chinese_day(c_date) - 1
+
+def chinese_table_new_year_on_or_before(date):
+    """Return fixed date of Chinese New Year on or before fixed date, date,
+    from the Chinese table, or None if date is not in the table."""
+    table = chinese_table()
+    if table is None or not (table.new_years[0] <= date < table.starts[-1]):
+        return None
+    return table.new_years[bisect_right(table.new_years, date) - 1]
+
+
+# Not in calendrica-3.0.cl: precomputed solar terms.
+# The Chinese solar term functions evaluate or invert solar_longitude on
+# every call, and is_chinese_no_major_solar_term does so twice per month.
+# compute_solar_term_table computes the 24 solar terms (the moments the
+# solar longitude reaches a multiple of 15 degrees) of a range of years
+# once; current_major_solar_term, current_minor_solar_term,
+# major_solar_term_on_or_after, minor_solar_term_on_or_after and
+# chinese_winter_solstice_on_or_before answer from the table in use, see
+# use_solar_term_table, when the date is in range.  The table can be
+# saved with write_solar_term_table and loaded with read_solar_term_table.
+SOLAR_TERM_TABLE_VERSION = 1
+
+class SolarTermTable(object):
+    """Consecutive solar terms.
+
+    'rows' is a list of (angle, date, moment) tuples, one per solar term:
+    'angle' is the solar longitude of the term, a multiple of 15 degrees,
+    'moment' the moment (Beijing time) the sun reaches it and 'date' the
+    first fixed date whose midnight in China is at or after the term."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.angles = [angle for angle, _, _ in rows]
+        self.dates = [date for _, date, _ in rows]
+        self.moments = [moment for _, _, moment in rows]
+
+    def is_in_range(self, date):
+        """Return True if fixed date, date, is covered by the table."""
+        return self.dates[0] <= date < self.dates[-1]
+
+    def index(self, date):
+        """Return the index of the last term at or before midnight in
+        China at the start of fixed date, date, or None if date is not
+        covered by the table."""
+        if not self.is_in_range(date):
+            return None
+        return bisect_right(self.dates, date) - 1
+
+def compute_solar_term(angle, date):
+    """Return the table row (angle, date, moment) of the first solar term
+    of solar longitude, angle, on or after fixed date, date."""
+    moment = chinese_solar_longitude_on_or_after(angle, date)
+    # the moment is only known to the precision of invert_angular:
+    # check the solar longitude at the midnights around it
+    is_past = lambda d: mod(solar_longitude(midnight_in_china(d)) - angle,
+                            360) < 180
+    term_date = ifloor(moment) + 1
+    while is_past(term_date - 1):
+        term_date -= 1
+    while not is_past(term_date):
+        term_date += 1
+    return (angle, term_date, moment)
+
+def compute_solar_term_table(start_year, end_year):
+    """Compute the SolarTermTable of the solar terms from the winter
+    solstice before Gregorian year start_year to the one at the end of
+    Gregorian year end_year."""
+    date = fixed_from_gregorian(gregorian_date(start_year - 1, DECEMBER, 1))
+    stop = fixed_from_gregorian(gregorian_date(end_year, DECEMBER, 1))
+    angle = WINTER
+    rows = [compute_solar_term(angle, date)]
+    while not (rows[-1][0] == WINTER and rows[-1][1] > stop):
+        angle = mod(angle + 15, 360)
+        rows.append(compute_solar_term(angle, rows[-1][1]))
+    return SolarTermTable(rows)
+
+def read_solar_term_table(filename):
+    """Return the SolarTermTable stored in file 'filename', or None if the
+    file does not exist or was written by another
+    SOLAR_TERM_TABLE_VERSION."""
+    if not os.path.exists(filename):
+        return None
+    rows = []
+    with open(filename) as f:
+        for line in f:
+            if line.startswith('#'):
+                if line.startswith('# version '):
+                    if int(line.split()[2]) != SOLAR_TERM_TABLE_VERSION:
+                        return None
+                continue
+            angle, date, moment = line.split()
+            rows.append((int(angle), int(date), mpf(moment)))
+    return SolarTermTable(rows) if rows else None
+
+def write_solar_term_table(filename, start_year, end_year):
+    """Compute the solar terms of Gregorian years start_year..end_year
+    and write them to file 'filename'.  Return the SolarTermTable."""
+    table = compute_solar_term_table(start_year, end_year)
+    with open(filename, 'w') as f:
+        f.write('# Solar term table, see SolarTermTable in pycalcal.py\n')
+        f.write('# version %d\n' % SOLAR_TERM_TABLE_VERSION)
+        f.write('# gregorian years %d %d\n' % (start_year, end_year))
+        f.write('# angle date moment\n')
+        for angle, date, moment in table.rows:
+            f.write('%d %d %r\n' % (angle, date, float(moment)))
+    return table
+
+# the table in use, or None
+SOLAR_TERM_TABLE = None
+
+def use_solar_term_table(table):
+    """Use SolarTermTable, table, for the Chinese solar terms; None
+    disables the table.  Return the previous value."""
+    global SOLAR_TERM_TABLE
+    previous = SOLAR_TERM_TABLE
+    SOLAR_TERM_TABLE = table
+    return previous
+
+def solar_term_table_angle(date):
+    """Return the angle of the last solar term at or before midnight in
+    China at the start of fixed date, date, from the solar term table, or
+    None if date is not in the table."""
+    table = SOLAR_TERM_TABLE
+    i = None if table is None else table.index(date)
+    return None if i is None else table.angles[i]
+
+def solar_term_table_on_or_after(date, is_wanted):
+    """Return the moment of the first solar term after midnight in China
+    at the start of fixed date, date, whose angle satisfies is_wanted,
+    from the solar term table, or None if date is not in the table."""
+    table = SOLAR_TERM_TABLE
+    i = None if table is None else table.index(date)
+    if i is None:
+        return None
+    for j in range(i + 1, min(i + 3, len(table.rows))):
+        if is_wanted(table.angles[j]):
+            return table.moments[j]
+    return None
+
+def solar_term_table_winter_solstice(date):
+    """Return fixed date of the winter solstice on or before fixed date,
+    date, from the solar term table, or None if date is not in the
+    table."""
+    table = SOLAR_TERM_TABLE
+    i = None if table is None else table.index(date + 1)
+    if i is None:
+        return None
+    for j in range(i, max(i - 24, -1), -1):
+        if table.angles[j] == WINTER:
+            return table.dates[j] - 1
+    return None
 
 
 # see lines 4609-4615 in calendrica-3.0.cl
@@ -4327,13 +5109,27 @@ def hindu_lunar_year(date):
     return date[0]
 
 # see lines 4842-4850 in calendrica-3.0.cl
-def hindu_sine_table(entry):
+def compute_hindu_sine_table(entry):
     """Return the value for entry in the Hindu sine table.
     Entry, entry, is an angle given as a multiplier of 225'."""
     exact = 3438 * sin_degrees(entry * angle(0, 225, 0))
     error = 0.215 * signum(exact) * signum(abs(exact) - 1716)
     return iround(exact + error) / 3438
 
+# Not in calendrica-3.0.cl: precomputed Hindu sine table.
+# The table is the same for every backend (its values are rationals
+# computed as floats), so its 96 entries of a full circle are computed
+# once; hindu_sine_table looks the entries up modulo 96, and hindu_arcsin
+# bisects the 25 increasing entries of the first quadrant.
+HINDU_SINE_TABLE = [compute_hindu_sine_table(entry) for entry in range(96)]
+
+HINDU_SINE_QUADRANT = HINDU_SINE_TABLE[:25]
+
+def hindu_sine_table(entry):
+    """Return the value for entry in the Hindu sine table.
+    Entry, entry, is an angle given as a multiplier of 225'."""
+    return HINDU_SINE_TABLE[entry % 96]
+
 
 # see lines 4852-4861 in calendrica-3.0.cl
 def hindu_sine(theta):
@@ -4350,7 +5146,10 @@ def hindu_arcsin(amp):
     if (amp < 0):
         return -hindu_arcsin(-amp)
     else:
-        pos = next(0, lambda k: amp <= hindu_sine_table(k))
+        # First entry k of the quadrant with amp <= hindu_sine_table(k)
+        pos = bisect_left(HINDU_SINE_QUADRANT, amp)
+        if pos == len(HINDU_SINE_QUADRANT):
+            raise ValueError("hindu_arcsin of %s > 1" % amp)
         below = hindu_sine_table(pos - 1)
         return (angle(0, 225, 0) *
                 (pos - 1 + ((amp - below) / (hindu_sine_table(pos) - below))))
@@ -4431,14 +5230,176 @@ def hindu_lunar_phase(tee):
 # see lines 4954-4958 in calendrica-3.0.cl
 def hindu_lunar_day_from_moment(tee):
     """Return the phase of moon (tithi) at moment, tee, as an integer in
-    the range 1..30."""
-    return quotient(hindu_lunar_phase(tee), deg(12)) + 1
+    the range 1..30.  The phase is memoized, see hindu_memo_lunar_phase."""
+    return quotient(hindu_memo_lunar_phase(tee), deg(12)) + 1
+
+
+# Not in calendrica-3.0.cl: Hindu sankranti and new moon tables.
+# compute_hindu_new_moon_before bisects the new moon until both bounds are
+# in the same zodiacal sign, computing hindu_zodiac on both bounds and
+# hindu_lunar_phase at each step.  The zodiacal sign and the new moon
+# predicate are step functions of time, so each of their changes, i.e.,
+# each sankranti (entry of the sun in a sign) and each new moon, is
+# located once, from the mean motions corrected by one step of the true
+# motions, as a moment before and a moment after the change, and kept in
+# HINDU_SANKRANTIS and HINDU_NEW_MOONS.
+# hindu_new_moon_before runs the same search, with the same result, on
+# these tables; the moments between the two bounds of a change are
+# computed.  The moments of the tables are numbers of the backend: other
+# moments, e.g. integers with the mpmath backend, are computed in another
+# precision, so they are not looked up.  The sunrises, which
+# hindu_lunar_from_fixed computes for each date and the day before, and
+# the phases at the moments of the searches are memoized.
+HINDU_TABLE_CACHE_SIZE = 2**16
+
+# Largest distance between the bounds of a change, in days
+HINDU_TABLE_PRECISION = 1e-2
+
+# Half width of the first bracket around the estimate of a change, in days
+HINDU_TABLE_BRACKET = 0.25
+
+# (backend, j) -> (moment before, moment after) the j-th sankranti
+# after the creation
+HINDU_SANKRANTIS = {}
+
+# (backend, k) -> (moment before, moment after) the new moon nearest
+# the k-th mean new moon after the creation
+HINDU_NEW_MOONS = {}
+
+# (backend, tee) -> hindu_lunar_phase(tee)
+HINDU_LUNAR_PHASES = {}
+
+# (backend, date) -> hindu_sunrise(date)
+HINDU_SUNRISES = {}
+
+def clear_hindu_tables():
+    """Clear the Hindu sankranti, new moon, lunar phase and sunrise
+    tables."""
+    HINDU_SANKRANTIS.clear()
+    HINDU_NEW_MOONS.clear()
+    HINDU_LUNAR_PHASES.clear()
+    HINDU_SUNRISES.clear()
+
+def hindu_step(after, estimate, width):
+    """Return a moment before and a moment after the change of predicate
+    'after' near moment estimate, less than HINDU_TABLE_PRECISION apart.
+    The change is searched within HINDU_TABLE_BRACKET, then within width
+    days of estimate."""
+    lo, hi = estimate - HINDU_TABLE_BRACKET, estimate + HINDU_TABLE_BRACKET
+    if after(lo) or not after(hi):
+        lo, hi = estimate - width, estimate + width
+        if after(lo) or not after(hi):
+            raise ValueError("No change in [%s, %s]" % (lo, hi))
+    while (hi - lo) >= HINDU_TABLE_PRECISION:
+        x = (lo + hi) / 2
+        if after(x):
+            hi = x
+        else:
+            lo = x
+    return lo, hi
+
+def hindu_sankranti(j):
+    """Return a moment before and a moment after the j-th sankranti after
+    the creation.  The true sun is within 3 days of the
+    mean sun."""
+    key = (BACKEND, j)
+    step = HINDU_SANKRANTIS.get(key)
+    if step is None:
+        zodiac = mod(j, 12) + 1
+        mean = mpf(HINDU_CREATION + j * HINDU_SIDEREAL_YEAR / 12)
+        estimate = mean - ((1/deg(360)) *
+                           (mod(hindu_solar_longitude(mean) -
+                                (zodiac - 1) * deg(30) + deg(180), 360) -
+                            deg(180)) *
+                           HINDU_SIDEREAL_YEAR)
+        step = hindu_step(lambda tee: hindu_zodiac(tee) == zodiac,
+                          estimate, 3)
+        if len(HINDU_SANKRANTIS) >= HINDU_TABLE_CACHE_SIZE:
+            HINDU_SANKRANTIS.clear()
+        HINDU_SANKRANTIS[key] = step
+    return step
+
+def hindu_table_new_moon(k):
+    """Return a moment before and a moment after the new moon nearest the
+    k-th mean new moon after the creation.  It is within
+    1.5 days of the mean new moon."""
+    key = (BACKEND, k)
+    step = HINDU_NEW_MOONS.get(key)
+    if step is None:
+        mean = mpf(HINDU_CREATION + k * HINDU_SYNODIC_MONTH)
+        estimate = mean - ((1/deg(360)) *
+                           (mod(hindu_lunar_phase(mean) + deg(180), 360) -
+                            deg(180)) *
+                           HINDU_SYNODIC_MONTH)
+        step = hindu_step(lambda tee: hindu_lunar_phase(tee) < deg(180),
+                          estimate, 1.5)
+        if len(HINDU_NEW_MOONS) >= HINDU_TABLE_CACHE_SIZE:
+            HINDU_NEW_MOONS.clear()
+        HINDU_NEW_MOONS[key] = step
+    return step
+
+def hindu_table_moment(tee):
+    """Return True if moment tee can be looked up in the Hindu tables."""
+    return BACKEND == 'float' or isinstance(tee, mpf)
+
+def hindu_table_zodiac(tee):
+    """Return the zodiacal sign of the sun, as integer in range 1..12,
+    at moment tee, from the sankranti table."""
+    if not hindu_table_moment(tee):
+        return hindu_zodiac(tee)
+    # Index of the last mean sankranti, in floats: j - 1, j or j + 1 is
+    # the last true sankranti.
+    j = ifloor((float(tee) - HINDU_CREATION) / (HINDU_SIDEREAL_YEAR / 12))
+    for i in [j + 1, j]:
+        before, after = hindu_sankranti(i)
+        if tee >= after:
+            return mod(i, 12) + 1
+        elif tee > before:
+            return hindu_zodiac(tee)
+    return mod(j - 1, 12) + 1
+
+def hindu_table_is_waxing(tee):
+    """Return True if the lunar phase at moment tee, within two days of a
+    new moon, is less than 180 degrees, from the new moon table."""
+    if not hindu_table_moment(tee):
+        return hindu_lunar_phase(tee) < deg(180)
+    k = iround((float(tee) - HINDU_CREATION) / HINDU_SYNODIC_MONTH)
+    before, after = hindu_table_new_moon(k)
+    if tee >= after:
+        return True
+    elif tee <= before:
+        return False
+    return hindu_lunar_phase(tee) < deg(180)
+
+def hindu_memo_lunar_phase(tee):
+    """Return hindu_lunar_phase(tee), memoized."""
+    key = (BACKEND, tee)
+    phase = HINDU_LUNAR_PHASES.get(key)
+    if phase is None:
+        if len(HINDU_LUNAR_PHASES) >= HINDU_TABLE_CACHE_SIZE:
+            HINDU_LUNAR_PHASES.clear()
+        phase = HINDU_LUNAR_PHASES[key] = hindu_lunar_phase(tee)
+    return phase
 
+def hindu_new_moon_before(tee):
+    """Return the approximate moment of last new moon preceding moment, tee,
+    close enough to determine zodiacal sign.
+    Same search as compute_hindu_new_moon_before, on the Hindu tables."""
+    varepsilon = pow(2, -1000)
+    tau = tee - ((1/deg(360))   *
+                 hindu_memo_lunar_phase(tee) *
+                 HINDU_SYNODIC_MONTH)
+    return binary_search(tau - 1, min(tee, tau + 1),
+                         lambda l, u: ((hindu_table_zodiac(l) ==
+                                        hindu_table_zodiac(u)) or
+                                       ((u - l) < varepsilon)),
+                         hindu_table_is_waxing)
 
 # see lines 4960-4973 in calendrica-3.0.cl
-def hindu_new_moon_before(tee):
+def compute_hindu_new_moon_before(tee):
     """Return the approximate moment of last new moon preceding moment, tee,
-    close enough to determine zodiacal sign."""
+    close enough to determine zodiacal sign, searched with hindu_zodiac
+    and hindu_lunar_phase."""
     varepsilon = pow(2, -1000)
     tau = tee - ((1/deg(360))   *
                  hindu_lunar_phase(tee) *
@@ -4459,7 +5420,8 @@ def hindu_lunar_day_at_or_after(k, tee):
                    HINDU_SYNODIC_MONTH)
     a = max(tee, tau - 2)
     b = tau + 2
-    return invert_angular(hindu_lunar_phase, phase, a, b)
+    return invert_angular(hindu_lunar_phase, phase, a, b,
+                          rate=deg(360) / HINDU_SYNODIC_MONTH)
 
 
 # see lines 4990-4996 in calendrica-3.0.cl
@@ -4511,8 +5473,8 @@ def hindu_lunar_from_fixed(date):
     leap_day = (day == hindu_lunar_day_from_moment(hindu_sunrise(date - 1)))
     last_new_moon = hindu_new_moon_before(critical)
     next_new_moon = hindu_new_moon_before(ifloor(last_new_moon) + 35)
-    solar_month   = hindu_zodiac(last_new_moon)
-    leap_month    = (solar_month == hindu_zodiac(next_new_moon))
+    solar_month   = hindu_table_zodiac(last_new_moon)
+    leap_month    = (solar_month == hindu_table_zodiac(next_new_moon))
     month    = amod(solar_month + 1, 12)
     year     = (hindu_calendar_year((date + 180) if (month <= 2) else date) -
                 HINDU_LUNAR_ERA)
@@ -4630,7 +5592,7 @@ UJJAIN = location(angle(23, 9, 0), angle(75, 46, 6),
 HINDU_LOCATION = UJJAIN
 
 # see lines 5218-5228 in calendrica-3.0.cl
-def hindu_sunrise(date):
+def compute_hindu_sunrise(date):
     """Return the sunrise at hindu_location on date, date."""
     return (date + hr(6) +
             ((longitude(UJJAIN) - longitude(HINDU_LOCATION)) / deg(360)) -
@@ -4639,6 +5601,17 @@ def hindu_sunrise(date):
              (hindu_ascensional_difference(date, HINDU_LOCATION) +
               (1/4 * hindu_solar_sidereal_difference(date)))))
 
+def hindu_sunrise(date):
+    """Return the sunrise at hindu_location on date, date, memoized
+    with the Hindu tables."""
+    key = (BACKEND, date)
+    sunrise = HINDU_SUNRISES.get(key)
+    if sunrise is None:
+        if len(HINDU_SUNRISES) >= HINDU_TABLE_CACHE_SIZE:
+            HINDU_SUNRISES.clear()
+        sunrise = HINDU_SUNRISES[key] = compute_hindu_sunrise(date)
+    return sunrise
+
 
 # see lines 5230-5244 in calendrica-3.0.cl
 def hindu_fullmoon_from_fixed(date):
@@ -4859,7 +5832,8 @@ def hindu_solar_longitude_at_or_after(lam, tee):
                  mod(lam - hindu_solar_longitude(tee), 360))
     a = max(tee, tau - 5)
     b = tau +5
-    return invert_angular(hindu_solar_longitude, lam, a, b)
+    return invert_angular(hindu_solar_longitude, lam, a, b,
+                          rate=deg(360) / HINDU_SIDEREAL_YEAR)
 
 
 # see lines 5482-5487 in calendrica-3.0.cl
@@ -5202,5 +6176,276 @@ def tibetan_new_year(g_year):
 
 
 
+# Not in calendrica-3.0.cl: selectable numeric backend.
+# The astronomical functions compute with mpmath's mpf numbers at
+# mp.prec = 50 bits: this 'mpmath' backend is the reference, but slow.
+# The 'float' backend computes with native float64 numbers instead, which
+# have 53 bits of precision: use_backend('float') rebinds mpf, pi, atan
+# and tan to their float versions and converts the mpf constants of the
+# module listed in FLOAT_BACKEND_CONSTANTS (e.g., MEAN_SYNODIC_MONTH, J2000
+# or the locations) to floats.  Only these names are rebound: a module
+# that imported them by name keeps the values of the backend it imported.
+# The results agree with the reference within FLOAT_BACKEND_ENVELOPE over
+# Gregorian years 1600-2400, see backend_differences.
+# The PYCALCAL_BACKEND environment variable selects the backend on import.
+import math
+import mpmath
+
+BACKENDS = ('mpmath', 'float')
+
+BACKEND = 'mpmath'
+
+# mpmath values of the module globals replaced by the float backend
+MPMATH_GLOBALS = {}
+
+FLOAT_GLOBALS = {'mpf': float, 'pi': math.pi, 'atan': math.atan,
+                 'tan': math.tan}
+
+# Module constants with mpf values, converted by the float backend
+FLOAT_BACKEND_CONSTANTS = (
+    'J2000', 'JD_EPOCH', 'MEAN_TROPICAL_YEAR', 'MEAN_SIDEREAL_YEAR',
+    'MEAN_SYNODIC_MONTH', 'HINDU_ANOMALISTIC_MONTH', 'SIDEREAL_START',
+    'JERUSALEM', 'HAIFA', 'TEHRAN', 'ISLAMIC_LOCATION',
+    'SOLAR_LONGITUDE_TERMS', 'SOLAR_LONGITUDE_ADDENDS',
+    'SOLAR_LONGITUDE_MULTIPLIERS', 'NUTATION_A_COEFFS', 'NUTATION_B_COEFFS',
+    'MEAN_LUNAR_LONGITUDE_COEFFS', 'LUNAR_ELONGATION_COEFFS',
+    'SOLAR_ANOMALY_COEFFS', 'LUNAR_ANOMALY_COEFFS', 'MOON_NODE_COEFFS',
+    'NEW_MOON_APPROX_COEFFS', 'NEW_MOON_E_COEFFS',
+    'NEW_MOON_SOLAR_ANOMALY_COEFFS', 'NEW_MOON_LUNAR_ANOMALY_COEFFS',
+    'NEW_MOON_MOON_ARGUMENT_COEFFS', 'NEW_MOON_CAP_OMEGA_COEFFS',
+    'NEW_MOON_CORRECTION_TERMS', 'NEW_MOON_EXTRA_COEFFS',
+    'NEW_MOON_ADDITIONAL_TERMS')
+
+# Largest differences between the float and mpmath backends over
+# Gregorian years 1600-2400: angles in degrees, moments in days.
+FLOAT_BACKEND_ENVELOPE = {'solar_longitude': 1e-8,
+                          'lunar_longitude': 1e-7,
+                          'nth_new_moon': 1e-7,
+                          'sunrise': 1e-8}
+
+def float_value(value):
+    """Return value with its mpf numbers converted to floats, including
+    in lists and tuples, or value itself if it has no mpf number."""
+    if isinstance(value, mpmath.mpf):
+        return float(value)
+    if isinstance(value, (list, tuple)):
+        converted = [float_value(x) for x in value]
+        if any(x is not y for x, y in zip(converted, value)):
+            return type(value)(converted)
+    return value
+
+def use_backend(name):
+    """Use numeric backend 'name' for the astronomical functions:
+    'mpmath' (reference) or 'float' (fast).  Return the previous backend."""
+    global BACKEND
+    if name not in BACKENDS:
+        raise ValueError("Unknown backend: %r" % name)
+    previous = BACKEND
+    if name == previous:
+        return previous
+    module = globals()
+    if name == 'float':
+        for key in FLOAT_BACKEND_CONSTANTS:
+            MPMATH_GLOBALS[key] = module[key]
+            module[key] = float_value(module[key])
+        for key, value in FLOAT_GLOBALS.items():
+            MPMATH_GLOBALS[key] = module[key]
+            module[key] = value
+    else:
+        module.update(MPMATH_GLOBALS)
+        MPMATH_GLOBALS.clear()
+    BACKEND = name
+    return previous
+
+def backend_differences(fixed_dates, location=None):
+    """Return the largest absolute differences between the float and
+    mpmath backends of the functions of FLOAT_BACKEND_ENVELOPE at the
+    given fixed dates, as a dictionary keyed by function name.
+    Angles are compared modulo 360 degrees."""
+    location = location if location is not None else URBANA
+    calls = {'solar_longitude': lambda d: solar_longitude(d + 0.5),
+             'lunar_longitude': lambda d: lunar_longitude(d + 0.5),
+             'nth_new_moon': lambda d: nth_new_moon(
+                 iround((d - nth_new_moon(0)) / MEAN_SYNODIC_MONTH)),
+             'sunrise': lambda d: sunrise(d, location)}
+    angles = ('solar_longitude', 'lunar_longitude')
+    differences = {}
+    for name, call in calls.items():
+        previous = use_backend('mpmath')
+        try:
+            reference = [call(d) for d in fixed_dates]
+            use_backend('float')
+            fast = [call(d) for d in fixed_dates]
+        finally:
+            use_backend(previous)
+        largest = 0
+        for x, y in zip(reference, fast):
+            difference = abs(float(x) - y)
+            if name in angles:
+                difference = min(difference, 360 - difference)
+            largest = max(largest, difference)
+        differences[name] = largest
+    return differences
+
+use_backend(os.environ.get('PYCALCAL_BACKEND', 'mpmath'))
+
+
+# Not in calendrica-3.0.cl: persistent cache.
+# The conversions of PERSISTENT_CACHE_FUNCTIONS search astronomical
+# events and take milliseconds to seconds per date.  When a
+# PersistentCache is in use, see use_persistent_cache, they store their
+# results in its sqlite database, keyed by function name, backend,
+# angular solver and fixed date, and look them up there first, so that the results survive
+# the process.  chinese_from_fixed caches through
+# compute_chinese_from_fixed, since the Chinese table is faster than the
+# database.  The PYCALCAL_CACHE environment variable names a database to
+# use on import.
+import sqlite3
+import threading
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+from functools import wraps
+
+PERSISTENT_CACHE_FUNCTIONS = ('compute_chinese_from_fixed',
+                              'hindu_solar_from_fixed',
+                              'hindu_lunar_from_fixed',
+                              'astro_hindu_solar_from_fixed',
+                              'astro_hindu_lunar_from_fixed',
+                              'observational_islamic_from_fixed',
+                              'observational_hebrew_from_fixed',
+                              'persian_from_fixed',
+                              'future_bahai_from_fixed',
+                              'french_from_fixed')
+
+class PersistentCache(object):
+    """Results of conversions from fixed dates, stored in the sqlite
+    database file 'filename'.  The file can be shared by concurrent
+    processes and threads: each thread of each process opens its own
+    connection, and readers do not block in the database's write-ahead
+    log mode.  'hits' and 'misses' count the lookups of this process,
+    updated under a lock shared by its threads."""
+
+    def __init__(self, filename, timeout=30):
+        self.filename = filename
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self._counts_lock = threading.Lock()
+        # connection and pid of each thread
+        self._local = threading.local()
+        self.connection()
+
+    def connection(self):
+        """Return the connection of this thread and process to the
+        database, opening it (e.g., in a new thread or after a fork) if
+        needed."""
+        local = self._local
+        if getattr(local, 'pid', None) != os.getpid():
+            connection = sqlite3.connect(self.filename, timeout=self.timeout,
+                                         isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('CREATE TABLE IF NOT EXISTS results '
+                               '(function TEXT, backend TEXT, solver TEXT, '
+                               'date INTEGER, value BLOB, '
+                               'PRIMARY KEY (function, backend, solver, date))')
+            local.connection = connection
+            local.pid = os.getpid()
+        return local.connection
+
+    def get(self, name, date):
+        """Return the result of function 'name' at fixed date, date, with
+        the current backend and angular solver, or None if it is not in the
+        cache."""
+        try:
+            row = self.connection().execute(
+                'SELECT value FROM results WHERE function = ? AND '
+                'backend = ? AND solver = ? AND date = ?',
+                (name, BACKEND, ANGULAR_SOLVER, date)).fetchone()
+        except sqlite3.OperationalError:
+            # still locked by other writers after timeout: compute
+            row = None
+        with self._counts_lock:
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if row is None:
+            return None
+        return pickle.loads(str(row[0]))
+
+    def put(self, name, date, value):
+        """Store result, value, of function 'name' at fixed date, date,
+        with the current backend and angular solver."""
+        try:
+            self.connection().execute(
+                'INSERT OR IGNORE INTO results VALUES (?, ?, ?, ?, ?)',
+                (name, BACKEND, ANGULAR_SOLVER, date,
+                 sqlite3.Binary(pickle.dumps(value, 2))))
+        except sqlite3.OperationalError:
+            # still locked by other writers after timeout: skip caching
+            pass
+
+    def stats(self):
+        """Return a dictionary of the hits and misses of this process and
+        of the number of entries in the database."""
+        entries = self.connection().execute(
+            'SELECT COUNT(*) FROM results').fetchone()[0]
+        with self._counts_lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'entries': entries}
+
+    def clear(self):
+        """Delete all entries and reset the counters."""
+        self.connection().execute('DELETE FROM results')
+        with self._counts_lock:
+            self.hits = 0
+            self.misses = 0
+
+    def close(self):
+        """Close the connection of this thread."""
+        local = self._local
+        if getattr(local, 'pid', None) == os.getpid():
+            local.connection.close()
+        local.connection = None
+        local.pid = None
+
+# the cache in use, or None
+PERSISTENT_CACHE = None
+
+def use_persistent_cache(cache):
+    """Use PersistentCache, cache, for the functions of
+    PERSISTENT_CACHE_FUNCTIONS; None disables the cache.  Return the
+    previous value."""
+    global PERSISTENT_CACHE
+    previous = PERSISTENT_CACHE
+    PERSISTENT_CACHE = cache
+    return previous
+
+def persistently_cached(function):
+    """Return function of a fixed date, function, looking its results up
+    in the persistent cache in use first."""
+    name = function.__name__
+    @wraps(function)
+    def cached_function(date):
+        cache = PERSISTENT_CACHE
+        if cache is None or not isinstance(date, (int, long)):
+            return function(date)
+        value = cache.get(name, date)
+        if value is None:
+            value = function(date)
+            cache.put(name, date, value)
+        return value
+    return cached_function
+
+for _name in PERSISTENT_CACHE_FUNCTIONS:
+    globals()[_name] = persistently_cached(globals()[_name])
+del _name
+
+if os.environ.get('PYCALCAL_CACHE'):
+    use_persistent_cache(PersistentCache(os.environ['PYCALCAL_CACHE']))
+
+
 # That's all folks!
 
@@ -0,0 +1,66 @@
+"""
+Test classes and functions for the batch calculations over date arrays.
+Use unittest module as the main test framework.
+
+The batch results are verified against the properties of the per-date calendar classes.
+"""
+
+from datetime import date, timedelta
+import unittest
+
+from calendars.calendars import RegularDate, FiscalDate, RetailDate, IsoDate
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class BatchTest(unittest.TestCase):
+    """
+    Verify BaseDate.batch against the per-date properties for every day of several years.
+    """
+
+    properties = ['year', 'quarter', 'quarter_start_date', 'quarter_end_date', 'year_start_date', 'year_end_date']
+
+    def setUp(self):
+        start = date(2002, 12, 1)
+        self.dates = [start + timedelta(days) for days in xrange(0, 366 * 8, 3)]
+        # Around the 53-week retail year 2004 and ISO year 2004
+        self.dates.extend(date(2004, 7, 20) + timedelta(days) for days in xrange(20))
+        self.dates.extend(date(2004, 12, 20) + timedelta(days) for days in xrange(20))
+
+    def _verify_batch(self, calendar_class):
+        ordinals = np.array([mdate.toordinal() for mdate in self.dates])
+        days = np.array(self.dates, dtype='datetime64[D]')
+        ordinal_result = calendar_class.batch(ordinals)
+        day_result = calendar_class.batch(days)
+
+        for idx, mdate in enumerate(self.dates):
+            expected = calendar_class(mdate)
+            for name in self.properties:
+                value = getattr(expected, name)
+                message = "%s.%s of %s" % (calendar_class.__name__, name, mdate)
+                if isinstance(value, date):
+                    self.assertEqual(ordinal_result[name][idx], value.toordinal(), message)
+                    self.assertEqual(day_result[name][idx], np.datetime64(value), message)
+                else:
+                    self.assertEqual(ordinal_result[name][idx], value, message)
+                    self.assertEqual(day_result[name][idx], value, message)
+
+    def test_regular(self):
+        self._verify_batch(RegularDate)
+
+    def test_fiscal(self):
+        self._verify_batch(FiscalDate)
+
+    def test_retail(self):
+        self._verify_batch(RetailDate)
+
+    def test_iso(self):
+        self._verify_batch(IsoDate)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+Test classes and functions for the calendar dimension table exporter.
+Use unittest module as the main test framework.
+"""
+
+import csv
+from datetime import date
+import os
+import shutil
+from StringIO import StringIO
+import sys
+import tempfile
+import unittest
+
+from calendars.calendars import RetailDate, LunarDate, CalendarSpec
+from calendars import dimension
+
+
+class DimDateTest(unittest.TestCase):
+    """
+    Test cases for calendars.dimension.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_columns(self):
+        names = [name for name, _ in dimension.dim_date_columns(['regular', 'retail'])]
+        self.assertEqual(names[:4], ['date_key', 'date', 'day_of_week', 'regular_year'])
+        self.assertIn('retail_week', names)
+        self.assertNotIn('regular_week', names)
+        self.assertRaises(ValueError, dimension.dim_date_columns, ['tax'])
+
+    def test_chunks(self):
+        spec = CalendarSpec(weeks_in_month='4-4-5')
+        chunks = list(dimension.iter_dim_date_chunks(date(2015, 12, 1), date(2016, 3, 10), ['retail', 'lunar'],
+                                                     specs={'retail': spec}, chunk_size=30))
+        self.assertEqual([len(chunk['date']) for chunk in chunks], [30, 30, 30, 11])
+        names = [name for name, _ in dimension.dim_date_columns(['retail', 'lunar'])]
+        for chunk in chunks:
+            self.assertEqual(list(chunk), names)
+            for num, mdate in enumerate(chunk['date']):
+                rd = RetailDate(mdate, spec=spec)
+                self.assertEqual(chunk['retail_month'][num], rd.month)
+                self.assertEqual(chunk['retail_quarter_end_date'][num], rd.quarter_end_date)
+                self.assertEqual(chunk['lunar_year_start_date'][num], LunarDate(mdate).year_start_date)
+        self.assertEqual(chunks[0]['date_key'][0], 20151201)
+        self.assertEqual(chunks[0]['day_of_week'][0], 2)
+
+    def test_csv(self):
+        output = os.path.join(self.tmpdir, 'dim_date.csv')
+        rows, seconds = dimension.write_dim_date(output, date(2016, 1, 1), date(2016, 12, 31), chunk_size=100)
+        self.assertEqual(rows, 366)
+        with open(output, 'rb') as f:
+            lines = list(csv.DictReader(f))
+        self.assertEqual(len(lines), 366)
+        self.assertEqual(lines[-1]['date'], '2016-12-31')
+        self.assertEqual(lines[-1]['fiscal_year'], '2017')
+        self.assertEqual(lines[-1]['iso_week'], '52')
+
+    def test_main(self):
+        output = os.path.join(self.tmpdir, 'dim_date.csv')
+        stdout, sys.stdout = sys.stdout, StringIO()
+        try:
+            self.assertEqual(dimension.main(['2016-01-01', '2016-01-31', output, '--calendars', 'regular,iso']), 0)
+            report = sys.stdout.getvalue()
+        finally:
+            sys.stdout = stdout
+        self.assertTrue(report.startswith("Wrote 31 rows to %s" % output))
+        with open(output, 'rb') as f:
+            header = next(csv.reader(f))
+        self.assertEqual(header, [name for name, _ in dimension.dim_date_columns(['regular', 'iso'])])
+
+    def test_invalid(self):
+        output = os.path.join(self.tmpdir, 'dim_date.csv')
+        self.assertRaises(ValueError, dimension.write_dim_date, output, date(2016, 1, 1), date(2016, 1, 2), 'xls')
+
+    @unittest.skipIf(dimension.pa is None, "pyarrow is not available.")
+    def test_arrow(self):
+        output = os.path.join(self.tmpdir, 'dim_date.arrow')
+        rows, _ = dimension.write_dim_date(output, date(2016, 1, 1), date(2016, 12, 31), 'arrow', chunk_size=100)
+        table = dimension.pa.RecordBatchFileReader(dimension.pa.OSFile(output)).read_all()
+        self.assertEqual(table.num_rows, rows)
+        self.assertEqual(table.column_names, [name for name, _ in dimension.dim_date_columns()])
+        self.assertEqual(table.column('date_key').to_pylist()[-1], 20161231)
+
+    @unittest.skipIf(dimension.pa is None, "pyarrow is not available.")
+    def test_parquet(self):
+        output = os.path.join(self.tmpdir, 'dim_date.parquet')
+        rows, _ = dimension.write_dim_date(output, date(2016, 1, 1), date(2016, 12, 31), 'parquet', chunk_size=100)
+        table = dimension.pq.read_table(output)
+        self.assertEqual(table.num_rows, rows)
+        self.assertEqual(table.column_names, [name for name, _ in dimension.dim_date_columns()])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -39,6 +39,32 @@ class IsoYearStartEnd(unittest.TestCase):
         pass
 
 
+class IsoMonthWeekTest(unittest.TestCase):
+    """Test IsoDate.week, IsoDate.month and IsoDate.quarter properties.
+    """
+
+    def test_week(self):
+        # All tests using datetime's isocalendar
+        mdate = date(2003, 12, 1)
+        while mdate < date(2010, 2, 1):
+            self.assertEqual(IsoDate(mdate).week, mdate.isocalendar()[1], mdate)
+            mdate += timedelta(days=3)
+
+    def test_month(self):
+        # 53-week ISO year 2015 (29-Dec-2014 - 03-Jan-2016)
+        self.assertEqual(IsoDate(date(2014, 12, 29)).month, 1)
+        self.assertEqual(IsoDate(date(2015, 2, 1)).month, 1)
+        self.assertEqual(IsoDate(date(2015, 2, 2)).month, 2)
+        self.assertEqual(IsoDate(date(2015, 2, 2)).month_end_date, date(2015, 3, 1))
+
+        my_date = IsoDate(date(2016, 1, 3))
+        self.assertEqual(my_date.month, 12)
+        self.assertEqual(my_date.quarter, 4)
+        self.assertEqual(my_date.month_start_date, date(2015, 11, 30))
+        self.assertEqual(my_date.month_end_date, date(2016, 1, 3))
+        self.assertEqual(my_date.quarter_start_date, date(2015, 9, 28))
+
+
 class IsCurrentYearTest(unittest.TestCase):
     """
     Test cases for is_current_year and is_previous_year properties of calendars.IsoDate.
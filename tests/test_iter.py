@@ -0,0 +1,123 @@
+"""
+Test classes and functions for iterating over date ranges of the calendars.
+Use unittest module as the main test framework.
+"""
+
+from datetime import date, timedelta
+import unittest
+
+from calendars.calendars import RegularDate, FiscalDate, RetailDate, IsoDate, LunarDate, CalendarSpec
+
+
+class IterDaysTest(unittest.TestCase):
+    """
+    Verify that iter_days generates the same periods as the date instances.
+    """
+
+    def _verify(self, cls, start, end, spec=None):
+        records = list(cls.iter_days(start, end, spec))
+        self.assertEqual(len(records), (end - start).days + 1)
+        for num, record in enumerate(records):
+            mdate = start + timedelta(num)
+            instance = cls(mdate, spec=spec)
+            self.assertEqual(record.date, mdate)
+            self.assertEqual(record.year, instance.year, mdate)
+            self.assertEqual(record.quarter, instance.quarter, mdate)
+            self.assertEqual(record.quarter_start_date, instance.quarter_start_date, mdate)
+            self.assertEqual(record.quarter_end_date, instance.quarter_end_date, mdate)
+            self.assertEqual(record.year_start_date, instance.year_start_date, mdate)
+            self.assertEqual(record.year_end_date, instance.year_end_date, mdate)
+            if hasattr(cls, 'month'):
+                self.assertEqual(record.month, instance.month, mdate)
+                self.assertEqual(record.week, instance.week, mdate)
+            else:
+                self.assertIsNone(record.month)
+                self.assertIsNone(record.week)
+
+    def test_regular(self):
+        self._verify(RegularDate, date(2015, 12, 15), date(2017, 1, 15))
+
+    def test_fiscal(self):
+        self._verify(FiscalDate, date(2015, 7, 15), date(2017, 1, 15))
+        self._verify(FiscalDate, date(2015, 7, 15), date(2016, 1, 15), CalendarSpec(start_month=9, start_day=15))
+
+    def test_retail(self):
+        # Retail year 2016 has 53 weeks.
+        self._verify(RetailDate, date(2015, 7, 1), date(2017, 8, 15))
+        self._verify(RetailDate, date(2015, 7, 1), date(2016, 3, 1), CalendarSpec(weeks_in_month='4-4-5',
+                                                                                   week_start=0))
+        # Retail years starting on January 1 end in the previous December.
+        self._verify(RetailDate, date(2016, 12, 1), date(2019, 1, 31), CalendarSpec(start_month=1, start_day=1))
+        # Retail years starting on January 3 end in either December or January.
+        self._verify(RetailDate, date(2015, 12, 1), date(2018, 1, 31), CalendarSpec(start_month=1, start_day=3))
+
+    def test_iso(self):
+        # ISO year 2015 has 53 weeks.
+        self._verify(IsoDate, date(2014, 12, 15), date(2017, 1, 15))
+
+    def test_lunar(self):
+        # Lunar year 2017 has a leap month 6.
+        self._verify(LunarDate, date(2016, 12, 15), date(2018, 3, 1))
+
+    def test_empty(self):
+        self.assertEqual(list(RetailDate.iter_days(date(2016, 1, 2), date(2016, 1, 1))), [])
+
+    def test_incremental(self):
+        records = RegularDate.iter_days(date(1900, 1, 1), date(2099, 12, 31))
+        first = next(records)
+        self.assertEqual(first.date, date(1900, 1, 1))
+        # The records of a quarter share their period boundaries.
+        self.assertIs(next(records).quarter_end_date, first.quarter_end_date)
+
+
+class IterPeriodsTest(unittest.TestCase):
+    """
+    Test cases for iter_periods of calendars.
+    """
+
+    def test_quarters(self):
+        periods = list(FiscalDate.iter_periods(date(2015, 9, 2), date(2016, 8, 1)))
+        self.assertEqual([(p.year, p.number) for p in periods], [(2016, 1), (2016, 2), (2016, 3), (2016, 4),
+                                                                 (2017, 1)])
+        self.assertEqual(periods[0].start_date, date(2015, 8, 1))
+        self.assertEqual(periods[-1].end_date, date(2016, 10, 31))
+
+    def test_contiguous(self):
+        for cls in [RegularDate, FiscalDate, RetailDate, IsoDate, LunarDate]:
+            for period in ['year', 'quarter', 'month', 'week']:
+                if not hasattr(cls, period):
+                    self.assertRaises(ValueError, cls.iter_periods, date(2016, 1, 1), date(2017, 1, 1), period)
+                    continue
+                periods = list(cls.iter_periods(date(2014, 6, 1), date(2017, 6, 1), period))
+                self.assertLessEqual(periods[0].start_date, date(2014, 6, 1))
+                self.assertGreaterEqual(periods[-1].end_date, date(2017, 6, 1))
+                for previous, current in zip(periods, periods[1:]):
+                    self.assertEqual(previous.end_date + timedelta(1), current.start_date, (cls, period))
+
+    def test_months(self):
+        periods = list(RetailDate.iter_periods(date(2016, 1, 1), date(2016, 3, 1), 'month'))
+        self.assertEqual([p.number for p in periods], [6, 7, 8])
+        for p in periods:
+            rd = RetailDate(p.start_date)
+            self.assertEqual(p.start_date, rd.month_start_date)
+            self.assertEqual(p.end_date, rd.month_end_date)
+
+    def test_weeks(self):
+        periods = list(IsoDate.iter_periods(date(2015, 12, 20), date(2016, 1, 10), 'week'))
+        self.assertEqual([(p.year, p.number) for p in periods], [(2015, 51), (2015, 52), (2015, 53), (2016, 1)])
+
+    def test_years(self):
+        periods = list(LunarDate.iter_periods(date(2016, 1, 1), date(2016, 3, 1), 'year'))
+        self.assertEqual([(p.number, p.start_date) for p in periods], [(2015, date(2015, 2, 19)),
+                                                                       (2016, date(2016, 2, 8))])
+
+    def test_retail_years_in_january(self):
+        spec = CalendarSpec(start_month=1, start_day=3)
+        periods = list(RetailDate.iter_periods(date(2015, 12, 1), date(2018, 1, 31), 'year', spec))
+        self.assertEqual([(p.number, p.start_date, p.end_date) for p in periods],
+                         [(2015, date(2014, 12, 28), date(2016, 1, 2)), (2016, date(2016, 1, 3), date(2016, 12, 31)),
+                          (2017, date(2017, 1, 1), date(2017, 12, 30)), (2018, date(2017, 12, 31), date(2018, 12, 29))])
+
+
+if __name__ == "__main__":
+    unittest.main()
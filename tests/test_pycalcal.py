@@ -0,0 +1,962 @@
+"""
+Test classes and functions for the additions to the PyCalCal module.
+Use unittest module as the main test framework.
+
+The astronomical functions are slow, so the test cases only sample the date ranges.
+"""
+
+from datetime import date
+import multiprocessing
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import unittest
+
+import pycalcal.bulk as bulk
+import pycalcal.lookup as lookup
+import pycalcal.pycalcal as pycal
+
+try:
+    import numpy as np
+    import pycalcal.arrays as pyarr
+except ImportError:
+    np = None
+
+
+class ChineseTableTest(unittest.TestCase):
+    """
+    Verify that the precomputed Chinese table agrees with the astronomical computation.
+    """
+
+    def setUp(self):
+        self.table = pycal.chinese_table()
+        self.assertIsNotNone(self.table, "Missing %s" % pycal.CHINESE_TABLE_FILE)
+
+    def _astronomical(self, func, *args):
+        """ Call func with the Chinese table disabled.
+        """
+        saved = pycal.use_chinese_table(False)
+        try:
+            return func(*args)
+        finally:
+            pycal.use_chinese_table(saved)
+
+    def test_range(self):
+        self.assertTrue(self.table.is_in_range(pycal.fixed_from_gregorian([1600, 12, 31])))
+        self.assertTrue(self.table.is_in_range(pycal.fixed_from_gregorian([2400, 12, 31])))
+        self.assertFalse(self.table.is_in_range(pycal.fixed_from_gregorian([1500, 1, 1])))
+        self.assertIsNone(pycal.chinese_table_from_fixed(pycal.fixed_from_gregorian([2500, 1, 1])))
+
+    def test_from_fixed(self):
+        start = pycal.fixed_from_gregorian([1600, 3, 1])
+        end = pycal.fixed_from_gregorian([2400, 12, 1])
+        for fixed_date in xrange(start, end, (end - start) // 40):
+            expected = pycal.compute_chinese_from_fixed(fixed_date)
+            self.assertEqual(pycal.chinese_from_fixed(fixed_date), expected, fixed_date)
+
+    def test_leap_months(self):
+        # 2017 has a leap month 6, starting on Jul 23rd.
+        leap_start = pycal.fixed_from_gregorian([2017, 7, 23])
+        for fixed_date in [leap_start - 1, leap_start, leap_start + 29]:
+            expected = pycal.compute_chinese_from_fixed(fixed_date)
+            self.assertEqual(pycal.chinese_from_fixed(fixed_date), expected, fixed_date)
+        self.assertEqual(pycal.chinese_from_fixed(leap_start)[2:], [6, True, 1])
+
+    def test_to_fixed(self):
+        c_dates = [[78, 33, 1, False, 1],
+                   [78, 34, 6, False, 15],
+                   [78, 34, 6, True, 1],
+                   [78, 34, 12, False, 30],
+                   # there is no leap month 1 in 2016
+                   [78, 33, 1, True, 1],
+                   [74, 1, 7, False, 10]]
+        for c_date in c_dates:
+            expected = self._astronomical(pycal.fixed_from_chinese, c_date)
+            self.assertEqual(pycal.fixed_from_chinese(c_date), expected, c_date)
+
+    def test_new_year(self):
+        for g_year in [1650, 1929, 2016, 2033, 2399]:
+            fixed_date = pycal.fixed_from_gregorian([g_year, 2, 1])
+            expected = self._astronomical(pycal.chinese_new_year_on_or_before, fixed_date)
+            self.assertEqual(pycal.chinese_new_year_on_or_before(fixed_date), expected, g_year)
+
+    def test_fallback(self):
+        fixed_date = pycal.fixed_from_gregorian([2016, 4, 8])
+        self.assertIsNone(self._astronomical(pycal.chinese_table_from_fixed, fixed_date))
+        self.assertEqual(self._astronomical(pycal.chinese_from_fixed, fixed_date), [78, 33, 3, False, 2])
+
+
+class SolarTermTableTest(unittest.TestCase):
+    """
+    Verify that the solar term table agrees with the astronomical computation.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.table = pycal.compute_solar_term_table(2016, 2017)
+
+    def tearDown(self):
+        pycal.use_solar_term_table(None)
+
+    def _astronomical(self, func, *args):
+        saved = pycal.use_solar_term_table(None)
+        try:
+            return func(*args)
+        finally:
+            pycal.use_solar_term_table(saved)
+
+    def test_table(self):
+        self.assertEqual(self.table.angles[0], pycal.WINTER)
+        self.assertEqual(self.table.angles[-1], pycal.WINTER)
+        self.assertEqual(len(self.table.rows), 2 * 24 + 1)
+        # Winter solstice of 2016 on December 21st in China
+        self.assertEqual(self.table.rows[24][:2], (pycal.WINTER, pycal.fixed_from_gregorian([2016, 12, 22])))
+
+    def test_lookups(self):
+        pycal.use_solar_term_table(self.table)
+        start = pycal.fixed_from_gregorian([2016, 1, 1])
+        for fixed_date in xrange(start, start + 731, 5):
+            for func in [pycal.current_major_solar_term, pycal.current_minor_solar_term,
+                         pycal.chinese_winter_solstice_on_or_before]:
+                self.assertEqual(func(fixed_date), self._astronomical(func, fixed_date), (func.__name__, fixed_date))
+            for func in [pycal.major_solar_term_on_or_after, pycal.minor_solar_term_on_or_after]:
+                self.assertAlmostEqual(func(fixed_date), self._astronomical(func, fixed_date), delta=10 ** -5,
+                                       msg=(func.__name__, fixed_date))
+
+    def test_term_dates(self):
+        # Around the terms, where the lookups change
+        pycal.use_solar_term_table(self.table)
+        for _, term_date, _ in self.table.rows[1:-1]:
+            for fixed_date in [term_date - 1, term_date]:
+                self.assertEqual(pycal.current_major_solar_term(fixed_date),
+                                 self._astronomical(pycal.current_major_solar_term, fixed_date))
+                self.assertEqual(pycal.current_minor_solar_term(fixed_date),
+                                 self._astronomical(pycal.current_minor_solar_term, fixed_date))
+
+    def test_out_of_range(self):
+        pycal.use_solar_term_table(self.table)
+        fixed_date = pycal.fixed_from_gregorian([2020, 6, 1])
+        self.assertIsNone(pycal.solar_term_table_angle(fixed_date))
+        self.assertIsNone(pycal.solar_term_table_winter_solstice(fixed_date))
+        self.assertEqual(pycal.current_major_solar_term(fixed_date),
+                         self._astronomical(pycal.current_major_solar_term, fixed_date))
+
+    def test_persistence(self):
+        directory = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(directory, 'solar_terms.dat')
+            self.assertIsNone(pycal.read_solar_term_table(filename))
+            table = pycal.write_solar_term_table(filename, 2016, 2016)
+            loaded = pycal.read_solar_term_table(filename)
+            self.assertEqual(loaded.angles, table.angles)
+            self.assertEqual(loaded.dates, table.dates)
+            for actual, expected in zip(loaded.moments, table.moments):
+                self.assertAlmostEqual(actual, expected, delta=1e-9)
+        finally:
+            shutil.rmtree(directory)
+
+
+def _cached_conversions(args):
+    """ Convert fixed dates with a persistent cache in a worker process.
+    """
+    filename, fixed_dates = args
+    cache = pycal.PersistentCache(filename)
+    pycal.use_persistent_cache(cache)
+    try:
+        return [pycal.hindu_lunar_from_fixed(fixed_date) for fixed_date in fixed_dates], cache.hits
+    finally:
+        pycal.use_persistent_cache(None)
+        cache.close()
+
+
+class PersistentCacheTest(unittest.TestCase):
+    """
+    Verify that the persistent cache returns the computed results.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'cache.db')
+        self.cache = pycal.PersistentCache(self.filename)
+        pycal.use_persistent_cache(self.cache)
+        self.fixed_dates = [pycal.fixed_from_gregorian([2016, 4, day]) for day in xrange(1, 8)]
+
+    def tearDown(self):
+        pycal.use_persistent_cache(None)
+        pycal.use_backend('mpmath')
+        self.cache.close()
+        shutil.rmtree(self.directory)
+
+    def test_hits(self):
+        for func in [pycal.hindu_lunar_from_fixed, pycal.compute_chinese_from_fixed]:
+            expected = [func(fixed_date) for fixed_date in self.fixed_dates]
+            self.assertEqual([func(fixed_date) for fixed_date in self.fixed_dates], expected)
+        self.assertEqual(self.cache.stats(), {'hits': 14, 'misses': 14, 'entries': 14})
+        # The results are fresh lists
+        pycal.hindu_lunar_from_fixed(self.fixed_dates[0]).append(None)
+        self.assertEqual(len(pycal.hindu_lunar_from_fixed(self.fixed_dates[0])), 5)
+
+    def test_persistence(self):
+        expected = [pycal.persian_from_fixed(fixed_date) for fixed_date in self.fixed_dates]
+        self.cache.close()
+        cache = pycal.PersistentCache(self.filename)
+        pycal.use_persistent_cache(cache)
+        self.assertEqual([pycal.persian_from_fixed(fixed_date) for fixed_date in self.fixed_dates], expected)
+        self.assertEqual((cache.hits, cache.misses), (7, 0))
+        cache.close()
+
+    def test_keys(self):
+        pycal.hindu_lunar_from_fixed(self.fixed_dates[0])
+        pycal.hindu_solar_from_fixed(self.fixed_dates[0])
+        pycal.use_backend('float')
+        pycal.hindu_lunar_from_fixed(self.fixed_dates[0])
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 3))
+        self.cache.clear()
+        self.assertEqual(self.cache.stats(), {'hits': 0, 'misses': 0, 'entries': 0})
+
+    def test_solver_keys(self):
+        # Secant moments may differ from bisection ones: results are not shared across solvers
+        pycal.hindu_solar_from_fixed(self.fixed_dates[0])
+        previous = pycal.use_angular_solver('secant')
+        try:
+            pycal.hindu_solar_from_fixed(self.fixed_dates[0])
+            pycal.hindu_solar_from_fixed(self.fixed_dates[0])
+        finally:
+            pycal.use_angular_solver(previous)
+        pycal.hindu_solar_from_fixed(self.fixed_dates[0])
+        self.assertEqual(self.cache.stats(), {'hits': 2, 'misses': 2, 'entries': 2})
+
+    def test_disabled(self):
+        pycal.use_persistent_cache(None)
+        pycal.hindu_lunar_from_fixed(self.fixed_dates[0])
+        self.assertEqual(self.cache.stats()['entries'], 0)
+
+    def test_threads(self):
+        expected = [pycal.persian_from_fixed(fixed_date) for fixed_date in self.fixed_dates]
+        results = []
+
+        def convert():
+            try:
+                results.append([pycal.persian_from_fixed(fixed_date) for fixed_date in self.fixed_dates])
+            except Exception as error:
+                results.append(error)
+            finally:
+                self.cache.close()
+        threads = [threading.Thread(target=convert) for _ in xrange(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [expected] * 3)
+        self.assertEqual(self.cache.misses, 7)
+        self.assertEqual(self.cache.stats()['entries'], 7)
+
+    def test_thread_counts(self):
+        for fixed_date in self.fixed_dates:
+            pycal.persian_from_fixed(fixed_date)
+
+        def convert():
+            try:
+                for _ in xrange(50):
+                    for fixed_date in self.fixed_dates:
+                        pycal.persian_from_fixed(fixed_date)
+            finally:
+                self.cache.close()
+        threads = [threading.Thread(target=convert) for _ in xrange(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.cache.stats(), {'hits': 8 * 50 * 7, 'misses': 7, 'entries': 7})
+
+    def test_locked(self):
+        # A database locked by another connection is a miss, and the result is not stored
+        pycal.use_persistent_cache(None)
+        expected = pycal.persian_from_fixed(self.fixed_dates[0])
+        cache = pycal.PersistentCache(self.filename, timeout=0.1)
+        pycal.use_persistent_cache(cache)
+        cache.close()
+        self.cache.close()
+        locker = sqlite3.connect(self.filename, isolation_level=None)
+        try:
+            locker.execute('PRAGMA locking_mode=EXCLUSIVE')
+            locker.execute('BEGIN EXCLUSIVE')
+            locker.execute('DELETE FROM results')
+            self.assertEqual(pycal.persian_from_fixed(self.fixed_dates[0]), expected)
+            self.assertEqual((cache.hits, cache.misses), (0, 1))
+        finally:
+            locker.close()
+        self.assertEqual(cache.stats()['entries'], 0)
+        cache.close()
+
+    def test_processes(self):
+        pool = multiprocessing.Pool(2)
+        try:
+            first = pool.map(_cached_conversions, [(self.filename, self.fixed_dates)] * 2)
+            second = pool.map(_cached_conversions, [(self.filename, self.fixed_dates)] * 2)
+        finally:
+            pool.close()
+            pool.join()
+        expected = [pycal.hindu_lunar_from_fixed(fixed_date) for fixed_date in self.fixed_dates]
+        for results, _ in first + second:
+            self.assertEqual(results, expected)
+        self.assertEqual([hits for _, hits in second], [7, 7])
+
+
+class LookupFileTest(unittest.TestCase):
+    """
+    Verify that the lookup file returns the dates of the PyCalCal functions.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        cls.filename = os.path.join(cls.directory, 'lookup.bin')
+        # Around the Chinese leap month 6 of 2017
+        cls.start = pycal.fixed_from_gregorian([2017, 7, 20])
+        cls.end = cls.start + 9
+        cls.count, _ = lookup.build_lookup_file(cls.filename, cls.start, cls.end)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory)
+
+    def test_lookup(self):
+        self.assertEqual(self.count, 10)
+        with lookup.LookupFile(self.filename) as lookup_file:
+            self.assertEqual((lookup_file.start, lookup_file.end), (self.start, self.end))
+            for fixed_date in xrange(self.start, self.end + 1):
+                for name, (function, _) in lookup.CALENDARS.items():
+                    self.assertEqual(lookup_file.lookup(name, fixed_date), function(fixed_date), (name, fixed_date))
+            self.assertEqual(lookup_file.lookup('chinese', self.start + 3), [78, 34, 6, True, 1])
+
+    def test_range(self):
+        with lookup.LookupFile(self.filename) as lookup_file:
+            self.assertIn(self.end, lookup_file)
+            self.assertNotIn(self.end + 1, lookup_file)
+            self.assertRaises(KeyError, lookup_file.record, self.start - 1)
+            self.assertEqual(os.path.getsize(self.filename), lookup.HEADER.size + 10 * lookup.RECORD.size)
+
+    def test_processes(self):
+        # One pool for the blocks of the range gives the same file
+        filename = os.path.join(self.directory, 'processes.bin')
+        block_days = lookup.BLOCK_DAYS
+        lookup.BLOCK_DAYS = 4
+        try:
+            lookup.build_lookup_file(filename, self.start, self.end, processes=2)
+        finally:
+            lookup.BLOCK_DAYS = block_days
+        with open(filename, 'rb') as f, open(self.filename, 'rb') as expected:
+            self.assertEqual(f.read(), expected.read())
+
+    def test_invalid(self):
+        filename = os.path.join(self.directory, 'invalid.bin')
+        with open(filename, 'wb') as f:
+            f.write(b'\0' * lookup.HEADER.size)
+        self.assertRaises(ValueError, lookup.LookupFile, filename)
+        self.assertRaises(ValueError, lookup.build_lookup_file, filename, self.end, self.start)
+
+
+class BulkTest(unittest.TestCase):
+    """
+    Verify that the bulk conversions return the results of the function in input order.
+    """
+
+    def setUp(self):
+        # Unordered dates of several years, with a duplicate
+        self.fixed_dates = [pycal.fixed_from_gregorian([g_year, month, 13])
+                            for month in [12, 1, 6] for g_year in [2017, 2015, 2016]]
+        self.fixed_dates.append(self.fixed_dates[0])
+
+    def test_convert(self):
+        expected = [pycal.hindu_lunar_from_fixed(fixed_date) for fixed_date in self.fixed_dates]
+        self.assertEqual(bulk.convert(pycal.hindu_lunar_from_fixed, self.fixed_dates, processes=1), expected)
+        self.assertEqual(bulk.convert('hindu_lunar_from_fixed', self.fixed_dates, processes=2), expected)
+
+    def test_shared_pool(self):
+        expected = [pycal.persian_from_fixed(fixed_date) for fixed_date in self.fixed_dates]
+        pool = multiprocessing.Pool(2)
+        try:
+            for _ in xrange(2):
+                self.assertEqual(bulk.convert(pycal.persian_from_fixed, self.fixed_dates, pool=pool), expected)
+        finally:
+            pool.close()
+            pool.join()
+
+    def test_to_fixed(self):
+        h_dates = [[5777, 1, 1], [5776, 7, 15], [5777, 7, 1], [5776, 12, 29]]
+        expected = [pycal.fixed_from_observational_hebrew(h_date) for h_date in h_dates]
+        self.assertEqual(bulk.convert(pycal.fixed_from_observational_hebrew, h_dates, processes=2), expected)
+        self.assertEqual(bulk.partition_year('fixed_from_observational_hebrew', h_dates[1]), 5776)
+
+    def test_partitions(self):
+        partitions = bulk._partitions('hindu_lunar_from_fixed', self.fixed_dates)
+        self.assertEqual([year for year, _ in partitions], [2015, 2016, 2017])
+        self.assertEqual(sorted(index for _, items in partitions for index, _ in items), range(10))
+
+    def test_warm_years(self):
+        items = list(enumerate(self.fixed_dates[:3]))
+        self.assertEqual(bulk._warm_years('compute_chinese_from_fixed', 2017, items), (2017, 2017))
+        # The arithmetic calendars and the Chinese table do not search new moons
+        self.assertIsNone(bulk._warm_years('persian_from_fixed', 2017, items))
+        self.assertIsNone(bulk._warm_years('chinese_from_fixed', 2017, items))
+        self.assertIsNone(bulk._warm_years('fixed_from_chinese', 2017, items))
+
+    def test_caller_indexes(self):
+        # Converting in this process leaves its new moon indexes as they were
+        pycal.clear_new_moon_cache()
+        try:
+            expected = [pycal.compute_chinese_from_fixed(fixed_date) for fixed_date in self.fixed_dates]
+            self.assertEqual(bulk.convert('compute_chinese_from_fixed', self.fixed_dates, processes=1), expected)
+            self.assertEqual(pycal.NEW_MOON_INDEXES, {})
+        finally:
+            pycal.clear_new_moon_cache()
+
+    def test_far_apart_years(self):
+        # Each partition indexes the new moons of its own years only
+        fixed_dates = [pycal.fixed_from_gregorian([g_year, 3, 1]) for g_year in [1000, 2900]]
+        pycal.clear_new_moon_cache()
+        try:
+            expected = [pycal.compute_chinese_from_fixed(fixed_date) for fixed_date in fixed_dates]
+            pycal.clear_new_moon_cache()
+            for fixed_date, result in zip(fixed_dates, expected):
+                g_year = pycal.gregorian_year_from_fixed(fixed_date)
+                self.assertEqual(bulk._convert_partition((pycal.BACKEND, 'compute_chinese_from_fixed',
+                                                          (g_year, g_year), [(0, fixed_date)])), [(0, result)])
+                # 3 years and a new moon before and after
+                index = pycal.NEW_MOON_INDEXES[pycal.BACKEND]
+                self.assertLessEqual(len(index.moments), 42)
+                self.assertLessEqual(index.moments[0], fixed_date - 365)
+            self.assertLess(len(pycal.NEW_MOON_CACHE), 200)
+            self.assertEqual(bulk.convert('compute_chinese_from_fixed', fixed_dates, processes=1), expected)
+        finally:
+            pycal.clear_new_moon_cache()
+
+    def test_unknown(self):
+        self.assertRaises(ValueError, bulk.convert, 'gregorian_from_mars', self.fixed_dates)
+        self.assertEqual(bulk.convert(pycal.gregorian_from_fixed, [], processes=1), [])
+
+
+class SeriesTest(unittest.TestCase):
+    """
+    Verify that the series kernels evaluate the precomputed terms like sigma.
+    """
+
+    def test_sine_series(self):
+        c = pycal.julian_centuries(pycal.fixed_from_gregorian([2016, 4, 8]))
+        expected = pycal.sigma([list(column) for column in zip(*pycal.SOLAR_LONGITUDE_TERMS)],
+                               lambda x, y, z: x * pycal.sin_degrees(y + (z * c)))
+        self.assertEqual(pycal.sine_series(pycal.SOLAR_LONGITUDE_TERMS, c), expected)
+
+    def test_argument_sine_series(self):
+        cap_E, a, b, d = pycal.mpf(0.99), pycal.mpf(10.5), pycal.mpf(200.25), pycal.mpf(-30.125)
+        expected = pycal.sigma([list(column) for column in zip(*pycal.NEW_MOON_CORRECTION_TERMS)],
+                               lambda v, w, x, y, z: (v * pow(cap_E, w) *
+                                                      pycal.sin_degrees((x * a) + (y * b) + (z * d))))
+        actual = pycal.argument_sine_series(pycal.NEW_MOON_CORRECTION_TERMS, [1, cap_E, cap_E * cap_E], a, b, d)
+        self.assertEqual(actual, expected)
+
+    def test_values(self):
+        # New moon of January 11, 1 and the new moon of 2016-04-07 11:24 UT
+        self.assertEqual(pycal.gregorian_from_fixed(pycal.ifloor(pycal.nth_new_moon(0))), [1, 1, 11])
+        new_moon = pycal.new_moon_at_or_after(pycal.fixed_from_gregorian([2016, 4, 1]))
+        self.assertEqual(pycal.gregorian_from_fixed(pycal.ifloor(new_moon)), [2016, 4, 7])
+        self.assertAlmostEqual(float(new_moon % 1) * 24, 11.4, delta=0.1)
+        self.assertAlmostEqual(float(pycal.solar_longitude(pycal.fixed_from_gregorian([2016, 3, 20]) + 0.19)), 0,
+                               delta=0.05)
+
+
+class HinduSineTableTest(unittest.TestCase):
+    """
+    Verify that the precomputed Hindu sine table and hindu_arcsin agree with the computed entries and the linear search.
+    """
+
+    def _linear_arcsin(self, amp):
+        if amp < 0:
+            return -self._linear_arcsin(-amp)
+        pos = pycal.next(0, lambda k: amp <= pycal.compute_hindu_sine_table(k))
+        below = pycal.compute_hindu_sine_table(pos - 1)
+        return pycal.angle(0, 225, 0) * (pos - 1 + ((amp - below) / (pycal.compute_hindu_sine_table(pos) - below)))
+
+    def test_table(self):
+        for entry in xrange(-200, 200):
+            self.assertEqual(pycal.hindu_sine_table(entry), pycal.compute_hindu_sine_table(entry))
+        self.assertEqual(pycal.HINDU_SINE_QUADRANT[0], 0)
+        self.assertEqual(pycal.HINDU_SINE_QUADRANT[-1], 1)
+
+    def test_arcsin(self):
+        for amp in [pycal.mpf(i) / 64 for i in xrange(-64, 65)] + list(pycal.HINDU_SINE_QUADRANT):
+            self.assertEqual(pycal.hindu_arcsin(amp), self._linear_arcsin(amp))
+        self.assertEqual(pycal.hindu_arcsin(0), 0)
+        self.assertAlmostEqual(float(pycal.hindu_arcsin(pycal.hindu_sine(pycal.mpf(30)))), 30, places=9)
+        self.assertRaises(ValueError, pycal.hindu_arcsin, 1.5)
+
+
+class HinduTablesTest(unittest.TestCase):
+    """
+    Verify that the Hindu lunar conversions on the sankranti and new moon tables agree with the original searches.
+    """
+
+    def setUp(self):
+        pycal.clear_hindu_tables()
+
+    def tearDown(self):
+        pycal.clear_hindu_tables()
+        pycal.use_backend('mpmath')
+
+    def _reference_lunar_from_fixed(self, date):
+        # hindu_lunar_from_fixed with compute_hindu_new_moon_before and hindu_zodiac
+        critical = pycal.hindu_sunrise(date)
+        day = pycal.quotient(pycal.hindu_lunar_phase(critical), 12) + 1
+        leap_day = (day == pycal.quotient(pycal.hindu_lunar_phase(pycal.hindu_sunrise(date - 1)), 12) + 1)
+        last_new_moon = pycal.compute_hindu_new_moon_before(critical)
+        next_new_moon = pycal.compute_hindu_new_moon_before(pycal.ifloor(last_new_moon) + 35)
+        solar_month = pycal.hindu_zodiac(last_new_moon)
+        leap_month = (solar_month == pycal.hindu_zodiac(next_new_moon))
+        month = pycal.amod(solar_month + 1, 12)
+        year = pycal.hindu_calendar_year((date + 180) if (month <= 2) else date) - pycal.HINDU_LUNAR_ERA
+        return pycal.hindu_lunar_date(year, month, leap_month, day, leap_day)
+
+    def test_full_range(self):
+        # Every 1009 days from 3000 BCE to 3000 CE
+        start = pycal.fixed_from_gregorian([-3000, 1, 1])
+        end = pycal.fixed_from_gregorian([3000, 1, 1])
+        for fixed_date in xrange(start, end, 1009):
+            tee = pycal.hindu_sunrise(fixed_date)
+            self.assertEqual(pycal.hindu_new_moon_before(tee), pycal.compute_hindu_new_moon_before(tee))
+            l_date = pycal.hindu_lunar_from_fixed(fixed_date)
+            self.assertEqual(l_date, self._reference_lunar_from_fixed(fixed_date))
+            if fixed_date % 7 == 0:
+                self.assertEqual(pycal.fixed_from_hindu_lunar(l_date), fixed_date)
+
+    def test_consecutive_days(self):
+        # Including the leap month Adhika Ashadha of 2015
+        start = pycal.fixed_from_gregorian([2015, 6, 1])
+        l_dates = [pycal.hindu_lunar_from_fixed(fixed_date) for fixed_date in xrange(start, start + 90)]
+        self.assertEqual(l_dates, [self._reference_lunar_from_fixed(fixed_date)
+                                   for fixed_date in xrange(start, start + 90)])
+        self.assertTrue(any(pycal.hindu_lunar_leap_month(l_date) for l_date in l_dates))
+        self.assertEqual([pycal.fixed_from_hindu_lunar(l_date) for l_date in l_dates[::10]],
+                         range(start, start + 90, 10))
+
+    def test_tables(self):
+        tee = pycal.fixed_from_gregorian([2016, 4, 1])
+        j = pycal.ifloor((tee - pycal.HINDU_CREATION) / (pycal.HINDU_SIDEREAL_YEAR / 12))
+        before, after = pycal.hindu_sankranti(j)
+        self.assertLess(before, after)
+        self.assertEqual(pycal.hindu_zodiac(after), pycal.mod(j, 12) + 1)
+        self.assertEqual(pycal.hindu_zodiac(before), pycal.mod(j - 1, 12) + 1)
+        for moment in [before - 1, before, after, after + 1, tee]:
+            self.assertEqual(pycal.hindu_table_zodiac(moment), pycal.hindu_zodiac(moment))
+        k = pycal.iround((tee - pycal.HINDU_CREATION) / pycal.HINDU_SYNODIC_MONTH)
+        before, after = pycal.hindu_table_new_moon(k)
+        self.assertGreater(pycal.hindu_lunar_phase(before), 180)
+        self.assertLess(pycal.hindu_lunar_phase(after), 180)
+        self.assertIn(('mpmath', k), pycal.HINDU_NEW_MOONS)
+
+    def test_float_backend(self):
+        pycal.use_backend('float')
+        start = pycal.fixed_from_gregorian([1700, 3, 1])
+        for fixed_date in xrange(start, start + 400, 23):
+            self.assertEqual(pycal.hindu_lunar_from_fixed(fixed_date), self._reference_lunar_from_fixed(fixed_date))
+        self.assertIn('float', set(key[0] for key in pycal.HINDU_SANKRANTIS))
+
+
+class SearchTest(unittest.TestCase):
+    """
+    Verify that the search combinators run long searches without recursion.
+    """
+
+    def test_long_searches(self):
+        steps = 20 * sys.getrecursionlimit()
+        self.assertEqual(pycal.next(0, lambda i: i >= steps), steps)
+        self.assertEqual(pycal.final(0, lambda i: i < steps), steps - 1)
+        self.assertEqual(pycal.summa(lambda i: 1, 0, lambda i: i < steps), steps)
+        # Halving the upper bound down to 2 ** -3000 takes 3000 steps
+        x = pycal.binary_search(pycal.mpf(0), pycal.mpf(1), lambda lo, hi: hi - lo <= pycal.mpf(2) ** -3000,
+                                lambda x: True)
+        self.assertEqual(x, pycal.mpf(2) ** -3001)
+
+    def test_results(self):
+        self.assertEqual(pycal.next(5, lambda i: i * i > 50), 8)
+        self.assertEqual(pycal.final(5, lambda i: i * i < 50), 7)
+        self.assertEqual(pycal.final(8, lambda i: i * i < 50), 7)
+        self.assertEqual(pycal.summa(lambda i: i * i, 1, lambda i: i <= 4), 30)
+        self.assertEqual(pycal.summa(lambda i: i, 5, lambda i: False), 0)
+        self.assertAlmostEqual(pycal.binary_search(0.0, 2.0, lambda lo, hi: hi - lo <= 1e-9, lambda x: x * x >= 2),
+                               2 ** 0.5, places=8)
+
+    def test_callers(self):
+        # 2017 has a leap month 6, from Jul 23rd to Aug 21st.
+        leap_start = pycal.fixed_from_gregorian([2017, 7, 23])
+        new_year = pycal.fixed_from_gregorian([2017, 1, 28])
+        self.assertTrue(pycal.is_chinese_prior_leap_month(new_year, leap_start + 40))
+        self.assertFalse(pycal.is_chinese_prior_leap_month(new_year, leap_start - 10))
+        dawn = pycal.dawn(pycal.fixed_from_gregorian([2016, 4, 8]), pycal.TEHRAN, pycal.deg(18))
+        self.assertAlmostEqual(float(dawn % 1) * 24, 4.2, delta=0.2)
+        self.assertEqual(pycal.dawn(pycal.fixed_from_gregorian([2016, 6, 21]), pycal.location(70, 0, 0, 0), 18),
+                         pycal.BOGUS)
+
+
+class NewMoonCacheTest(unittest.TestCase):
+    """
+    Verify that the new moon cache and index agree with the computation.
+    """
+
+    def setUp(self):
+        pycal.clear_new_moon_cache()
+
+    def tearDown(self):
+        pycal.clear_new_moon_cache()
+        pycal.use_backend('mpmath')
+
+    def test_nth_new_moon(self):
+        self.assertEqual(pycal.nth_new_moon(24724), pycal.compute_nth_new_moon(24724))
+        self.assertIn(('mpmath', 24724), pycal.NEW_MOON_CACHE)
+        pycal.use_backend('float')
+        self.assertIsInstance(pycal.nth_new_moon(24724), float)
+        self.assertIn(('float', 24724), pycal.NEW_MOON_CACHE)
+
+    def test_index(self):
+        moments = [pycal.fixed_from_gregorian([2016, 1, 1]) + 0.5 + 5.3 * i for i in xrange(70)]
+        expected = [(pycal.new_moon_before(tee), pycal.new_moon_at_or_after(tee)) for tee in moments]
+        # 2016-2020 and a new moon before and after
+        self.assertEqual(pycal.warm_new_moons(2016, 2020), 67)
+        self.assertEqual([(pycal.new_moon_before(tee), pycal.new_moon_at_or_after(tee)) for tee in moments],
+                         expected)
+        # At the indexed new moons
+        index = pycal.NEW_MOON_INDEXES['mpmath']
+        tee = index.moments[10]
+        self.assertEqual(pycal.new_moon_at_or_after(tee), tee)
+        self.assertEqual(pycal.new_moon_before(tee), index.moments[9])
+
+    def test_warm_new_moons(self):
+        pycal.warm_new_moons(2016, 2016)
+        index = pycal.NEW_MOON_INDEXES['mpmath']
+        first_n, last_n = index.first_n, index.last_n()
+        pycal.warm_new_moons(2018, 2018)
+        index = pycal.NEW_MOON_INDEXES['mpmath']
+        self.assertEqual(index.first_n, first_n)
+        self.assertGreater(index.last_n(), last_n + 24)
+        self.assertEqual(index.moments, [pycal.nth_new_moon(n) for n in xrange(index.first_n, index.last_n() + 1)])
+        self.assertEqual(sorted(index.moments), index.moments)
+        # Outside of the index
+        tee = pycal.fixed_from_gregorian([2030, 5, 5])
+        self.assertIsNone(pycal.indexed_new_moon_position(tee))
+        self.assertLess(pycal.new_moon_before(tee), tee)
+        # Replacing the index
+        self.assertLessEqual(pycal.warm_new_moons(2030, 2030, extend=False), 17)
+        self.assertGreater(pycal.NEW_MOON_INDEXES['mpmath'].first_n, last_n)
+        self.assertIsNotNone(pycal.indexed_new_moon_position(tee))
+
+    def test_bounded(self):
+        saved = pycal.NEW_MOON_CACHE_SIZE
+        pycal.NEW_MOON_CACHE_SIZE = 10
+        try:
+            for n in xrange(25):
+                pycal.nth_new_moon(n)
+            self.assertLessEqual(len(pycal.NEW_MOON_CACHE), 10)
+        finally:
+            pycal.NEW_MOON_CACHE_SIZE = saved
+
+
+class HebrewYearCacheTest(unittest.TestCase):
+    """
+    Verify that the Hebrew conversions with the year cache agree with the original ones.
+    """
+
+    def setUp(self):
+        pycal.HEBREW_YEAR_CACHE.clear()
+
+    def test_hebrew_from_fixed(self):
+        start = pycal.fixed_from_gregorian([2015, 9, 1])
+        for fixed_date in xrange(start, start + 800):
+            h_date = pycal.hebrew_from_fixed(fixed_date)
+            self.assertEqual(h_date, pycal.compute_hebrew_from_fixed(fixed_date))
+            self.assertEqual(pycal.fixed_from_hebrew(h_date), fixed_date)
+        self.assertEqual(pycal.hebrew_from_fixed(pycal.fixed_from_gregorian([2016, 4, 23])), [5776, pycal.NISAN, 15])
+
+    def test_fixed_from_hebrew(self):
+        # Leap and common years, including the days past the end of the months
+        for year in (5776, 5777, 5779):
+            for month in xrange(pycal.NISAN, pycal.ADARII + 1):
+                for day in (1, 29, 30, 31):
+                    h_date = pycal.hebrew_date(year, month, day)
+                    self.assertEqual(pycal.fixed_from_hebrew(h_date), pycal.compute_fixed_from_hebrew(h_date))
+
+    def test_year_data(self):
+        data = pycal.hebrew_year_data(5776)
+        self.assertIs(pycal.hebrew_year_data(5776), data)
+        self.assertEqual(data.new_year, pycal.hebrew_new_year(5776))
+        self.assertEqual(data.days, pycal.days_in_hebrew_year(5776))
+        self.assertEqual(data.months, [7, 8, 9, 10, 11, 12, 13, 1, 2, 3, 4, 5, 6])
+        self.assertEqual(data.starts[-1] + 29, pycal.hebrew_new_year(5777))
+
+    def test_month_lengths(self):
+        # All the kinds of years: deficient, regular and complete, common and leap
+        kinds = set()
+        for year in xrange(5000, 6400, 7):
+            data = pycal.HebrewYear(year)
+            kinds.add(data.days)
+            for month in xrange(pycal.NISAN, pycal.ADARII + 1):
+                self.assertEqual(data.new_year + data.offsets[month],
+                                 pycal.compute_fixed_from_hebrew(pycal.hebrew_date(year, month, 1)), (year, month))
+        self.assertEqual(kinds, set([353, 354, 355, 383, 384, 385]))
+
+    def test_bounded(self):
+        saved = pycal.HEBREW_YEAR_CACHE_SIZE
+        pycal.HEBREW_YEAR_CACHE_SIZE = 10
+        try:
+            for year in xrange(5700, 5725):
+                pycal.fixed_from_hebrew(pycal.hebrew_date(year, pycal.TISHRI, 1))
+            self.assertLessEqual(len(pycal.HEBREW_YEAR_CACHE), 10)
+        finally:
+            pycal.HEBREW_YEAR_CACHE_SIZE = saved
+
+
+class PhasisCacheTest(unittest.TestCase):
+    """
+    Verify that the phasis searches with the crescent visibility cache agree with the day by day searches.
+    """
+
+    def setUp(self):
+        pycal.clear_phasis_cache()
+
+    def tearDown(self):
+        pycal.clear_phasis_cache()
+
+    def test_phasis(self):
+        start = pycal.fixed_from_gregorian([2016, 5, 20])
+        for location in (pycal.ISLAMIC_LOCATION, pycal.JAFFA):
+            for fixed_date in xrange(start, start + 35):
+                self.assertEqual(pycal.phasis_on_or_before(fixed_date, location),
+                                 pycal.compute_phasis_on_or_before(fixed_date, location))
+                self.assertEqual(pycal.phasis_on_or_after(fixed_date, location),
+                                 pycal.compute_phasis_on_or_after(fixed_date, location))
+
+    def test_one_month(self):
+        start = pycal.fixed_from_gregorian([2016, 6, 7])
+        i_dates = [pycal.observational_islamic_from_fixed(fixed_date) for fixed_date in xrange(start, start + 29)]
+        self.assertEqual(i_dates[0], [1437, 9, 1])
+        self.assertEqual([i_date[2] for i_date in i_dates], range(1, 30))
+        self.assertEqual(pycal.fixed_from_observational_islamic([1437, 9, 15]), start + 14)
+        # Three lunations around each date
+        self.assertEqual(len(pycal.PHASIS_CACHE), 4)
+
+    def test_phasis_table(self):
+        table = pycal.phasis_table(2016, 2016, pycal.ISLAMIC_LOCATION)
+        self.assertIn(len(table), (12, 13))
+        self.assertEqual(table, sorted(table))
+        self.assertIn(pycal.fixed_from_gregorian([2016, 6, 7]), table)
+        for phasis in table:
+            self.assertEqual(pycal.phasis_on_or_after(phasis, pycal.ISLAMIC_LOCATION), phasis)
+        self.assertEqual(pycal.phasis_table(2016, 2016, pycal.JAFFA)[0],
+                         pycal.phasis_on_or_after(pycal.fixed_from_gregorian([2016, 1, 1]), pycal.JAFFA))
+
+    def test_observational_hebrew_new_year(self):
+        self.assertEqual(pycal.observational_hebrew_new_year(2016), pycal.compute_observational_hebrew_new_year(2016))
+        self.assertIn((pycal.BACKEND, pycal.ANGULAR_SOLVER, 2016), pycal.OBSERVATIONAL_HEBREW_NEW_YEARS)
+        # The equinox moments of the secant solver may differ: its new years are cached apart
+        previous = pycal.use_angular_solver('secant')
+        try:
+            self.assertEqual(pycal.observational_hebrew_new_year(2016),
+                             pycal.compute_observational_hebrew_new_year(2016))
+        finally:
+            pycal.use_angular_solver(previous)
+        self.assertEqual(sorted(pycal.OBSERVATIONAL_HEBREW_NEW_YEARS),
+                         [(pycal.BACKEND, 'bisection', 2016), (pycal.BACKEND, 'secant', 2016)])
+
+    def test_bounded(self):
+        saved = pycal.PHASIS_CACHE_SIZE
+        pycal.PHASIS_CACHE_SIZE = 3
+        try:
+            for g_year in xrange(2010, 2016):
+                pycal.observational_hebrew_new_year(g_year)
+            self.assertLessEqual(len(pycal.OBSERVATIONAL_HEBREW_NEW_YEARS), 3)
+        finally:
+            pycal.PHASIS_CACHE_SIZE = saved
+
+
+class AngularSolverTest(unittest.TestCase):
+    """
+    Verify that the secant solver of invert_angular agrees with bisection.
+    """
+
+    def setUp(self):
+        self.previous = pycal.use_angular_solver('secant')
+
+    def tearDown(self):
+        pycal.use_angular_solver(self.previous)
+
+    def _both(self, func, *args):
+        pycal.use_angular_solver('bisection')
+        expected = func(*args)
+        pycal.use_angular_solver('secant')
+        return func(*args), expected
+
+    def test_events(self):
+        for g_year in xrange(1600, 2401, 100):
+            fixed_date = pycal.fixed_from_gregorian([g_year, 1 + g_year % 12, 1 + g_year % 28])
+            for func, angle in [(pycal.solar_longitude_after, 30 * (g_year % 12)),
+                                (pycal.lunar_phase_at_or_after, 90 * (g_year % 4)),
+                                (pycal.lunar_phase_at_or_before, 90 * (g_year % 4)),
+                                (pycal.hindu_solar_longitude_at_or_after, 30 * (g_year % 12))]:
+                actual, expected = self._both(func, angle, fixed_date)
+                self.assertLessEqual(abs(actual - expected), 10 ** -5, (func.__name__, g_year))
+
+    def test_conversions(self):
+        for g_year in [1650, 1900, 2016, 2380]:
+            fixed_date = pycal.fixed_from_gregorian([g_year, 3, 17])
+            for func in [pycal.hindu_lunar_from_fixed, pycal.hindu_solar_from_fixed, pycal.future_bahai_from_fixed]:
+                actual, expected = self._both(func, fixed_date)
+                self.assertEqual(actual, expected, (func.__name__, g_year))
+
+    def test_evaluations(self):
+        values = []
+
+        def longitude(tee):
+            values.append(tee)
+            return pycal.solar_longitude(tee)
+        tee = pycal.fixed_from_gregorian([2016, 3, 10])
+        pycal.invert_angular(longitude, 0, tee, tee + 20, rate=360 / pycal.MEAN_TROPICAL_YEAR)
+        self.assertLessEqual(len(values), 6)
+
+    def test_step_function(self):
+        # The secant estimates are useless on steps, but the inverse stays bracketed
+        step = lambda x: 10 * pycal.ifloor(x)
+        self.assertAlmostEqual(pycal.invert_angular(step, 25, 0, 10, rate=10), 3, delta=10 ** -5)
+        self.assertAlmostEqual(pycal.invert_angular(step, 25, 0, 10), 3, delta=10 ** -5)
+
+    def test_use_angular_solver(self):
+        # Bisection is the default: secant moments differ within prec
+        self.assertEqual(self.previous, 'bisection')
+        self.assertEqual(pycal.use_angular_solver('bisection'), 'secant')
+        self.assertEqual(pycal.use_angular_solver('secant'), 'bisection')
+        self.assertRaises(ValueError, pycal.use_angular_solver, 'brent')
+
+
+class BackendTest(unittest.TestCase):
+    """
+    Verify that the float backend agrees with the mpmath backend.
+    """
+
+    def tearDown(self):
+        pycal.use_backend('mpmath')
+
+    def test_use_backend(self):
+        self.assertEqual(pycal.use_backend('float'), 'mpmath')
+        self.assertIsInstance(pycal.solar_longitude(730000.5), float)
+        self.assertIsInstance(pycal.MEAN_SYNODIC_MONTH, float)
+        self.assertIsInstance(pycal.TEHRAN[0], float)
+        self.assertEqual(pycal.use_backend('mpmath'), 'float')
+        self.assertIsInstance(pycal.solar_longitude(730000.5), pycal.mpf)
+        self.assertIsInstance(pycal.TEHRAN[0], pycal.mpf)
+        self.assertRaises(ValueError, pycal.use_backend, 'decimal')
+
+    def test_constants(self):
+        # Every mpf constant of the module is converted, and only those
+        for name, value in vars(pycal).items():
+            if name not in vars(pycal.mpmath) and pycal.float_value(value) is not value:
+                self.assertIn(name, pycal.FLOAT_BACKEND_CONSTANTS)
+        pycal.use_backend('float')
+        for name in pycal.FLOAT_BACKEND_CONSTANTS:
+            value = getattr(pycal, name)
+            self.assertIs(pycal.float_value(value), value, name)
+        pycal.use_backend('mpmath')
+
+    def test_other_globals(self):
+        # Globals changed after import keep their values across backends
+        jaffa = pycal.JAFFA
+        table = pycal.HINDU_SINE_TABLE
+        try:
+            pycal.JAFFA = pycal.location(pycal.mpf(32), pycal.mpf(35), 0, pycal.mpf(1) / 12)
+            moved = pycal.JAFFA
+            pycal.use_backend('float')
+            self.assertIs(pycal.JAFFA, moved)
+            pycal.use_backend('mpmath')
+            self.assertIs(pycal.JAFFA, moved)
+            self.assertIs(pycal.HINDU_SINE_TABLE, table)
+        finally:
+            pycal.JAFFA = jaffa
+
+    def test_envelope(self):
+        fixed_dates = [pycal.fixed_from_gregorian([g_year, 1 + g_year % 12, 1 + g_year % 28])
+                       for g_year in xrange(1600, 2401, 40)]
+        differences = pycal.backend_differences(fixed_dates)
+        for name, envelope in pycal.FLOAT_BACKEND_ENVELOPE.items():
+            self.assertLessEqual(differences[name], envelope, name)
+
+    def test_conversions(self):
+        fixed_dates = [pycal.fixed_from_gregorian([g_year, 3, 17]) for g_year in [1650, 1900, 2016, 2380]]
+        for func in [pycal.compute_chinese_from_fixed, pycal.persian_from_fixed,
+                     pycal.astro_hindu_lunar_from_fixed, pycal.observational_islamic_from_fixed]:
+            expected = [func(fixed_date) for fixed_date in fixed_dates]
+            pycal.use_backend('float')
+            self.assertEqual([func(fixed_date) for fixed_date in fixed_dates], expected, func.__name__)
+            pycal.use_backend('mpmath')
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class ArraysTest(unittest.TestCase):
+    """
+    Verify that the vectorized functions agree with the scalar functions within their tolerance.
+    """
+
+    def setUp(self):
+        start = pycal.fixed_from_gregorian([1000, 1, 1])
+        end = pycal.fixed_from_gregorian([3000, 1, 1])
+        self.moments = np.linspace(start, end, 80) + 0.37
+
+    def _assert_close(self, name, values, expected, angles=False):
+        differences = np.abs(values - np.array([float(value) for value in expected]))
+        if angles:
+            differences = np.minimum(differences, 360 - differences)
+        self.assertLessEqual(differences.max(), pyarr.TOLERANCE[name], name)
+
+    def test_moments(self):
+        for name in ['solar_longitude', 'lunar_longitude', 'lunar_phase', 'nutation', 'aberration', 'lunar_latitude']:
+            expected = [getattr(pycal, name)(pycal.mpf(tee)) for tee in self.moments]
+            self._assert_close(name, getattr(pyarr, name)(self.moments), expected,
+                               angles=name in ['solar_longitude', 'lunar_longitude', 'lunar_phase'])
+
+    def test_nth_new_moon(self):
+        ns = np.arange(-12000, 13000, 500)
+        expected = [pycal.nth_new_moon(int(n)) for n in ns]
+        self._assert_close('nth_new_moon', pyarr.nth_new_moon(ns), expected)
+
+    def test_equation_of_time(self):
+        expected = [pycal.equation_of_time(pycal.mpf(tee)) for tee in self.moments]
+        self._assert_close('equation_of_time', pyarr.equation_of_time(self.moments), expected)
+
+    def test_solar_events(self):
+        fixed_dates = np.linspace(pycal.fixed_from_gregorian([1000, 1, 1]), pycal.fixed_from_gregorian([3000, 1, 1]),
+                                  12).astype(int)
+        # Tromso, Norway: no dawn and dusk in June, no sunrise and sunset in December
+        tromso = pycal.location(pycal.deg(pycal.mpf(69.6)), pycal.deg(pycal.mpf(18.9)), pycal.mt(10), pycal.hr(1))
+        fixed_dates = np.append(fixed_dates, [pycal.fixed_from_gregorian([2016, 6, 21]),
+                                              pycal.fixed_from_gregorian([2016, 12, 21])])
+        for location in [pycal.URBANA, tromso]:
+            events = pyarr.solar_events(fixed_dates, location, 18)
+            for name, expected in [('sunrise', [pycal.sunrise(int(date), location) for date in fixed_dates]),
+                                   ('sunset', [pycal.sunset(int(date), location) for date in fixed_dates]),
+                                   ('dawn', [pycal.dawn(int(date), location, 18) for date in fixed_dates]),
+                                   ('dusk', [pycal.dusk(int(date), location, 18) for date in fixed_dates])]:
+                bogus = [value == pycal.BOGUS for value in expected]
+                self.assertEqual(list(np.isnan(events[name])), bogus, name)
+                values = np.array([value for value, is_bogus in zip(events[name], bogus) if not is_bogus])
+                self._assert_close('solar_events', values, [value for value in expected if value != pycal.BOGUS])
+        self.assertEqual(sorted(pyarr.solar_events(fixed_dates, pycal.URBANA)), ['sunrise', 'sunset'])
+
+    def test_ephemeris_correction(self):
+        # One moment in each branch of the ephemeris correction
+        moments = np.array([pycal.fixed_from_gregorian([g_year, 7, 4]) + 0.5
+                            for g_year in [1500, 1650, 1750, 1850, 1950, 2000, 2100]])
+        expected = np.array([float(pycal.ephemeris_correction(pycal.mpf(tee))) for tee in moments])
+        np.testing.assert_allclose(pyarr.ephemeris_correction(moments), expected, rtol=1e-12, atol=1e-15)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,9 +4,10 @@ Use unittest module as the main test framework.
 """
 
 from datetime import date
+import threading
 import unittest
 
-from calendars.calendars import RegularDate
+from calendars.calendars import RegularDate, LunarDate, CurrentPeriods, set_clock
 
 
 class IsCurrentYearTest(unittest.TestCase):
@@ -88,4 +89,49 @@ class RegularDateTest(unittest.TestCase):
         self.assertEqual(my_date.year_dates_string, "2015 (01-Jan-2015 - 31-Dec-2015)")
         self.assertEqual(my_date.year_string, "2015")
 
-    pass
\ No newline at end of file
+    pass
+
+
+class ClockTest(unittest.TestCase):
+    """
+    Test cases for the pluggable clock and the shared current periods.
+    """
+
+    def tearDown(self):
+        set_clock(None)
+
+    def test_set_clock(self):
+        my_date = RegularDate(date(2010, 6, 1))
+        set_clock(lambda: date(2010, 12, 31))
+        self.assertEqual(my_date.is_current_year, True)
+        set_clock(lambda: date(2011, 1, 1))
+        self.assertEqual(my_date.is_current_year, False)
+        self.assertEqual(my_date.is_previous_year, True)
+
+    def test_given_today(self):
+        set_clock(lambda: date(2011, 1, 1))
+        self.assertEqual(RegularDate(date(2010, 6, 1), date(2010, 1, 1)).is_current_year, True)
+
+    def test_current_periods_shared(self):
+        today = date(2018, 6, 15)
+        self.assertIs(CurrentPeriods.of(today), CurrentPeriods.of(date(2018, 6, 15)))
+        periods = CurrentPeriods.of(today)
+        self.assertEqual(periods.year(LunarDate), 2018)
+        self.assertEqual(periods.year(RegularDate), 2018)
+        self.assertIn((LunarDate, LunarDate.default_spec()), periods._years)
+
+    def test_current_periods_threads(self):
+        periods = CurrentPeriods(date(2018, 6, 15))
+        classes = [RegularDate, LunarDate] * 20
+        results = []
+
+        def worker():
+            results.append([periods.year(cls) for cls in classes])
+
+        threads = [threading.Thread(target=worker) for _ in xrange(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [[2018] * len(classes)] * 4)
+        self.assertEqual(len(periods._years), 2)
@@ -261,6 +261,81 @@ class RetailYearStartEnd(unittest.TestCase):
         self.assertEqual(len(diff), 0, "Diff: " + str(diff))
 
 
+class RetailMonthWeekTest(unittest.TestCase):
+    """
+    Verify month, month_start_date, month_end_date and week properties of RetailDate.
+    """
+
+    def test_year_2016(self):
+        # 53-week year 2016 (26-Jul-2015 - 30-Jul-2016): 5-4-4 months with the extra week in the last month
+        my_date = RetailDate(date(2015, 7, 26))
+        self.assertEqual(my_date.month, 1)
+        self.assertEqual(my_date.week, 1)
+        self.assertEqual(my_date.month_start_date, date(2015, 7, 26))
+        self.assertEqual(my_date.month_end_date, date(2015, 8, 29))
+
+        my_date = RetailDate(date(2015, 8, 30))
+        self.assertEqual(my_date.month, 2)
+        self.assertEqual(my_date.week, 6)
+
+        my_date = RetailDate(date(2016, 7, 30))
+        self.assertEqual(my_date.month, 12)
+        self.assertEqual(my_date.week, 53)
+        self.assertEqual(my_date.month_start_date, date(2016, 6, 26))
+        self.assertEqual(my_date.month_end_date, date(2016, 7, 30))
+
+    def test_months_cover_year(self):
+        for year in xrange(2000, 2020):
+            my_date = RetailDate(date(year, 1, 1))
+            mdate = my_date.year_start_date
+            for month in xrange(1, 13):
+                month_date = RetailDate(mdate)
+                self.assertEqual(month_date.month, month)
+                self.assertEqual(month_date.month_start_date, mdate)
+                self.assertEqual(RetailDate(month_date.month_end_date).month, month)
+                mdate = month_date.month_end_date + timedelta(1)
+            self.assertEqual(mdate, my_date.year_end_date + timedelta(1))
+
+
+class RetailYearLayoutTest(unittest.TestCase):
+    """
+    Verify the year layouts shared by RetailDate instances.
+    """
+
+    def test_shared_layout(self):
+        first = RetailDate(date(2015, 8, 1))
+        second = RetailDate(date(2016, 7, 30))
+        self.assertIs(first._layout, second._layout)
+        self.assertIs(first._layout, RetailDate.year_layout(2016))
+        self.assertIsNot(first._layout, RetailDate(date(2016, 7, 31))._layout)
+
+    def test_53_week_layout(self):
+        layout = RetailDate.year_layout(2016)
+        self.assertTrue(layout.is_53_week)
+        self.assertEqual(layout.weeks_in_month, (5, 4, 4) * 3 + (5, 4, 5))
+        self.assertEqual(layout.weeks_in_quarter, (13, 13, 13, 14))
+        self.assertEqual(layout.quarters.start_date(1), date(2015, 7, 26))
+        self.assertEqual(layout.quarters.end_date(4), date(2016, 7, 30))
+        self.assertEqual(len(layout.weeks.offsets), 54)
+
+        layout = RetailDate.year_layout(2015)
+        self.assertFalse(layout.is_53_week)
+        self.assertEqual(layout.weeks_in_quarter, (13, 13, 13, 13))
+
+    def test_configuration_change(self):
+        self.assertEqual(RetailDate(date(2016, 1, 1)).weeks_in_quarter, [13, 13, 13, 14])
+        RetailDate.LEAP_MONTH = 1
+        try:
+            self.assertEqual(RetailDate(date(2016, 1, 1)).weeks_in_quarter, [14, 13, 13, 13])
+        finally:
+            RetailDate.LEAP_MONTH = 12
+
+    def test_cache_size(self):
+        for year in xrange(1000, 2000):
+            RetailDate.year_layout(year)
+        self.assertEqual(len(RetailDate._year_layouts), RetailDate._year_layouts.maxsize)
+
+
 class IsCurrentPreviousYearTests(unittest.TestCase):
     """
     Test cases for is_current_year and is_previous_year properties of calendars.RetailDate.
@@ -0,0 +1,197 @@
+"""
+Test classes and functions for calendars defined by CalendarSpec parameters.
+Use unittest module as the main test framework.
+"""
+
+from datetime import date, timedelta
+import threading
+import unittest
+
+from calendars.calendars import CalendarSpec, FiscalDate, RetailDate, IsoDate
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class CalendarSpecTest(unittest.TestCase):
+    """
+    Test cases for calendars.CalendarSpec values.
+    """
+
+    def test_weeks_in_month(self):
+        self.assertEqual(CalendarSpec(weeks_in_month='4-4-5').weeks_in_month, (4, 4, 5) * 4)
+        self.assertEqual(CalendarSpec(weeks_in_month=[4, 5, 4]).weeks_in_month, (4, 5, 4) * 4)
+        self.assertEqual(CalendarSpec(), CalendarSpec(8, 1, (5, 4, 4) * 4, 12, 6))
+        self.assertEqual(CalendarSpec(), RetailDate.default_spec())
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, CalendarSpec, start_month=13)
+        self.assertRaises(ValueError, CalendarSpec, start_day=29)
+        self.assertRaises(ValueError, CalendarSpec, weeks_in_month='4-4-4')
+        self.assertRaises(ValueError, CalendarSpec, leap_month=0)
+        self.assertRaises(ValueError, CalendarSpec, week_start=7)
+
+    def test_shared(self):
+        self.assertIs(CalendarSpec.shared(9, 15), CalendarSpec.shared(9, 15))
+        self.assertIs(FiscalDate.default_spec(), FiscalDate(date(2016, 1, 1)).spec)
+
+    def test_equality(self):
+        spec = CalendarSpec(start_month=9)
+        self.assertEqual(FiscalDate(date(2016, 1, 1)), FiscalDate(date(2016, 1, 1), spec=FiscalDate.default_spec()))
+        self.assertNotEqual(FiscalDate(date(2016, 1, 1)), FiscalDate(date(2016, 1, 1), spec=spec))
+
+
+class SpecDateTest(unittest.TestCase):
+    """
+    Test cases for date classes with non-default specs.
+    """
+
+    def test_fiscal_mid_month_start(self):
+        spec = CalendarSpec(start_month=9, start_day=15)
+        fd = FiscalDate(date(2016, 1, 1), spec=spec)
+        self.assertEqual(fd.year, 2016)
+        self.assertEqual(fd.quarter, 2)
+        self.assertEqual(fd.quarter_start_date, date(2015, 12, 15))
+        self.assertEqual(fd.quarter_end_date, date(2016, 3, 14))
+        self.assertEqual(fd.year_start_date, date(2015, 9, 15))
+        self.assertEqual(fd.year_end_date, date(2016, 9, 14))
+
+        fd = FiscalDate(date(2016, 9, 15), spec=spec)
+        self.assertEqual(fd.year, 2017)
+        self.assertEqual(fd.quarter, 1)
+
+    def test_retail_monday_445(self):
+        spec = CalendarSpec(start_month=2, start_day=1, weeks_in_month='4-4-5', week_start=0)
+        rd = RetailDate(date(2016, 8, 15), spec=spec)
+        self.assertEqual(rd.year_start_date, date(2016, 2, 1))
+        self.assertEqual(rd.year_end_date, date(2017, 1, 29))
+        self.assertEqual(rd.year_start_date.weekday(), 0)
+        self.assertEqual(rd.year, 2017)
+        self.assertEqual(rd.quarter, 3)
+        self.assertEqual(rd.quarter_start_date, date(2016, 8, 1))
+        self.assertEqual(rd.month, 7)
+        self.assertEqual(RetailDate.retail_end_by_year(2016, spec), date(2016, 1, 31))
+
+        # The default retail calendar is not affected.
+        self.assertEqual(RetailDate(date(2016, 8, 15)).year_start_date, date(2016, 7, 31))
+
+    def test_retail_year_boundaries(self):
+        # A retail year starting on January 1 ends in the previous December.
+        spec = CalendarSpec(start_month=1, start_day=1)
+        rd = RetailDate(date(2017, 12, 31), spec=spec)
+        self.assertEqual((rd.year_start_date, rd.year_end_date), (date(2017, 12, 31), date(2018, 12, 29)))
+        self.assertEqual((rd.year, rd.quarter, rd.month, rd.week), (2018, 1, 1, 1))
+        rd = RetailDate(date(2018, 12, 31), spec=spec)
+        self.assertEqual((rd.year_start_date, rd.year_end_date), (date(2018, 12, 30), date(2019, 12, 28)))
+        self.assertEqual(RetailDate.year_layout(2018, spec).year, 2018)
+
+        for start_month in (1, 12):
+            spec = CalendarSpec(start_month=start_month, start_day=1)
+            for year in xrange(2010, 2030):
+                for mdate in (date(year, 12, 31), date(year + 1, 1, 1)):
+                    rd = RetailDate(mdate, spec=spec)
+                    self.assertTrue(rd.year_start_date <= mdate <= rd.year_end_date, (start_month, mdate))
+                    self.assertEqual(rd.year, rd.year_end_date.year)
+
+        # A retail year starting in the first week of January is numbered by the year of its fiscal start, even if
+        # it ends in the first days of the next year.
+        spec = CalendarSpec(start_month=1, start_day=3)
+        layouts = [RetailDate.year_layout(year, spec) for year in (2015, 2016, 2017)]
+        self.assertEqual([(layout.year_start, layout.year_end) for layout in layouts],
+                         [(date(2014, 12, 28), date(2016, 1, 2)), (date(2016, 1, 3), date(2016, 12, 31)),
+                          (date(2017, 1, 1), date(2017, 12, 30))])
+        self.assertEqual([RetailDate(mdate, spec=spec).year for mdate in
+                          (date(2016, 1, 2), date(2016, 1, 10), date(2016, 12, 31), date(2017, 1, 1))],
+                         [2015, 2016, 2016, 2017])
+
+        # Each year number is used by exactly one retail year.
+        for start_month in (1, 2, 12):
+            for start_day in xrange(1, 29):
+                for week_start in xrange(7):
+                    spec = CalendarSpec(start_month=start_month, start_day=start_day, week_start=week_start)
+                    previous = RetailDate.year_layout(2009, spec)
+                    for year in xrange(2010, 2020):
+                        layout = RetailDate.year_layout(year, spec)
+                        self.assertEqual(layout.year, year, spec)
+                        self.assertEqual(layout.year_start, previous.year_end + timedelta(1), spec)
+                        for mdate in (date(year, 1, 1), date(year, 1, 7), date(year, 12, 31)):
+                            rd = RetailDate(mdate, spec=spec)
+                            self.assertTrue(rd.year_start_date <= mdate <= rd.year_end_date, (spec, mdate))
+                            self.assertIs(rd._layout, RetailDate.year_layout(rd.year, spec))
+                        previous = layout
+
+    def test_iso_month_pattern(self):
+        spec = CalendarSpec(weeks_in_month='4-4-5', week_start=0)
+        self.assertEqual(IsoDate(date(2016, 1, 31), spec=spec).month, 1)
+        self.assertEqual(IsoDate(date(2016, 1, 31)).month, 1)
+        self.assertEqual(IsoDate(date(2016, 2, 1), spec=spec).month, 2)
+        self.assertEqual(IsoDate(date(2016, 2, 1)).month, 1)
+
+    def test_concurrent_specs(self):
+        specs = [CalendarSpec(start_month=month, start_day=day, weeks_in_month=weeks, week_start=weekday)
+                 for month in (1, 4, 8, 10) for day in (1, 15) for weeks in ('5-4-4', '4-4-5')
+                 for weekday in (0, 6)]
+        dates = [date(2010, 1, 1) + timedelta(days) for days in xrange(0, 3000, 37)]
+
+        def evaluate(spec):
+            return [(RetailDate(mdate, spec=spec).quarter_start_date, FiscalDate(mdate, spec=spec).quarter_end_date)
+                    for mdate in dates]
+
+        expected = dict((spec, evaluate(spec)) for spec in specs)
+        FiscalDate._year_layouts.clear()
+        RetailDate._year_layouts.clear()
+
+        results = {}
+        errors = []
+
+        def worker(worker_specs):
+            try:
+                for spec in worker_specs:
+                    results.setdefault(spec, []).append(evaluate(spec))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(specs[num::3] + specs,)) for num in xrange(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        for spec in specs:
+            for result in results[spec]:
+                self.assertEqual(result, expected[spec])
+
+    @unittest.skipIf(np is None, "NumPy is not available.")
+    def test_batch(self):
+        dates = np.arange('2014-01-01', '2018-01-01', dtype='datetime64[D]')
+        for cls, spec in [(FiscalDate, CalendarSpec(start_month=9, start_day=15)),
+                          (RetailDate, CalendarSpec(start_month=2, weeks_in_month='4-4-5', week_start=0))]:
+            result = cls.batch(dates, spec=spec)
+            for num in xrange(0, len(dates), 11):
+                mdate = cls(dates[num].astype(date), spec=spec)
+                self.assertEqual(result['year'][num], mdate.year)
+                self.assertEqual(result['quarter'][num], mdate.quarter)
+                self.assertEqual(result['quarter_start_date'][num].astype(date), mdate.quarter_start_date)
+                self.assertEqual(result['year_end_date'][num].astype(date), mdate.year_end_date)
+
+    @unittest.skipIf(np is None, "NumPy is not available.")
+    def test_batch_retail_year_boundaries(self):
+        dates = [date(year, month, day) for year in xrange(2010, 2030) for month, day in ((1, 1), (1, 7), (12, 31))]
+        for start_month in (1, 12):
+            for start_day in xrange(1, 29):
+                for week_start in xrange(7):
+                    spec = CalendarSpec(start_month=start_month, start_day=start_day, week_start=week_start)
+                    result = RetailDate.batch(dates, spec=spec)
+                    for num, mdate in enumerate(dates):
+                        rd = RetailDate(mdate, spec=spec)
+                        self.assertEqual(result['year'][num], rd.year, (spec, mdate))
+                        self.assertEqual(result['year_start_date'][num].astype(date), rd.year_start_date, mdate)
+                        self.assertEqual(result['year_end_date'][num].astype(date), rd.year_end_date, mdate)
+                        self.assertEqual(result['quarter_start_date'][num].astype(date), rd.quarter_start_date, mdate)
+
+
+if __name__ == "__main__":
+    unittest.main()
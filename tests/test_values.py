@@ -0,0 +1,62 @@
+"""
+Test classes and functions for the value semantics shared by all calendar classes.
+Use unittest module as the main test framework.
+"""
+
+from datetime import date
+import pickle
+import unittest
+
+from calendars.calendars import RegularDate, FiscalDate, RetailDate, IsoDate, LunarDate
+
+
+class DateValueTest(unittest.TestCase):
+    """
+    Test cases for the compact, immutable date instances of all calendar classes.
+    """
+
+    calendar_classes = [RegularDate, FiscalDate, RetailDate, IsoDate, LunarDate]
+
+    def test_no_instance_dict(self):
+        for calendar_class in self.calendar_classes:
+            my_date = calendar_class(date(2016, 4, 8))
+            # Fill the lazily cached fields
+            my_date.quarter_dates_string
+            self.assertFalse(hasattr(my_date, '__dict__'), calendar_class.__name__)
+
+    def test_immutable(self):
+        for calendar_class in self.calendar_classes:
+            my_date = calendar_class(date(2016, 4, 8))
+            with self.assertRaises(AttributeError):
+                my_date.year_start = date(2016, 1, 1)
+            with self.assertRaises(AttributeError):
+                my_date._ordinal = 0
+            with self.assertRaises(AttributeError):
+                del my_date._ordinal
+
+    def test_equality(self):
+        for calendar_class in self.calendar_classes:
+            my_date = calendar_class(date(2016, 4, 8))
+            same_date = calendar_class(date(2016, 4, 8), date(2010, 1, 1))
+            self.assertEqual(my_date, same_date)
+            self.assertEqual(hash(my_date), hash(same_date))
+            self.assertNotEqual(my_date, calendar_class(date(2016, 4, 9)))
+
+        self.assertNotEqual(RetailDate(date(2016, 4, 8)), IsoDate(date(2016, 4, 8)))
+        self.assertEqual(len(set([RegularDate(date(2016, 4, 8)), RegularDate(date(2016, 4, 8))])), 1)
+
+    def test_pickle(self):
+        for calendar_class in self.calendar_classes:
+            my_date = calendar_class(date(2016, 4, 8), date(2017, 1, 1))
+            for protocol in xrange(pickle.HIGHEST_PROTOCOL + 1):
+                copied = pickle.loads(pickle.dumps(my_date, protocol))
+                self.assertEqual(copied, my_date)
+                self.assertEqual(copied.quarter_start_date, my_date.quarter_start_date)
+                self.assertEqual(copied.is_current_year, my_date.is_current_year)
+
+    def test_repr(self):
+        self.assertEqual(repr(RetailDate(date(2016, 4, 8))), "RetailDate(datetime.date(2016, 4, 8))")
+
+
+if __name__ == "__main__":
+    unittest.main()